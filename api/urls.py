@@ -1,6 +1,7 @@
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
-from orders.views import CustomerViewSet, OrderViewSet, OrderItemViewSet, OrdersSummaryView
+from orders import async_views
+from orders.views import CustomerViewSet, OrderStatsView, OrderViewSet, OrderItemViewSet, OrdersSummaryView
 from .views import DevSeedView
 
 router = DefaultRouter()
@@ -12,6 +13,10 @@ router.register(r"items", OrderItemViewSet, basename="items")
 # Otherwise `/api/orders/summary/` gets captured by the router as `orders/<pk>/` with pk="summary".
 urlpatterns = [
     path("orders/summary/", OrdersSummaryView.as_view(), name="orders-summary"),
+    path("orders/stats/", OrderStatsView.as_view(), name="orders-stats"),
+    path("async/orders/summary/", async_views.orders_summary, name="async-orders-summary"),
+    path("async/orders/", async_views.order_list, name="async-orders-list"),
+    path("async/orders/<int:pk>/", async_views.order_detail, name="async-orders-detail"),
     path("dev/seed/", DevSeedView.as_view(), name="dev-seed"),
     path("", include(router.urls)),
 ]
@@ -1,18 +1,85 @@
 from django.contrib import admin
+from django.db.models import Q
+
+from .counts import CountedPaginator, capped_count
 from .models import Customer, Order, OrderItem
+from .search import filter_by_email, search_customers
+from .totals import batch_total_updates, recompute_order_totals
+
+
+class ScalableChangeListMixin:
+    """Changelist settings for tables too big for a full `COUNT(*)` per page view.
+
+    Rows come with their FKs in the same query (`list_select_related`), the unfiltered
+    total isn't counted (`show_full_result_count = False`), and the filtered count stops
+    at `count_limit` rows. When there are more rows than that, the changelist says
+    "10000+ results" and the page links reach one page past the current one, so "next"
+    keeps going beyond the cap (`CountedPaginator` decides from the rows which pages exist).
+    """
+
+    show_full_result_count = False
+    count_limit = 10_000
+
+    def get_paginator(self, request, queryset, per_page, orphans=0, allow_empty_first_page=True):
+        return CountedPaginator(
+            queryset, per_page, lambda rows: capped_count(rows, self.count_limit),
+            orphans=orphans, allow_empty_first_page=allow_empty_first_page,
+        )
+
 
 @admin.register(Customer)
-class CustomerAdmin(admin.ModelAdmin):
+class CustomerAdmin(ScalableChangeListMixin, admin.ModelAdmin):
     list_display = ("id", "email", "name", "is_active", "created_at")
     search_fields = ("email", "name")
 
+    def get_search_results(self, request, queryset, search_term):
+        # Trigram index instead of LIKE '%x%' over every customer (orders/search.py).
+        if not search_term.strip():
+            return queryset, False
+        return search_customers(queryset, search_term), False
+
 @admin.register(Order)
-class OrderAdmin(admin.ModelAdmin):
+class OrderAdmin(ScalableChangeListMixin, admin.ModelAdmin):
     list_display = ("id", "customer", "status", "total_cents", "is_archived", "created_at")
     list_filter = ("status", "is_archived")
+    list_select_related = ("customer",)
+    autocomplete_fields = ("customer",)
     search_fields = ("customer__email",)
+    actions = ["recompute_totals"]
+
+    def get_search_results(self, request, queryset, search_term):
+        # Order id, or customer email through the customer search index.
+        term = search_term.strip()
+        if not term:
+            return queryset, False
+        matches = filter_by_email(queryset, term)
+        if term.isdigit():
+            matches = queryset.filter(Q(id=int(term)) | Q(id__in=matches.values("id")))
+        return matches, False
+
+    @admin.action(description="Recompute totals from items")
+    def recompute_totals(self, request, queryset):
+        updated = recompute_order_totals(queryset.values_list("id", flat=True))
+        self.message_user(request, f"Recomputed totals for {updated} order(s).")
 
 @admin.register(OrderItem)
-class OrderItemAdmin(admin.ModelAdmin):
+class OrderItemAdmin(ScalableChangeListMixin, admin.ModelAdmin):
     list_display = ("id", "order", "sku", "quantity", "unit_price_cents")
+    list_select_related = ("order",)
+    raw_id_fields = ("order",)
     search_fields = ("sku",)
+
+    def get_search_results(self, request, queryset, search_term):
+        # Exact SKU through item_sku_order_idx (or an order id) instead of LIKE '%x%'.
+        term = search_term.strip()
+        if not term:
+            return queryset, False
+        condition = Q(sku=term)
+        if term.isdigit():
+            condition |= Q(order_id=int(term))
+        return queryset.filter(condition), False
+
+    def delete_queryset(self, request, queryset):
+        # One set-based recompute for all affected orders instead of one per deleted item.
+        with batch_total_updates():
+            super().delete_queryset(request, queryset)
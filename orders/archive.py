@@ -0,0 +1,112 @@
+"""Moving archived and long-cancelled orders out of the hot tables.
+
+`archive_orders` copies eligible orders and their items into `ArchivedOrder` /
+`ArchivedOrderItem` (ids preserved) and deletes them from `orders_order` /
+`orders_orderitem`, one bounded batch per transaction. Eligible means `is_archived`, or
+cancelled and untouched for `ARCHIVE_CANCELLED_AFTER_DAYS`.
+
+The hot rows are removed with raw DELETEs, not through the ORM's per-object delete
+signals: a move isn't a delete as far as the derived tables go. The spend rollup only
+counts paid, non-archived orders, so it has nothing to subtract. Daily stats and the
+SKU rollup keep counting the orders, because their refresh paths read the archive
+tables as well (orders/stats.py, orders/sku_sales.py).
+
+`archived_order_row` (and `aarchived_order_row`) let the order detail endpoints find an order after it has moved.
+"""
+
+import datetime
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from .models import ArchivedOrder, ArchivedOrderItem, Order, OrderItem
+
+ARCHIVE_BATCH_SIZE = 1000
+
+ORDER_FIELDS = ("id", "customer_id", "status", "total_cents", "is_archived", "created_at", "updated_at")
+ITEM_FIELDS = ("id", "order_id", "sku", "quantity", "unit_price_cents")
+
+
+def cancelled_after_days() -> int:
+    return getattr(settings, "ARCHIVE_CANCELLED_AFTER_DAYS", 90)
+
+
+def eligible_orders(cancelled_days=None, now=None):
+    if cancelled_days is None:
+        cancelled_days = cancelled_after_days()
+    cutoff = (now or timezone.now()) - datetime.timedelta(days=cancelled_days)
+    return Order.objects.filter(
+        Q(is_archived=True) | Q(status=Order.Status.CANCELLED, updated_at__lt=cutoff)
+    )
+
+
+def archive_batch(order_ids) -> int:
+    """Move the given orders (and their items) into the archive tables in one transaction."""
+    with transaction.atomic():
+        orders = list(Order.objects.filter(id__in=order_ids).values(*ORDER_FIELDS))
+        ids = [row["id"] for row in orders]
+        ArchivedOrder.objects.bulk_create(
+            [ArchivedOrder(**row) for row in orders], batch_size=ARCHIVE_BATCH_SIZE
+        )
+        items = OrderItem.objects.filter(order_id__in=ids)
+        ArchivedOrderItem.objects.bulk_create(
+            (ArchivedOrderItem(**row) for row in items.values(*ITEM_FIELDS).iterator()),
+            batch_size=ARCHIVE_BATCH_SIZE,
+        )
+        # Raw deletes: no per-object delete signals, see the module docstring.
+        items._raw_delete(items.db)
+        hot = Order.objects.filter(id__in=ids)
+        hot._raw_delete(hot.db)
+    return len(ids)
+
+
+def archive_orders(batch_size=ARCHIVE_BATCH_SIZE, cancelled_days=None, limit=None, progress=None) -> int:
+    """Archive every eligible order, `batch_size` per transaction. Returns how many moved."""
+    queryset = eligible_orders(cancelled_days).order_by("id")
+    moved = 0
+    last_id = 0
+    while limit is None or moved < limit:
+        size = batch_size if limit is None else min(batch_size, limit - moved)
+        ids = list(queryset.filter(id__gt=last_id).values_list("id", flat=True)[:size])
+        if not ids:
+            break
+        moved += archive_batch(ids)
+        last_id = ids[-1]
+        if progress:
+            progress(moved)
+    return moved
+
+
+def _archived_order_rows(order_id):
+    return (
+        ArchivedOrder.objects.filter(id=order_id)
+        .order_by("items__id")
+        .values(
+            *ORDER_FIELDS, "customer__email",
+            "items__id", "items__sku", "items__quantity", "items__unit_price_cents",
+        )
+    )
+
+
+def _split_archived_rows(rows):
+    if not rows:
+        return None
+    order = {name: rows[0][name] for name in (*ORDER_FIELDS, "customer__email")}
+    items = [
+        (row["items__id"], row["id"], row["items__sku"], row["items__quantity"], row["items__unit_price_cents"])
+        for row in rows
+        if row["items__id"] is not None
+    ]
+    return order, items
+
+
+def archived_order_row(order_id):
+    """(order row, item rows) for an archived order in one query, or None."""
+    return _split_archived_rows(list(_archived_order_rows(order_id)))
+
+
+async def aarchived_order_row(order_id):
+    """Async `archived_order_row`."""
+    return _split_archived_rows([row async for row in _archived_order_rows(order_id)])
@@ -0,0 +1,142 @@
+"""Async (ASGI) variants of the hot read endpoints.
+
+Plain Django async views over the async ORM, served under `/api/async/...` next to the DRF
+versions. Under `regression_lab.asgi` a worker awaits the database instead of parking a
+thread on it, so slow dashboard reads can interleave. Responses match the sync endpoints
+(page-number pagination only; `?pagination=cursor` stays on the sync list).
+
+DRF views are sync-only, so these return `JsonResponse` and re-use the filters and the
+`.values()`-based serializers from orders/views.py and orders/fast_serializers.py.
+Under WSGI they still work; Django runs them in an event loop per request.
+"""
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.http import Http404, HttpResponse, HttpResponseNotAllowed, JsonResponse
+from django.utils.http import parse_etags, quote_etag
+from rest_framework.exceptions import ValidationError
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+from regression_lab.db_router import replica_reads
+
+from . import summary_cache
+from .counts import acached_count, astore_count, wants_exact_count
+from .fast_serializers import aserialize_archived_order, aserialize_order_queryset, aserialize_orders
+from .models import Order
+from .rollups import top_customers
+from .views import apply_order_list_filters, summary_row
+
+
+def _page_size() -> int:
+    return settings.REST_FRAMEWORK.get("PAGE_SIZE") or 20
+
+
+async def _filtered_orders(params):
+    queryset = Order.objects.order_by("-id")
+    if (params.get("email") or "").strip():
+        # The first FTS availability check runs a (sync) query, on the alias the rows are
+        # read from; build the filter on the ORM's thread, where that alias is decided.
+        return await sync_to_async(apply_order_list_filters)(queryset, params)
+    return apply_order_list_filters(queryset, params)
+
+
+@replica_reads
+async def order_list(request):
+    """Async `GET /api/orders/`: same filters, page shape and rows as the DRF list."""
+    if request.method != "GET":
+        return HttpResponseNotAllowed(["GET"])
+    try:
+        queryset = await _filtered_orders(request.GET)
+    except ValidationError as exc:
+        return JsonResponse(exc.detail, status=400)
+
+    try:
+        page_number = int(request.GET.get("page", 1))
+    except ValueError:
+        page_number = 0
+    if page_number < 1:
+        return JsonResponse({"detail": "Invalid page."}, status=404)
+
+    # Like CountedPaginator: one extra row decides `next` and page validity, and the
+    # (possibly cached) count is only reported, corrected when the page proves it wrong.
+    page_size = _page_size()
+    offset = (page_number - 1) * page_size
+    ids = [
+        order_id
+        async for order_id in queryset.values_list("id", flat=True)[offset:offset + page_size + 1].aiterator()
+    ]
+    has_next = len(ids) > page_size
+    ids = ids[:page_size]
+    if not ids and page_number > 1:
+        return JsonResponse({"detail": "Invalid page."}, status=404)
+
+    seen = offset + len(ids)
+    count_exact = wants_exact_count(request.GET) or not has_next
+    if not has_next:
+        count = seen
+    elif count_exact:
+        count = await queryset.acount()
+    else:
+        count = await acached_count(queryset)
+        if count <= seen:
+            count, count_exact = await queryset.acount(), True
+    if count_exact:
+        await astore_count(queryset, count)
+
+    url = request.build_absolute_uri()
+    previous_url = None
+    if page_number > 1:
+        previous_url = (
+            replace_query_param(url, "page", page_number - 1) if page_number > 2
+            else remove_query_param(url, "page")
+        )
+    return JsonResponse({
+        "count": count,
+        "count_exact": count_exact,
+        "next": replace_query_param(url, "page", page_number + 1) if has_next else None,
+        "previous": previous_url,
+        "results": await aserialize_orders(ids),
+    })
+
+
+@replica_reads
+async def order_detail(request, pk):
+    """Async `GET /api/orders/<pk>/`."""
+    if request.method != "GET":
+        return HttpResponseNotAllowed(["GET"])
+    try:
+        rows = await aserialize_order_queryset(Order.objects.filter(pk=pk))
+        if not rows:
+            # Moved out of the hot tables by `manage.py archive_orders` (orders/archive.py).
+            archived = await aserialize_archived_order(pk)
+            rows = [archived] if archived else []
+    except (TypeError, ValueError, DjangoValidationError):
+        raise Http404
+    if not rows:
+        raise Http404
+    return JsonResponse(rows[0])
+
+
+@replica_reads
+async def orders_summary(request):
+    """Async `GET /api/orders/summary/`, sharing the sync view's cache entries and ETags."""
+    if request.method != "GET":
+        return HttpResponseNotAllowed(["GET"])
+    try:
+        limit = min(max(int(request.GET.get("limit", 50)), 1), 500)
+    except ValueError:
+        return JsonResponse({"limit": ["A valid integer is required."]}, status=400)
+
+    async def build():
+        rows = [summary_row(row) async for row in top_customers(limit).aiterator()]
+        return {"limit": limit, "rows": rows}
+
+    payload, etag = await summary_cache.aget_or_build(limit, build)
+    quoted_etag = quote_etag(etag)
+    if quoted_etag in parse_etags(request.headers.get("If-None-Match", "")):
+        response = HttpResponse(status=304)
+    else:
+        response = JsonResponse(payload)
+    response["ETag"] = quoted_etag
+    return response
@@ -0,0 +1,172 @@
+"""Cached `COUNT(*)` for paginated list endpoints.
+
+Page-number pages report a total, and on a large filtered join that count costs more than
+the page itself. By default the count is served from the cache, keyed by the model and
+the filtered query's SQL/params (i.e. by filter parameters), and recomputed at most once
+per `LIST_COUNT_CACHE_TIMEOUT` seconds. It can therefore lag behind writes by that long;
+responses say so with `"count_exact": false`. `?count=exact` always runs the COUNT.
+Cached counts are computed on the primary (`primary_reads()`), and counts read off a
+replica are reported but never stored, so replica lag doesn't get cached on top.
+
+The cached value is only reported. `next` links and which pages exist come from the rows
+(`CountedPaginator` fetches one extra), and a page that shows the cached total is wrong
+replaces it: the last page gives the exact total for free.
+"""
+
+import hashlib
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import EmptyResultSet
+from django.core.paginator import EmptyPage, Page, PageNotAnInteger
+from django.core.paginator import Paginator as DjangoPaginator
+from django.db import DEFAULT_DB_ALIAS
+from django.utils.functional import cached_property
+
+from regression_lab.db_router import primary_reads
+
+COUNT_QUERY_PARAM = "count"
+KEY_PREFIX = "orders:count:"
+
+
+def _timeout():
+    return getattr(settings, "LIST_COUNT_CACHE_TIMEOUT", 30)
+
+
+def wants_exact_count(params) -> bool:
+    return params.get(COUNT_QUERY_PARAM) == "exact"
+
+
+def count_cache_key(queryset):
+    """Cache key for `queryset`'s count, or None if it can't be expressed as SQL."""
+    try:
+        sql, params = queryset.order_by().values("pk").query.sql_with_params()
+    except EmptyResultSet:
+        return None
+    digest = hashlib.sha1(f"{queryset.model._meta.label}|{sql}|{params!r}".encode()).hexdigest()
+    return KEY_PREFIX + digest
+
+
+class CappedCount(int):
+    """A count that stopped at its cap; renders as e.g. "10000+" so it isn't read as exact."""
+
+    def __str__(self):
+        return f"{int(self)}+"
+
+
+def capped_count(queryset, limit) -> int:
+    """Number of rows in `queryset`, counting no further than `limit`.
+
+    The LIMIT goes inside the COUNT's subquery, so the scan stops after `limit` rows. Past
+    the cap the result is a `CappedCount` of `limit`.
+    """
+    count = queryset.order_by()[:limit + 1].count()
+    return CappedCount(limit) if count > limit else count
+
+
+def cached_count(queryset) -> int:
+    key = count_cache_key(queryset)
+    if key is None:
+        return queryset.count()
+    count = cache.get(key)
+    if count is None:
+        with primary_reads():
+            count = queryset.count()
+        cache.set(key, count, timeout=_timeout())
+    return count
+
+
+def store_count(queryset, count) -> None:
+    """Replace `queryset`'s cached count with one known to be exact (as of the primary)."""
+    key = count_cache_key(queryset)
+    if key is not None and queryset.db == DEFAULT_DB_ALIAS:
+        cache.set(key, count, timeout=_timeout())
+
+
+async def astore_count(queryset, count) -> None:
+    """Async `store_count`."""
+    key = count_cache_key(queryset)
+    if key is not None and queryset.db == DEFAULT_DB_ALIAS:
+        await cache.aset(key, count, timeout=_timeout())
+
+
+async def acached_count(queryset) -> int:
+    """Async `cached_count`."""
+    key = count_cache_key(queryset)
+    if key is None:
+        return await queryset.acount()
+    count = await cache.aget(key)
+    if count is None:
+        with primary_reads():
+            count = await queryset.acount()
+        await cache.aset(key, count, timeout=_timeout())
+    return count
+
+
+class _LookaheadPage(Page):
+    def __init__(self, object_list, number, paginator, has_next):
+        super().__init__(object_list, number, paginator)
+        self._has_next = has_next
+
+    def has_next(self):
+        return self._has_next
+
+
+class CountedPaginator(DjangoPaginator):
+    """Django paginator whose total comes from `count_function` instead of `.count()`.
+
+    That total may be stale (cached) or capped, so it only gets reported: which pages exist
+    is decided from the rows. Each page fetches one row more than it shows to know whether
+    there is a next one, and only an empty page past the first is invalid. When a page
+    proves the total wrong it is corrected: exactly on the last page, by
+    `recount_function` when the total is lower than the rows already seen, or else raised
+    to the lower bound those rows give (`count_is_exact` says which).
+
+    Lives here rather than in orders/pagination.py so the admin can use it without
+    importing DRF at startup.
+    """
+
+    def __init__(self, object_list, per_page, count_function, recount_function=None, **kwargs):
+        super().__init__(object_list, per_page, **kwargs)
+        self.count_function = count_function
+        self.recount_function = recount_function
+        self.count_is_exact = False
+
+    @cached_property
+    def count(self):
+        return self.count_function(self.object_list)
+
+    def validate_number(self, number):
+        # Only the lower bound: the upper one would come from a possibly stale total.
+        try:
+            if isinstance(number, float) and not number.is_integer():
+                raise ValueError
+            number = int(number)
+        except (TypeError, ValueError):
+            raise PageNotAnInteger("That page number is not an integer")
+        if number < 1:
+            raise EmptyPage("That page number is less than 1")
+        return number
+
+    def page(self, number):
+        number = self.validate_number(number)
+        bottom = (number - 1) * self.per_page
+        rows = list(self.object_list[bottom:bottom + self.per_page + 1])
+        has_next = len(rows) > self.per_page
+        rows = rows[:self.per_page]
+        if not rows and number > 1:
+            raise EmptyPage("That page contains no results")
+        seen = bottom + len(rows)
+        if not has_next:
+            self._correct_count(seen, exact=True)
+        elif self.count <= seen:
+            if self.recount_function is not None:
+                self._correct_count(self.recount_function(self.object_list), exact=True)
+            else:
+                self._correct_count(seen + 1, exact=False)
+        return _LookaheadPage(rows, number, self, has_next)
+
+    def _correct_count(self, count, exact):
+        self.count = count
+        self.count_is_exact = exact
+        self.__dict__.pop("num_pages", None)
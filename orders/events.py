@@ -0,0 +1,13 @@
+"""Custom signals for set-based order writes.
+
+Queryset updates and `bulk_create` skip `post_save`, so code that changes many orders at
+once sends `orders_bulk_changed` instead. Receivers in orders/signals.py refresh derived
+data (rollups etc.) once per batch.
+"""
+
+from django.dispatch import Signal
+
+# Sent with sender=Order and order_ids=<list of ids whose tracked fields may have changed>.
+# Senders that only inserted the orders pass created=True (there is no previous state);
+# senders that know which fields they changed pass them as fields=(...).
+orders_bulk_changed = Signal()
@@ -0,0 +1,80 @@
+"""Streaming order export (NDJSON / CSV).
+
+Matching order ids are read with `.iterator(chunk_size=...)`; each chunk is serialized by
+the fast path (one orders query, one items query) and written straight into a
+`StreamingHttpResponse`. Memory stays flat however many orders match.
+"""
+
+import csv
+import json
+from itertools import islice
+
+from django.http import StreamingHttpResponse
+from rest_framework.renderers import BaseRenderer
+
+from .fast_serializers import serialize_orders
+
+EXPORT_CHUNK_SIZE = 1000
+
+ORDER_COLUMNS = ["id", "customer", "customer_email", "status", "total_cents", "is_archived", "created_at", "updated_at"]
+ITEM_COLUMNS = ["item_id", "sku", "quantity", "unit_price_cents", "line_total_cents"]
+
+
+class NDJSONRenderer(BaseRenderer):
+    media_type = "application/x-ndjson"
+    format = "ndjson"
+    charset = "utf-8"
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        # Only used for non-streamed responses (e.g. validation errors).
+        return (json.dumps(data) + "\n").encode(self.charset)
+
+
+class CSVRenderer(NDJSONRenderer):
+    media_type = "text/csv"
+    format = "csv"
+
+
+def _iter_orders(queryset, chunk_size):
+    order_ids = queryset.values_list("id", flat=True).iterator(chunk_size=chunk_size)
+    while True:
+        chunk = list(islice(order_ids, chunk_size))
+        if not chunk:
+            return
+        yield from serialize_orders(chunk)
+
+
+def iter_ndjson(queryset, chunk_size=EXPORT_CHUNK_SIZE):
+    for row in _iter_orders(queryset, chunk_size):
+        yield json.dumps(row) + "\n"
+
+
+class _Echo:
+    """File-like object whose write() returns the line, for csv.writer."""
+
+    def write(self, value):
+        return value
+
+
+def iter_csv(queryset, chunk_size=EXPORT_CHUNK_SIZE):
+    """One line per item; orders without items get a single line with empty item columns."""
+    writer = csv.writer(_Echo())
+    yield writer.writerow(ORDER_COLUMNS + ITEM_COLUMNS)
+    for row in _iter_orders(queryset, chunk_size):
+        order_values = [row[column] for column in ORDER_COLUMNS]
+        if not row["items"]:
+            yield writer.writerow(order_values + [""] * len(ITEM_COLUMNS))
+        for item in row["items"]:
+            yield writer.writerow(order_values + [
+                item["id"], item["sku"], item["quantity"], item["unit_price_cents"], item["line_total_cents"],
+            ])
+
+
+def streaming_export_response(queryset, export_format, chunk_size=EXPORT_CHUNK_SIZE):
+    if export_format == CSVRenderer.format:
+        stream, content_type, extension = iter_csv(queryset, chunk_size), "text/csv", "csv"
+    else:
+        stream, content_type, extension = iter_ndjson(queryset, chunk_size), NDJSONRenderer.media_type, "ndjson"
+    response = StreamingHttpResponse(stream, content_type=content_type)
+    response["Content-Disposition"] = f'attachment; filename="orders.{extension}"'
+    return response
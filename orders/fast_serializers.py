@@ -0,0 +1,113 @@
+"""Read-only fast path for order list/retrieve responses.
+
+Builds the exact JSON `OrderSerializer` produces, but from `.values()` rows: one query for
+the orders (joined to the customer email) and one for their items, grouped by order id in
+Python. No model instances and no per-field DRF machinery. Writes still go through
+`OrderSerializer`; tests/test_fast_serializers.py keeps the two outputs identical.
+
+The `a*` variants run the same two queries through the async ORM for orders/async_views.py.
+`serialize_archived_order` gives the same shape for an order moved to the archive tables.
+"""
+
+from rest_framework import serializers
+
+from .archive import aarchived_order_row, archived_order_row
+from .models import Order, OrderItem
+
+ORDER_VALUE_FIELDS = (
+    "id", "customer_id", "customer__email", "status",
+    "total_cents", "is_archived", "created_at", "updated_at",
+)
+ITEM_VALUE_FIELDS = ("id", "order_id", "sku", "quantity", "unit_price_cents")
+
+_datetime_field = serializers.DateTimeField()
+
+
+def _item_rows(order_ids):
+    return OrderItem.objects.filter(order_id__in=order_ids).order_by("id").values_list(*ITEM_VALUE_FIELDS)
+
+
+def _group_items(order_ids, rows) -> dict:
+    grouped = {order_id: [] for order_id in order_ids}
+    for item_id, order_id, sku, quantity, unit_price_cents in rows:
+        grouped[order_id].append({
+            "id": item_id,
+            "order": order_id,
+            "sku": sku,
+            "quantity": quantity,
+            "unit_price_cents": unit_price_cents,
+            "line_total_cents": quantity * unit_price_cents,
+        })
+    return grouped
+
+
+def _items_by_order(order_ids) -> dict:
+    return _group_items(order_ids, _item_rows(order_ids))
+
+
+async def _aitems_by_order(order_ids) -> dict:
+    return _group_items(order_ids, [row async for row in _item_rows(order_ids)])
+
+
+def _order_dict(row, items) -> dict:
+    return {
+        "id": row["id"],
+        "customer": row["customer_id"],
+        "customer_email": row["customer__email"],
+        "status": row["status"],
+        "total_cents": row["total_cents"],
+        "is_archived": row["is_archived"],
+        "created_at": _datetime_field.to_representation(row["created_at"]),
+        "updated_at": _datetime_field.to_representation(row["updated_at"]),
+        "items": items,
+    }
+
+
+def serialize_order_queryset(queryset) -> list[dict]:
+    """Serialize every order in `queryset`, keeping its ordering. Two queries."""
+    order_rows = list(queryset.select_related(None).prefetch_related(None).values(*ORDER_VALUE_FIELDS))
+    items = _items_by_order([row["id"] for row in order_rows])
+    return [_order_dict(row, items[row["id"]]) for row in order_rows]
+
+
+def serialize_orders(order_ids) -> list[dict]:
+    """Serialize orders by id, in the order the ids are given. Two queries."""
+    order_ids = list(order_ids)
+    rows = {row["id"]: row for row in Order.objects.filter(id__in=order_ids).values(*ORDER_VALUE_FIELDS)}
+    items = _items_by_order(list(rows))
+    return [_order_dict(rows[order_id], items[order_id]) for order_id in order_ids if order_id in rows]
+
+
+def serialize_archived_order(order_id):
+    """Serialize an archived order, or None if there is none with this id. One query."""
+    found = archived_order_row(order_id)
+    if found is None:
+        return None
+    row, item_rows = found
+    return _order_dict(row, _group_items([row["id"]], item_rows)[row["id"]])
+
+
+async def aserialize_archived_order(order_id):
+    """Async `serialize_archived_order`."""
+    found = await aarchived_order_row(order_id)
+    if found is None:
+        return None
+    row, item_rows = found
+    return _order_dict(row, _group_items([row["id"]], item_rows)[row["id"]])
+
+
+async def aserialize_order_queryset(queryset) -> list[dict]:
+    """Async `serialize_order_queryset`."""
+    order_rows = [
+        row async for row in queryset.select_related(None).prefetch_related(None).values(*ORDER_VALUE_FIELDS)
+    ]
+    items = await _aitems_by_order([row["id"] for row in order_rows])
+    return [_order_dict(row, items[row["id"]]) for row in order_rows]
+
+
+async def aserialize_orders(order_ids) -> list[dict]:
+    """Async `serialize_orders`."""
+    order_ids = list(order_ids)
+    rows = {row["id"]: row async for row in Order.objects.filter(id__in=order_ids).values(*ORDER_VALUE_FIELDS)}
+    items = await _aitems_by_order(list(rows))
+    return [_order_dict(rows[order_id], items[order_id]) for order_id in order_ids if order_id in rows]
@@ -0,0 +1,169 @@
+"""Streaming NDJSON bulk ingest of orders with nested items (`POST /api/orders/ingest/`).
+
+The request body is read line by line, so memory is bounded by one batch of lines rather
+than by the size of the upload. Each batch of `batch_size` lines is:
+
+1. parsed and validated field by field with `IngestOrderSerializer` (no queries), then
+   checked against the database with one query for which referenced customers exist;
+2. written in its own transaction with one `bulk_create` for orders (totals computed in
+   memory) and one for items, then announced through `orders_bulk_changed` so rollups
+   and stats are updated once per batch.
+
+Bad lines are reported with their line number and skipped; they never abort the stream.
+If a batch fails at write time (e.g. a customer deleted concurrently), its rows are
+retried one by one to pin the error on the offending line(s).
+"""
+
+import json
+
+from django.db import DatabaseError, transaction
+from rest_framework.exceptions import ValidationError
+
+from .events import orders_bulk_changed
+from .models import Customer, Order, OrderItem
+from .serializers import IngestOrderSerializer
+
+INGEST_BATCH_SIZE = 500  # orders per validation pass and per transaction
+INSERT_BATCH_SIZE = 2000
+MAX_LINE_BYTES = 1024 * 1024
+MAX_REPORTED_ERRORS = 1000
+MAX_REPORTED_ORDER_IDS = 1000
+
+
+def iter_lines(readline, max_line_bytes=MAX_LINE_BYTES):
+    """Yield (line_number, bytes) for each non-blank line; overlong lines yield None."""
+    line_number = 0
+    while True:
+        line = readline(max_line_bytes + 1)
+        if not line:
+            return
+        line_number += 1
+        if len(line) > max_line_bytes and not line.endswith(b"\n"):
+            # Skip the rest of the overlong line.
+            while line and not line.endswith(b"\n"):
+                line = readline(max_line_bytes)
+            yield line_number, None
+            continue
+        if line.strip():
+            yield line_number, line
+
+
+def _parse(raw):
+    if raw is None:
+        return None, {"non_field_errors": [f"Line exceeds {MAX_LINE_BYTES} bytes."]}
+    try:
+        data = json.loads(raw)
+    except ValueError as exc:
+        return None, {"non_field_errors": [f"Invalid JSON: {exc}"]}
+    if not isinstance(data, dict):
+        return None, {"non_field_errors": ["Expected a JSON object."]}
+    return data, None
+
+
+def _build(row):
+    items = row["items"]
+    order = Order(
+        customer_id=row["customer"],
+        status=row["status"],
+        total_cents=sum(item["quantity"] * item["unit_price_cents"] for item in items),
+    )
+    return order, items
+
+
+def _write(built) -> list[Order]:
+    """Insert [(order, items)] in one transaction; returns the saved orders."""
+    with transaction.atomic():
+        orders = Order.objects.bulk_create([order for order, _ in built], batch_size=INSERT_BATCH_SIZE)
+        OrderItem.objects.bulk_create(
+            [OrderItem(order=order, **item) for order, items in built for item in items],
+            batch_size=INSERT_BATCH_SIZE,
+        )
+        orders_bulk_changed.send(sender=Order, order_ids=[order.id for order in orders], created=True)
+    return orders
+
+
+class IngestReport:
+    def __init__(self):
+        self.lines = 0
+        self.created = 0
+        self.order_ids = []
+        self.errors = []
+        self.failed = 0
+
+    def error(self, line_number, errors):
+        self.failed += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append({"line": line_number, "errors": errors})
+
+    def saved(self, orders):
+        self.created += len(orders)
+        self.order_ids.extend(order.id for order in orders[:MAX_REPORTED_ORDER_IDS - len(self.order_ids)])
+
+    def as_dict(self) -> dict:
+        return {
+            "lines": self.lines,
+            "created": self.created,
+            "failed": self.failed,
+            "errors": self.errors,
+            "errors_truncated": self.failed > len(self.errors),
+            "order_ids": self.order_ids,
+            "order_ids_truncated": self.created > len(self.order_ids),
+        }
+
+
+def _ingest_batch(batch, report) -> None:
+    parsed = []
+    for line_number, raw in batch:
+        data, error = _parse(raw)
+        if error:
+            report.error(line_number, error)
+        else:
+            parsed.append((line_number, data))
+    if not parsed:
+        return
+
+    validator = IngestOrderSerializer()
+    valid = []
+    for line_number, data in parsed:
+        try:
+            valid.append((line_number, validator.run_validation(data)))
+        except ValidationError as exc:
+            report.error(line_number, exc.detail)
+
+    customer_ids = {row["customer"] for _, row in valid}
+    existing = set(Customer.objects.filter(id__in=customer_ids).values_list("id", flat=True))
+    built = []
+    for line_number, row in valid:
+        if row["customer"] not in existing:
+            report.error(line_number, {"customer": [f"Customer {row['customer']} does not exist."]})
+        else:
+            built.append((line_number, _build(row)))
+    if not built:
+        return
+
+    try:
+        orders = _write([order_items for _, order_items in built])
+    except DatabaseError:
+        # Isolate the failing rows; everything else in the batch still goes in.
+        for line_number, order_items in built:
+            try:
+                report.saved(_write([order_items]))
+            except DatabaseError as exc:
+                report.error(line_number, {"non_field_errors": [f"Could not be saved: {exc}"]})
+        return
+    report.saved(orders)
+
+
+def ingest_orders(lines, batch_size=INGEST_BATCH_SIZE) -> dict:
+    """Ingest (line_number, raw bytes) pairs as produced by `iter_lines`; returns a report."""
+    report = IngestReport()
+    batch = []
+    for line in lines:
+        report.lines += 1
+        batch.append(line)
+        if len(batch) >= batch_size:
+            _ingest_batch(batch, report)
+            batch = []
+    if batch:
+        _ingest_batch(batch, report)
+    return report.as_dict()
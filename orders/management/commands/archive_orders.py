@@ -0,0 +1,43 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from orders.archive import ARCHIVE_BATCH_SIZE, archive_orders, cancelled_after_days, eligible_orders
+
+
+class Command(BaseCommand):
+    help = "Move archived and long-cancelled orders (with their items) into the archive tables."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=ARCHIVE_BATCH_SIZE, help="Orders moved per transaction.")
+        parser.add_argument(
+            "--cancelled-days",
+            type=int,
+            default=None,
+            help="Archive cancelled orders not updated for this many days (default: ARCHIVE_CANCELLED_AFTER_DAYS).",
+        )
+        parser.add_argument("--limit", type=int, default=None, help="Stop after moving this many orders.")
+        parser.add_argument("--dry-run", action="store_true", help="Only report how many orders are eligible.")
+
+    def handle(self, *args, **options):
+        if options["batch_size"] < 1:
+            raise CommandError("--batch-size must be positive.")
+        if options["limit"] is not None and options["limit"] < 1:
+            raise CommandError("--limit must be positive.")
+        cancelled_days = options["cancelled_days"]
+        if cancelled_days is None:
+            cancelled_days = cancelled_after_days()
+        if cancelled_days < 0:
+            raise CommandError("--cancelled-days must not be negative.")
+
+        if options["dry_run"]:
+            count = eligible_orders(cancelled_days).count()
+            self.stdout.write(f"{count} order(s) would be archived.")
+            return
+
+        def progress(moved):
+            if options["verbosity"] > 1:
+                self.stdout.write(f"{moved} order(s) archived")
+
+        moved = archive_orders(
+            batch_size=options["batch_size"], cancelled_days=cancelled_days, limit=options["limit"], progress=progress
+        )
+        self.stdout.write(self.style.SUCCESS(f"Archived {moved} order(s)."))
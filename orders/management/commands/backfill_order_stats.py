@@ -0,0 +1,39 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.utils.dateparse import parse_date
+
+from orders.stats import BACKFILL_BATCH_DAYS, rebuild_daily_stats
+
+
+class Command(BaseCommand):
+    help = "Rebuild the daily order stats from the orders and archive tables (all days, or a date range)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--from", dest="first", help="First day to rebuild (YYYY-MM-DD).")
+        parser.add_argument("--to", dest="last", help="Last day to rebuild (YYYY-MM-DD).")
+        parser.add_argument(
+            "--batch-days",
+            type=int,
+            default=BACKFILL_BATCH_DAYS,
+            help="Days recomputed per query/transaction.",
+        )
+
+    def handle(self, *args, **options):
+        first, last = (self.parse_day(options[name], name) for name in ("first", "last"))
+        if first and last and first > last:
+            raise CommandError("--from must not be after --to.")
+        if options["batch_days"] < 1:
+            raise CommandError("--batch-days must be positive.")
+
+        written = rebuild_daily_stats(first, last, batch_days=options["batch_days"])
+        self.stdout.write(self.style.SUCCESS(f"Wrote {written} daily stats row(s)."))
+
+    def parse_day(self, value, name):
+        if value is None:
+            return None
+        try:
+            day = parse_date(value)
+        except ValueError:
+            day = None
+        if day is None:
+            raise CommandError(f"--{'from' if name == 'first' else 'to'} must be a YYYY-MM-DD date.")
+        return day
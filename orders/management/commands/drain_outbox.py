@@ -0,0 +1,39 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from orders.outbox import DRAIN_BATCH_SIZE, DRAIN_WORKERS, LEASE_SECONDS, MAX_ATTEMPTS, drain
+
+
+class Command(BaseCommand):
+    help = "Deliver pending outbox events to their handlers in batches on a thread pool."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=DRAIN_BATCH_SIZE, help="Events claimed at a time.")
+        parser.add_argument("--workers", type=int, default=DRAIN_WORKERS, help="Handler threads.")
+        parser.add_argument("--max-attempts", type=int, default=MAX_ATTEMPTS, help="Deliveries before giving up.")
+        parser.add_argument(
+            "--lease-seconds", type=int, default=LEASE_SECONDS, help="How long a claimed batch is reserved."
+        )
+        parser.add_argument("--loop", action="store_true", help="Keep polling for new events.")
+        parser.add_argument("--poll-interval", type=float, default=1.0, help="Seconds between polls with --loop.")
+
+    def handle(self, *args, **options):
+        for name in ("batch_size", "workers", "max_attempts", "lease_seconds"):
+            if options[name] < 1:
+                raise CommandError(f"--{name.replace('_', '-')} must be positive.")
+
+        while True:
+            totals = drain(
+                batch_size=options["batch_size"],
+                workers=options["workers"],
+                max_attempts=options["max_attempts"],
+                lease_seconds=options["lease_seconds"],
+            )
+            if any(totals.values()) or not options["loop"]:
+                self.stdout.write(
+                    f"Delivered {totals['done']} event(s), {totals['retried']} to retry, {totals['failed']} failed."
+                )
+            if not options["loop"]:
+                return
+            time.sleep(options["poll_interval"])
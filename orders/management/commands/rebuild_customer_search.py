@@ -0,0 +1,27 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.db.models.functions import Lower, Trim
+
+from orders.models import Customer
+from orders.search import install_email_lower_triggers, install_fts
+
+
+class Command(BaseCommand):
+    help = "Re-derive Customer.email_lower and recreate its SQLite triggers and the trigram search index."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--database", default=DEFAULT_DB_ALIAS)
+
+    def handle(self, *args, **options):
+        using = options["database"]
+        updated = Customer.objects.using(using).update(email_lower=Lower(Trim("email")))
+        self.stdout.write(f"Normalized {updated} customer email(s).")
+
+        connection = connections[using]
+        if connection.vendor != "sqlite":
+            self.stdout.write("Not SQLite: trigram index skipped; prefix search uses email_lower.")
+            return
+        install_email_lower_triggers(connection)
+        if not install_fts(connection):
+            raise CommandError("This SQLite build has no FTS5 trigram tokenizer.")
+        self.stdout.write(self.style.SUCCESS("Rebuilt customer search index."))
@@ -0,0 +1,26 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from orders.sku_sales import REFRESH_BATCH_SIZE, rebuild_sku_rollup
+
+
+class Command(BaseCommand):
+    help = "Rebuild the per-SKU sales rollup by streaming order items in chunks."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--chunk-size", type=int, default=2000, help="Item rows fetched per round trip.")
+        parser.add_argument("--batch-size", type=int, default=REFRESH_BATCH_SIZE, help="Rollup rows per upsert.")
+
+    def handle(self, *args, **options):
+        if options["chunk_size"] < 1 or options["batch_size"] < 1:
+            raise CommandError("--chunk-size and --batch-size must be positive.")
+
+        def progress(written):
+            if options["verbosity"] > 1:
+                self.stdout.write(f"{written} SKU row(s) written")
+
+        with transaction.atomic():
+            written = rebuild_sku_rollup(
+                chunk_size=options["chunk_size"], batch_size=options["batch_size"], progress=progress
+            )
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt {written} SKU rollup row(s)."))
@@ -0,0 +1,38 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from orders import summary_cache
+from orders.rollups import REFRESH_BATCH_SIZE, find_rollup_drift, rebuild_customer_rollups
+
+
+class Command(BaseCommand):
+    help = "Rebuild the per-customer spend rollup from orders, or check it for drift."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--check",
+            action="store_true",
+            help="Only report rows that disagree with the orders table; exit non-zero on drift.",
+        )
+        parser.add_argument("--batch-size", type=int, default=REFRESH_BATCH_SIZE)
+
+    def handle(self, *args, **options):
+        batch_size = options["batch_size"]
+
+        if options["check"]:
+            drift = find_rollup_drift(batch_size=batch_size)
+            for row in drift[:50]:
+                self.stdout.write(
+                    f"customer={row['customer_id']} "
+                    f"stored=({row['order_count']}, {row['total_cents']}) "
+                    f"expected=({row['expected_order_count']}, {row['expected_total_cents']})"
+                )
+            if drift:
+                raise CommandError(f"{len(drift)} rollup row(s) drifted from the orders table.")
+            self.stdout.write(self.style.SUCCESS("Rollup matches the orders table."))
+            return
+
+        with transaction.atomic():
+            written = rebuild_customer_rollups(batch_size=batch_size)
+            summary_cache.invalidate()
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt {written} rollup row(s)."))
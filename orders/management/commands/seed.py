@@ -0,0 +1,47 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from orders.seeding import DEFAULT_CHUNK_SIZE, seed_orders
+
+
+class Command(BaseCommand):
+    help = "Bulk-insert sample customers, orders and items (chunked, bounded memory)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--customers", type=int, default=100)
+        parser.add_argument("--orders-per-customer", type=int, default=5)
+        parser.add_argument("--items-per-order", type=int, default=3)
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=DEFAULT_CHUNK_SIZE,
+            help="Customers generated and committed per chunk.",
+        )
+        parser.add_argument("--seed", type=int, default=None, help="Random seed for reproducible data.")
+
+    def handle(self, *args, **options):
+        if options["chunk_size"] < 1:
+            raise CommandError("--chunk-size must be positive.")
+
+        t0 = time.perf_counter()
+
+        def progress(created):
+            if options["verbosity"] > 1:
+                self.stdout.write(
+                    f"customers={created['customers']} orders={created['orders']} items={created['items']}"
+                )
+
+        created = seed_orders(
+            options["customers"],
+            options["orders_per_customer"],
+            options["items_per_order"],
+            chunk_size=options["chunk_size"],
+            seed=options["seed"],
+            progress=progress,
+        )
+        elapsed = time.perf_counter() - t0
+        self.stdout.write(self.style.SUCCESS(
+            f"Seeded {created['customers']} customers, {created['orders']} orders, "
+            f"{created['items']} items in {elapsed:.2f}s."
+        ))
@@ -0,0 +1,48 @@
+from django.db import migrations, models
+from django.db.models import Count, Sum
+import django.db.models.deletion
+
+
+def backfill_rollups(apps, schema_editor):
+    Customer = apps.get_model("orders", "Customer")
+    Order = apps.get_model("orders", "Order")
+    CustomerSpendRollup = apps.get_model("orders", "CustomerSpendRollup")
+
+    totals = {
+        row["customer_id"]: (row["order_count"], row["total_cents"] or 0)
+        for row in Order.objects.filter(status="paid", is_archived=False)
+        .values("customer_id")
+        .annotate(order_count=Count("id"), total_cents=Sum("total_cents"))
+        .order_by()
+    }
+    rows = (
+        CustomerSpendRollup(
+            customer_id=customer_id,
+            order_count=totals.get(customer_id, (0, 0))[0],
+            total_cents=totals.get(customer_id, (0, 0))[1],
+        )
+        for customer_id in Customer.objects.values_list("id", flat=True).iterator()
+    )
+    CustomerSpendRollup.objects.bulk_create(rows, batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("orders", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="CustomerSpendRollup",
+            fields=[
+                ("customer", models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name="spend_rollup", serialize=False, to="orders.customer")),
+                ("order_count", models.IntegerField(default=0)),
+                ("total_cents", models.BigIntegerField(default=0)),
+            ],
+            options={
+                "indexes": [models.Index(fields=["-total_cents", "-customer"], name="rollup_total_desc_idx")],
+            },
+        ),
+        migrations.RunPython(backfill_rollups, migrations.RunPython.noop),
+    ]
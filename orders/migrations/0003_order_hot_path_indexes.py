@@ -0,0 +1,31 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("orders", "0002_customer_spend_rollup"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="order",
+            index=models.Index(fields=["status", "is_archived", "customer"], name="order_status_arch_cust_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="order",
+            index=models.Index(condition=models.Q(("is_archived", False), ("status", "paid")), fields=["customer", "total_cents"], name="order_paid_live_cust_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="order",
+            index=models.Index(condition=models.Q(("is_archived", False)), fields=["status", "-id"], name="order_live_status_id_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="order",
+            index=models.Index(condition=models.Q(("is_archived", False)), fields=["-id"], name="order_live_id_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="order",
+            index=models.Index(fields=["-created_at", "-id"], name="order_created_id_idx"),
+        ),
+    ]
@@ -0,0 +1,72 @@
+from django.db import DatabaseError, migrations, models, transaction
+from django.db.models.functions import Lower, Trim
+
+# Inlined rather than imported from orders.search, so later edits there can't change what
+# this migration does. Keep `python manage.py rebuild_customer_search` as the way to
+# recreate the current version.
+FTS_SQL = [
+    """CREATE VIRTUAL TABLE IF NOT EXISTS orders_customer_search USING fts5(
+        email, name, content='orders_customer', content_rowid='id', tokenize='trigram'
+    )""",
+    """CREATE TRIGGER IF NOT EXISTS orders_customer_search_ai AFTER INSERT ON orders_customer BEGIN
+        INSERT INTO orders_customer_search(rowid, email, name) VALUES (new.id, new.email, new.name);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS orders_customer_search_ad AFTER DELETE ON orders_customer BEGIN
+        INSERT INTO orders_customer_search(orders_customer_search, rowid, email, name)
+        VALUES ('delete', old.id, old.email, old.name);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS orders_customer_search_au AFTER UPDATE OF email, name ON orders_customer BEGIN
+        INSERT INTO orders_customer_search(orders_customer_search, rowid, email, name)
+        VALUES ('delete', old.id, old.email, old.name);
+        INSERT INTO orders_customer_search(rowid, email, name) VALUES (new.id, new.email, new.name);
+    END""",
+    "INSERT INTO orders_customer_search(orders_customer_search) VALUES ('rebuild')",
+]
+
+DROP_FTS_SQL = [
+    "DROP TRIGGER IF EXISTS orders_customer_search_ai",
+    "DROP TRIGGER IF EXISTS orders_customer_search_ad",
+    "DROP TRIGGER IF EXISTS orders_customer_search_au",
+    "DROP TABLE IF EXISTS orders_customer_search",
+]
+
+
+def backfill_email_lower(apps, schema_editor):
+    Customer = apps.get_model("orders", "Customer")
+    Customer.objects.update(email_lower=Lower(Trim("email")))
+
+
+def create_search_index(apps, schema_editor):
+    connection = schema_editor.connection
+    if connection.vendor != "sqlite":
+        return
+    try:
+        with transaction.atomic(using=connection.alias), connection.cursor() as cursor:
+            for statement in DROP_FTS_SQL + FTS_SQL:
+                cursor.execute(statement)
+    except DatabaseError:
+        pass  # SQLite built without FTS5 or older than 3.34 (no trigram tokenizer).
+
+
+def drop_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor == "sqlite":
+        for statement in DROP_FTS_SQL:
+            schema_editor.execute(statement)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("orders", "0003_order_hot_path_indexes"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="customer",
+            name="email_lower",
+            field=models.CharField(db_index=True, default="", editable=False, max_length=254),
+        ),
+        migrations.RunPython(backfill_email_lower, migrations.RunPython.noop),
+        # SQLite-only trigram index; a no-op on other databases or builds without FTS5.
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
@@ -0,0 +1,47 @@
+from django.db import migrations, models
+from django.db.models import Count, Sum
+from django.db.models.functions import TruncDate
+
+
+def backfill_daily_stats(apps, schema_editor):
+    Order = apps.get_model("orders", "Order")
+    DailyOrderStats = apps.get_model("orders", "DailyOrderStats")
+
+    rows = (
+        DailyOrderStats(
+            day=row["day"],
+            status=row["status"],
+            order_count=row["order_count"],
+            total_cents=row["total_cents"] or 0,
+        )
+        for row in Order.objects.annotate(day=TruncDate("created_at"))
+        .values("day", "status")
+        .annotate(order_count=Count("id"), total_cents=Sum("total_cents"))
+        .order_by()
+        .iterator()
+    )
+    DailyOrderStats.objects.bulk_create(rows, batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("orders", "0004_customer_search"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="DailyOrderStats",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("day", models.DateField()),
+                ("status", models.CharField(choices=[("draft", "Draft"), ("paid", "Paid"), ("shipped", "Shipped"), ("cancelled", "Cancelled")], max_length=20)),
+                ("order_count", models.IntegerField(default=0)),
+                ("total_cents", models.BigIntegerField(default=0)),
+            ],
+            options={
+                "constraints": [models.UniqueConstraint(fields=("day", "status"), name="daily_stats_day_status_uniq")],
+            },
+        ),
+        migrations.RunPython(backfill_daily_stats, migrations.RunPython.noop),
+    ]
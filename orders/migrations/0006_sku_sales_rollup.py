@@ -0,0 +1,53 @@
+from django.db import migrations, models
+from django.db.models import Count, F, Sum
+
+
+def backfill_sku_rollup(apps, schema_editor):
+    OrderItem = apps.get_model("orders", "OrderItem")
+    SkuSalesRollup = apps.get_model("orders", "SkuSalesRollup")
+
+    rows = (
+        SkuSalesRollup(
+            sku=row["sku"],
+            units=row["units"] or 0,
+            revenue_cents=row["revenue_cents"] or 0,
+            order_count=row["order_count"],
+        )
+        for row in OrderItem.objects.filter(order__status="paid")
+        .values("sku")
+        .annotate(
+            units=Sum("quantity"),
+            revenue_cents=Sum(F("quantity") * F("unit_price_cents")),
+            order_count=Count("order_id", distinct=True),
+        )
+        .order_by()
+        .iterator()
+    )
+    SkuSalesRollup.objects.bulk_create(rows, batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("orders", "0005_daily_order_stats"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="orderitem",
+            index=models.Index(fields=["sku", "order"], name="item_sku_order_idx"),
+        ),
+        migrations.CreateModel(
+            name="SkuSalesRollup",
+            fields=[
+                ("sku", models.CharField(max_length=64, primary_key=True, serialize=False)),
+                ("units", models.BigIntegerField(default=0)),
+                ("revenue_cents", models.BigIntegerField(default=0)),
+                ("order_count", models.IntegerField(default=0)),
+            ],
+            options={
+                "indexes": [models.Index(fields=["-revenue_cents", "sku"], name="sku_rollup_revenue_idx")],
+            },
+        ),
+        migrations.RunPython(backfill_sku_rollup, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,38 @@
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("orders", "0006_sku_sales_rollup"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ArchivedOrder",
+            fields=[
+                ("id", models.BigIntegerField(primary_key=True, serialize=False)),
+                ("status", models.CharField(choices=[("draft", "Draft"), ("paid", "Paid"), ("shipped", "Shipped"), ("cancelled", "Cancelled")], max_length=20)),
+                ("total_cents", models.IntegerField(default=0)),
+                ("is_archived", models.BooleanField(default=False)),
+                ("created_at", models.DateTimeField()),
+                ("updated_at", models.DateTimeField()),
+                ("archived_at", models.DateTimeField(auto_now_add=True)),
+                ("customer", models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name="archived_orders", to="orders.customer")),
+            ],
+        ),
+        migrations.CreateModel(
+            name="ArchivedOrderItem",
+            fields=[
+                ("id", models.BigIntegerField(primary_key=True, serialize=False)),
+                ("sku", models.CharField(max_length=64)),
+                ("quantity", models.PositiveIntegerField(default=1)),
+                ("unit_price_cents", models.PositiveIntegerField(default=0)),
+                ("order", models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name="items", to="orders.archivedorder")),
+            ],
+            options={
+                "indexes": [models.Index(fields=["sku", "order"], name="archived_item_sku_order_idx")],
+            },
+        ),
+    ]
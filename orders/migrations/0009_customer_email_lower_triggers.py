@@ -0,0 +1,46 @@
+from django.db import migrations
+from django.db.models.functions import Lower, Trim
+
+# Inlined from orders.search.EMAIL_LOWER_SQL at the time of writing.
+EMAIL_LOWER_SQL = [
+    """CREATE TRIGGER IF NOT EXISTS orders_customer_email_lower_ai AFTER INSERT ON orders_customer
+    WHEN new.email_lower = '' BEGIN
+        UPDATE orders_customer SET email_lower = lower(trim(new.email)) WHERE id = new.id;
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS orders_customer_email_lower_au AFTER UPDATE OF email ON orders_customer
+    WHEN new.email IS NOT old.email AND new.email_lower IS old.email_lower BEGIN
+        UPDATE orders_customer SET email_lower = lower(trim(new.email)) WHERE id = new.id;
+    END""",
+]
+
+DROP_EMAIL_LOWER_SQL = [
+    "DROP TRIGGER IF EXISTS orders_customer_email_lower_ai",
+    "DROP TRIGGER IF EXISTS orders_customer_email_lower_au",
+]
+
+
+def create_triggers(apps, schema_editor):
+    # Rows written by bulk_create / .update(email=...) before the triggers existed.
+    Customer = apps.get_model("orders", "Customer")
+    Customer.objects.update(email_lower=Lower(Trim("email")))
+    if schema_editor.connection.vendor == "sqlite":
+        for statement in DROP_EMAIL_LOWER_SQL + EMAIL_LOWER_SQL:
+            schema_editor.execute(statement)
+
+
+def drop_triggers(apps, schema_editor):
+    if schema_editor.connection.vendor == "sqlite":
+        for statement in DROP_EMAIL_LOWER_SQL:
+            schema_editor.execute(statement)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("orders", "0008_outbox_event"),
+    ]
+
+    operations = [
+        # SQLite-only; other databases rely on Customer.save (see orders/search.py).
+        migrations.RunPython(create_triggers, drop_triggers),
+    ]
@@ -1,15 +1,31 @@
-from django.db import models
+from django.db import models, transaction
 
 class Customer(models.Model):
     name = models.CharField(max_length=120)
     email = models.EmailField(unique=True)
+    # Lowercased copy of `email` for indexed prefix search (see orders/search.py).
+    email_lower = models.CharField(max_length=254, db_index=True, editable=False, default="")
     is_active = models.BooleanField(default=True)
     created_at = models.DateTimeField(auto_now_add=True)
 
+    def save(self, *args, **kwargs):
+        self.email_lower = (self.email or "").strip().lower()
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None and "email" in update_fields:
+            kwargs["update_fields"] = {*update_fields, "email_lower"}
+        super().save(*args, **kwargs)
+
     def __str__(self) -> str:
         return f"{self.name} <{self.email}>"
 
 class Order(models.Model):
+    # Fields whose previous values signal receivers need to maintain rollups incrementally.
+    TRACKED_FIELDS = ("customer_id", "status", "total_cents", "is_archived")
+    # Changes to these are published through the outbox (orders/outbox.py).
+    OUTBOX_FIELDS = ("status", "is_archived")
+    # Compare-and-set attempts per save before falling back to a recompute (see _do_update).
+    SAVE_ATTEMPTS = 3
+
     class Status(models.TextChoices):
         DRAFT = "draft", "Draft"
         PAID = "paid", "Paid"
@@ -24,26 +40,279 @@ class Order(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    class Meta:
+        # Access paths locked in by orders/tests/test_query_plans.py.
+        indexes = [
+            # Summary/rollup aggregation: paid, non-archived orders per customer.
+            models.Index(fields=["status", "is_archived", "customer"], name="order_status_arch_cust_idx"),
+            models.Index(
+                fields=["customer", "total_cents"],
+                name="order_paid_live_cust_idx",
+                condition=models.Q(status="paid", is_archived=False),
+            ),
+            # Order list: non-archived, optionally by status, newest first.
+            models.Index(
+                fields=["status", "-id"],
+                name="order_live_status_id_idx",
+                condition=models.Q(is_archived=False),
+            ),
+            models.Index(fields=["-id"], name="order_live_id_idx", condition=models.Q(is_archived=False)),
+            # Time-ordered keyset pages (?pagination=cursor&ordering=created_at).
+            models.Index(fields=["-created_at", "-id"], name="order_created_id_idx"),
+        ]
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_values = instance.tracked_state()
+        return instance
+
+    def tracked_state(self) -> dict:
+        # Deferred fields are skipped so loading them here doesn't trigger extra queries.
+        deferred = self.get_deferred_fields()
+        return {name: getattr(self, name) for name in self.TRACKED_FIELDS if name not in deferred}
+
+    def previous_state(self):
+        """State as last loaded from / written to the DB, or None for unsaved instances."""
+        return getattr(self, "_loaded_values", None)
+
+    def saved_state(self) -> dict:
+        """Tracked state of the row as the last save left it: its baseline plus what it wrote.
+
+        Differs from `tracked_state()` after a partial save (`update_fields`) whose other
+        fields are stale or have unsaved changes. The post_save receivers use this.
+        """
+        current = self.tracked_state()
+        previous = self.previous_state()
+        written = getattr(self, "_written_fields", None)
+        if not previous or written is None:
+            return current
+        return {**previous, **{name: value for name, value in current.items() if name in written}}
+
+    def outbox_changes(self, update_fields=None) -> dict:
+        """{field: (old, new)} for changed OUTBOX_FIELDS being saved; empty for new orders."""
+        previous = self.previous_state()
+        if not previous:
+            return {}
+        current = self.tracked_state()
+        return {
+            name: (previous[name], current[name])
+            for name in self.OUTBOX_FIELDS
+            if name in previous and name in current and previous[name] != current[name]
+            and (update_fields is None or name in update_fields)
+        }
+
+    def _do_update(self, base_qs, using, pk_val, values, update_fields, forced_update):
+        # Compare-and-set: the UPDATE only matches while the row still holds the state the
+        # post_save receivers compute their deltas from. If another writer got there first
+        # (two concurrent cancels of one paid order), reload the row as the baseline and
+        # retry, so its change isn't applied twice. The receivers combine that baseline with
+        # the fields this save wrote (`saved_state`), not with the instance's other, possibly
+        # stale, fields. After too many lost races there is no baseline and the receivers
+        # recompute from the table instead.
+        self._written_fields = {field.attname for field, _, _ in values}
+        previous = self.previous_state()
+        if values and previous:
+            for _ in range(self.SAVE_ATTEMPTS):
+                if super()._do_update(base_qs.filter(**previous), using, pk_val, values, update_fields, forced_update):
+                    return True
+                previous = base_qs.filter(pk=pk_val).values(*previous).first()
+                if previous is None:
+                    break  # the row is gone; Django decides what an unmatched save means
+                self._loaded_values = previous
+            else:
+                self._loaded_values = None
+        return super()._do_update(base_qs, using, pk_val, values, update_fields, forced_update)
+
+    def save(self, *args, **kwargs):
+        self._written_fields = None  # set by _do_update; an INSERT writes everything
+        if self.outbox_changes(kwargs.get("update_fields")):
+            # The outbox event written by post_save commits (or rolls back) with the change.
+            with transaction.atomic(using=kwargs.get("using")):
+                super().save(*args, **kwargs)
+        else:
+            super().save(*args, **kwargs)
+        # post_save receivers have seen the previous state by now; this becomes the new baseline.
+        self._loaded_values = self.saved_state()
+
     def __str__(self) -> str:
         return f"Order #{self.id} ({self.status})"
 
 class OrderItem(models.Model):
+    # Fields whose previous values the total and SKU rollup receivers need.
+    TRACKED_FIELDS = ("order_id", "sku", "quantity", "unit_price_cents")
+
     order = models.ForeignKey(Order, related_name="items", on_delete=models.CASCADE)
     sku = models.CharField(max_length=64)
     quantity = models.PositiveIntegerField(default=1)
     unit_price_cents = models.PositiveIntegerField(default=0)
 
+    class Meta:
+        indexes = [
+            # Per-SKU rollup refreshes and the streaming rebuild (sku, then order).
+            models.Index(fields=["sku", "order"], name="item_sku_order_idx"),
+        ]
+
     def line_total_cents(self) -> int:
         return int(self.quantity) * int(self.unit_price_cents)
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Lets the receivers notice an item moving to another order or changing SKU.
+        instance._loaded_values = instance.tracked_state()
+        return instance
+
+    def tracked_state(self) -> dict:
+        deferred = self.get_deferred_fields()
+        return {name: getattr(self, name) for name in self.TRACKED_FIELDS if name not in deferred}
+
+    def previous_state(self):
+        """State as last loaded from / written to the DB, or None for unsaved instances."""
+        return getattr(self, "_loaded_values", None)
+
     def save(self, *args, **kwargs):
+        # Order total is kept in sync by receivers in orders/signals.py (see orders/totals.py).
         super().save(*args, **kwargs)
-        # Keep order total in sync (simple, intentionally not the most efficient way).
-        total = 0
-        for item in self.order.items.all():
-            total += item.line_total_cents()
-        self.order.total_cents = total
-        self.order.save(update_fields=["total_cents", "updated_at"])
+        self._loaded_values = self.tracked_state()
 
     def __str__(self) -> str:
         return f"{self.sku} x{self.quantity}"
+
+class CustomerSpendRollup(models.Model):
+    """Denormalized paid, non-archived spend per customer.
+
+    Maintained incrementally by orders/signals.py; rebuild with
+    `python manage.py rebuild_spend_rollup` (add `--check` to only report drift).
+    """
+
+    customer = models.OneToOneField(
+        Customer, primary_key=True, related_name="spend_rollup", on_delete=models.CASCADE
+    )
+    order_count = models.IntegerField(default=0)
+    total_cents = models.BigIntegerField(default=0)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["-total_cents", "-customer"], name="rollup_total_desc_idx"),
+        ]
+
+    def __str__(self) -> str:
+        return f"Rollup for customer #{self.customer_id}: {self.total_cents}"
+
+class DailyOrderStats(models.Model):
+    """Order count and revenue per (day, status), archived orders included.
+
+    `day` is the order's `created_at` date in the current time zone. Maintained
+    incrementally by orders/signals.py; rebuild with `python manage.py backfill_order_stats`.
+    """
+
+    day = models.DateField()
+    status = models.CharField(max_length=20, choices=Order.Status.choices)
+    order_count = models.IntegerField(default=0)
+    total_cents = models.BigIntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            # Also the index range queries on `day` use.
+            models.UniqueConstraint(fields=["day", "status"], name="daily_stats_day_status_uniq"),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.day} {self.status}: {self.order_count} orders, {self.total_cents}"
+
+class SkuSalesRollup(models.Model):
+    """Units, revenue and number of orders per SKU over paid orders (archived included).
+
+    Maintained incrementally by orders/signals.py (see orders/sku_sales.py); rebuild with
+    `python manage.py rebuild_sku_rollup`.
+    """
+
+    sku = models.CharField(max_length=64, primary_key=True)
+    units = models.BigIntegerField(default=0)
+    revenue_cents = models.BigIntegerField(default=0)
+    order_count = models.IntegerField(default=0)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["-revenue_cents", "sku"], name="sku_rollup_revenue_idx"),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.sku}: {self.units} units, {self.revenue_cents}"
+
+class ArchivedOrder(models.Model):
+    """An order moved out of `orders_order` by `python manage.py archive_orders`.
+
+    Keeps the order's id (ids aren't reused by the hot table), so lookups by id can fall
+    back here. Still counted by `DailyOrderStats` and, when paid, by `SkuSalesRollup`.
+    """
+
+    id = models.BigIntegerField(primary_key=True)
+    customer = models.ForeignKey(Customer, related_name="archived_orders", on_delete=models.CASCADE)
+    status = models.CharField(max_length=20, choices=Order.Status.choices)
+    total_cents = models.IntegerField(default=0)
+    is_archived = models.BooleanField(default=False)
+    created_at = models.DateTimeField()
+    updated_at = models.DateTimeField()
+    archived_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self) -> str:
+        return f"Archived order #{self.id} ({self.status})"
+
+class ArchivedOrderItem(models.Model):
+    id = models.BigIntegerField(primary_key=True)
+    order = models.ForeignKey(ArchivedOrder, related_name="items", on_delete=models.CASCADE)
+    sku = models.CharField(max_length=64)
+    quantity = models.PositiveIntegerField(default=1)
+    unit_price_cents = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        indexes = [
+            # Same access path as item_sku_order_idx for SKU rollup refreshes.
+            models.Index(fields=["sku", "order"], name="archived_item_sku_order_idx"),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.sku} x{self.quantity}"
+
+class OutboxEvent(models.Model):
+    """A side effect to run after an order write has committed (see orders/outbox.py).
+
+    Written in the same transaction as the change; `manage.py drain_outbox` delivers it to
+    the handlers registered for `kind` at least once. Handlers get `idempotency_key` to
+    recognise redeliveries.
+    """
+
+    class Status(models.TextChoices):
+        PENDING = "pending", "Pending"
+        PROCESSING = "processing", "Processing"
+        DONE = "done", "Done"
+        FAILED = "failed", "Failed"
+
+    kind = models.CharField(max_length=64)
+    idempotency_key = models.CharField(max_length=200, unique=True)
+    # Plain id, not a FK: events outlive their order (deleted, archived).
+    order_id = models.BigIntegerField()
+    payload = models.JSONField(default=dict)
+    status = models.CharField(max_length=20, choices=Status.choices, default=Status.PENDING)
+    attempts = models.PositiveIntegerField(default=0)
+    # Pending: not before (retry backoff). Processing: lease expiry, after which it's reclaimed.
+    available_at = models.DateTimeField()
+    claim_token = models.CharField(max_length=32, blank=True, default="")
+    last_error = models.TextField(blank=True, default="")
+    created_at = models.DateTimeField(auto_now_add=True)
+    processed_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            # The drain's claim query: undelivered events that are due, oldest first.
+            models.Index(
+                fields=["available_at", "id"],
+                name="outbox_due_idx",
+                condition=models.Q(status__in=["pending", "processing"]),
+            ),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.kind} #{self.id} ({self.status})"
@@ -0,0 +1,199 @@
+"""Transactional outbox for order status side effects.
+
+Changing an order's `status` or `is_archived` writes an `OutboxEvent` row in the same
+transaction as the change. A single save is wrapped in `atomic()` by `Order.save`, and
+`bulk_transition` already runs in one. So the request pays for one INSERT, and an event
+exists if and only if the change committed. Work that can happen later (notifications,
+webhooks, ...) goes in a handler listed in `settings.OUTBOX_HANDLERS`, not in a
+`post_save` receiver.
+
+`python manage.py drain_outbox` delivers the events:
+
+1. claim up to `batch_size` due events with one guarded UPDATE. The UPDATE stamps a claim
+   token and a lease, so concurrent drainers never take the same event. A drainer that
+   dies mid-batch leaves events that are reclaimed once their lease expires;
+2. run each event's handlers on a thread pool;
+3. mark successes done with one UPDATE. Failures are retried with exponential backoff
+   until `max_attempts` deliveries, then marked failed with the last error.
+
+Delivery is at least once: a drainer can run a handler and then crash before marking
+the event done. `idempotency_key` is stable per change (order, fields, timestamp), so
+handlers use it to drop duplicates. The same key also makes recording idempotent.
+"""
+
+import datetime
+import logging
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.db import close_old_connections, connections
+from django.db.models import F
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+from .models import Order, OutboxEvent
+
+logger = logging.getLogger(__name__)
+
+STATUS_CHANGED = "order.status_changed"
+
+DRAIN_BATCH_SIZE = 100
+DRAIN_WORKERS = 4
+MAX_ATTEMPTS = 5
+LEASE_SECONDS = 300
+RETRY_BASE_SECONDS = 2
+RETRY_MAX_SECONDS = 3600
+RECORD_BATCH_SIZE = 500
+
+
+def _event(order_id, customer_id, changes, changed_at, now) -> OutboxEvent:
+    changed = ",".join(f"{name}={new}" for name, (_, new) in sorted(changes.items()))
+    return OutboxEvent(
+        kind=STATUS_CHANGED,
+        idempotency_key=f"{STATUS_CHANGED}:{order_id}:{changed}:{changed_at.isoformat()}",
+        order_id=order_id,
+        payload={
+            "order_id": order_id,
+            "customer_id": customer_id,
+            "changes": {name: [old, new] for name, (old, new) in changes.items()},
+        },
+        available_at=now,
+    )
+
+
+def record_order_change(order: Order, changes) -> None:
+    """Queue a status-change event for `order` (`changes` from `Order.outbox_changes`)."""
+    now = timezone.now()
+    OutboxEvent.objects.bulk_create(
+        [_event(order.pk, order.customer_id, changes, order.updated_at or now, now)], ignore_conflicts=True
+    )
+
+
+def record_bulk_change(rows, field, value, changed_at) -> None:
+    """Queue events for a set-based update of `field` to `value`.
+
+    `rows` are {"id", "customer_id", field} dicts read before the update.
+    """
+    now = timezone.now()
+    OutboxEvent.objects.bulk_create(
+        [_event(row["id"], row["customer_id"], {field: (row[field], value)}, changed_at, now) for row in rows],
+        batch_size=RECORD_BATCH_SIZE,
+        ignore_conflicts=True,
+    )
+
+
+def handlers_for(kind) -> list:
+    return [import_string(path) for path in getattr(settings, "OUTBOX_HANDLERS", {}).get(kind, ())]
+
+
+def log_status_change(event: OutboxEvent) -> None:
+    """Default handler: one log line per change."""
+    logger.info("order %s changed: %s", event.order_id, event.payload.get("changes"))
+
+
+def _due(now):
+    return OutboxEvent.objects.filter(
+        status__in=[OutboxEvent.Status.PENDING, OutboxEvent.Status.PROCESSING], available_at__lte=now
+    )
+
+
+def claim(batch_size=DRAIN_BATCH_SIZE, lease_seconds=LEASE_SECONDS) -> tuple[str, list[OutboxEvent]]:
+    """Claim up to `batch_size` due events, oldest first. Returns (claim token, events)."""
+    now = timezone.now()
+    ids = list(_due(now).order_by("available_at", "id").values_list("id", flat=True)[:batch_size])
+    if not ids:
+        return "", []
+    token = uuid.uuid4().hex
+    # Re-checks "due": an event another drainer claimed since the SELECT no longer matches.
+    _due(now).filter(id__in=ids).update(
+        status=OutboxEvent.Status.PROCESSING,
+        claim_token=token,
+        available_at=now + datetime.timedelta(seconds=lease_seconds),
+        attempts=F("attempts") + 1,
+    )
+    return token, list(OutboxEvent.objects.filter(claim_token=token).order_by("id"))
+
+
+def _deliver(event: OutboxEvent):
+    """Run the event's handlers; returns None or the error text."""
+    try:
+        for handler in handlers_for(event.kind):
+            handler(event)
+    except Exception as exc:
+        logger.warning("outbox event %s (%s) failed", event.id, event.idempotency_key, exc_info=True)
+        return f"{type(exc).__name__}: {exc}"
+    finally:
+        # Pool threads keep their own connections; recycle them like the request cycle does.
+        close_old_connections()
+    return None
+
+
+def retry_delay(attempts) -> datetime.timedelta:
+    return datetime.timedelta(seconds=min(RETRY_BASE_SECONDS * 2 ** (attempts - 1), RETRY_MAX_SECONDS))
+
+
+def _settle(token, events, errors, max_attempts) -> dict:
+    now = timezone.now()
+    counts = {"done": 0, "retried": 0, "failed": 0}
+    claimed = OutboxEvent.objects.filter(claim_token=token)
+
+    done = [event.id for event, error in zip(events, errors) if error is None]
+    if done:
+        counts["done"] = claimed.filter(id__in=done).update(
+            status=OutboxEvent.Status.DONE, processed_at=now, claim_token="", last_error=""
+        )
+    for event, error in zip(events, errors):
+        if error is None:
+            continue
+        if event.attempts >= max_attempts:
+            counts["failed"] += claimed.filter(id=event.id).update(
+                status=OutboxEvent.Status.FAILED, claim_token="", last_error=error
+            )
+        else:
+            counts["retried"] += claimed.filter(id=event.id).update(
+                status=OutboxEvent.Status.PENDING, claim_token="", last_error=error,
+                available_at=now + retry_delay(event.attempts),
+            )
+    return counts
+
+
+def _close_pool_connections(pool, workers) -> None:
+    """Close the connections the pool's threads hold, once per thread, before it shuts down.
+
+    Otherwise each thread's connections stay open until the process exits. The barrier holds
+    every task until all `workers` have started, so each lands on a different thread.
+    """
+    barrier = threading.Barrier(workers)
+
+    def close(_):
+        try:
+            barrier.wait(timeout=5)
+        except threading.BrokenBarrierError:
+            pass
+        connections.close_all()
+
+    list(pool.map(close, range(workers)))
+
+
+def drain(
+    batch_size=DRAIN_BATCH_SIZE, workers=DRAIN_WORKERS, max_attempts=MAX_ATTEMPTS,
+    lease_seconds=LEASE_SECONDS, max_batches=None,
+) -> dict:
+    """Deliver due events batch by batch until none are left (or `max_batches`)."""
+    totals = {"done": 0, "retried": 0, "failed": 0}
+    batches = 0
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        try:
+            while max_batches is None or batches < max_batches:
+                token, events = claim(batch_size, lease_seconds)
+                if not events:
+                    break
+                errors = list(pool.map(_deliver, events))
+                for name, count in _settle(token, events, errors, max_attempts).items():
+                    totals[name] += count
+                batches += 1
+        finally:
+            _close_pool_connections(pool, workers)
+    return totals
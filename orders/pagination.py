@@ -0,0 +1,139 @@
+"""Pagination for the order/customer list endpoints.
+
+Default behaviour is DRF's page-number pagination. Clients that walk deep into history
+can opt into keyset (cursor) mode with `?pagination=cursor`: pages are fetched with
+`WHERE (key) < (last seen key) ORDER BY key DESC LIMIT n`, so there is no `COUNT(*)` and
+no `OFFSET` scan however far they go. Follow the returned `next` link to continue.
+
+In page-number mode the total `count` comes from orders/counts.py's count cache unless the
+client asks for `?count=exact` or the page is the last one; `count_exact` in the payload says
+which one it got. `next` and page validity never depend on a cached count.
+"""
+
+import base64
+import json
+
+from django.db.models import Q
+from django.utils.dateparse import parse_datetime
+from rest_framework.exceptions import NotFound, ValidationError
+from rest_framework.pagination import PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+from .counts import CountedPaginator, cached_count, store_count, wants_exact_count
+
+
+class OptInCursorPagination(PageNumberPagination):
+    mode_query_param = "pagination"
+    cursor_query_param = "cursor"
+    ordering_query_param = "ordering"
+    invalid_cursor_message = "Invalid cursor"
+
+    # Keyset orderings clients may pick with `?ordering=`; every key ends in the unique id.
+    cursor_orderings = {
+        "id": ("-id",),
+        "created_at": ("-created_at", "-id"),
+    }
+    default_cursor_ordering = "id"
+
+    def use_cursor(self, request) -> bool:
+        return (
+            request.query_params.get(self.mode_query_param) == "cursor"
+            or self.cursor_query_param in request.query_params
+        )
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.cursor_mode = self.use_cursor(request)
+        if not self.cursor_mode:
+            self.count_exact = wants_exact_count(request.query_params)
+            page = super().paginate_queryset(queryset, request, view)
+            if self.page.paginator.count_is_exact:
+                store_count(queryset, self.page.paginator.count)
+            return page
+
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        self.ordering = self.get_cursor_ordering(request)
+
+        queryset = queryset.order_by(*self.ordering)
+        encoded = request.query_params.get(self.cursor_query_param)
+        if encoded:
+            queryset = queryset.filter(self.keyset_filter(self.decode_cursor(encoded)))
+
+        rows = list(queryset[:self.page_size + 1])
+        self.has_next = len(rows) > self.page_size
+        self.page = rows[:self.page_size]
+        return self.page
+
+    def django_paginator_class(self, object_list, per_page):
+        paginator = CountedPaginator(
+            object_list, per_page, cached_count, recount_function=lambda queryset: queryset.count()
+        )
+        if self.count_exact:
+            paginator.count_function = paginator.recount_function
+            paginator.count_is_exact = True
+        return paginator
+
+    def get_cursor_ordering(self, request):
+        name = request.query_params.get(self.ordering_query_param, self.default_cursor_ordering)
+        if name not in self.cursor_orderings:
+            allowed_text = ", ".join(sorted(self.cursor_orderings))
+            raise ValidationError({self.ordering_query_param: f"Invalid ordering. Use one of: {allowed_text}."})
+        return self.cursor_orderings[name]
+
+    def keyset_filter(self, values) -> Q:
+        # (a, b) < (x, y)  <=>  a < x OR (a = x AND b < y), flipped per field for ascending keys.
+        condition = Q()
+        equal_prefix = Q()
+        for field, value in zip(self.ordering, values):
+            name = field.lstrip("-")
+            lookup = "lt" if field.startswith("-") else "gt"
+            condition |= equal_prefix & Q(**{f"{name}__{lookup}": value})
+            equal_prefix &= Q(**{name: value})
+        return condition
+
+    def encode_cursor(self, obj) -> str:
+        values = []
+        for field in self.ordering:
+            value = getattr(obj, field.lstrip("-"))
+            values.append(value.isoformat() if hasattr(value, "isoformat") else value)
+        return base64.urlsafe_b64encode(json.dumps(values).encode()).decode()
+
+    def decode_cursor(self, encoded):
+        try:
+            values = json.loads(base64.urlsafe_b64decode(encoded.encode()))
+        except (TypeError, ValueError):
+            raise NotFound(self.invalid_cursor_message)
+        if not isinstance(values, list) or len(values) != len(self.ordering):
+            raise NotFound(self.invalid_cursor_message)
+
+        decoded = []
+        for field, value in zip(self.ordering, values):
+            if field.lstrip("-").endswith("_at"):
+                value = parse_datetime(value) if isinstance(value, str) else None
+            elif not isinstance(value, int):
+                value = None
+            if value is None:
+                raise NotFound(self.invalid_cursor_message)
+            decoded.append(value)
+        return decoded
+
+    def get_next_link(self):
+        if not self.cursor_mode:
+            return super().get_next_link()
+        if not self.has_next:
+            return None
+        url = self.request.build_absolute_uri()
+        url = replace_query_param(url, self.mode_query_param, "cursor")
+        return replace_query_param(url, self.cursor_query_param, self.encode_cursor(self.page[-1]))
+
+    def get_paginated_response(self, data):
+        if not self.cursor_mode:
+            return Response({
+                "count": self.page.paginator.count,
+                "count_exact": self.page.paginator.count_is_exact,
+                "next": self.get_next_link(),
+                "previous": self.get_previous_link(),
+                "results": data,
+            })
+        return Response({"next": self.get_next_link(), "results": data})
@@ -0,0 +1,171 @@
+"""Per-customer spend rollup maintenance.
+
+The summary endpoint reads `CustomerSpendRollup` instead of aggregating `orders_order`.
+Single-order writes adjust a customer's row by delta (one UPDATE, or nothing when the
+order's contribution didn't change). The delta is taken against the state the order's
+UPDATE matched in the row (a compare-and-set, see `Order._do_update`), so two stale copies
+of one order can't both apply the same change. Bulk paths and the rebuild command recompute rows
+from the orders table with one aggregate per batch of customers.
+"""
+
+from django.db.models import Count, F, Sum
+
+from .models import Customer, CustomerSpendRollup, Order
+
+REFRESH_BATCH_SIZE = 500
+
+
+def _is_complete(state) -> bool:
+    return state is not None and all(name in state for name in Order.TRACKED_FIELDS)
+
+
+def order_contribution(state) -> tuple[int, int]:
+    """(order_count, total_cents) an order adds to its customer's rollup."""
+    if state and state["status"] == Order.Status.PAID and not state["is_archived"]:
+        return 1, int(state["total_cents"] or 0)
+    return 0, 0
+
+
+def _chunks(ids, size):
+    ids = sorted(set(ids))
+    for start in range(0, len(ids), size):
+        yield ids[start:start + size]
+
+
+def paid_order_totals(customer_ids):
+    """Aggregate of paid, non-archived orders per customer (source of truth for the rollup)."""
+    return (
+        Order.objects.filter(
+            customer_id__in=customer_ids,
+            status=Order.Status.PAID,
+            is_archived=False,
+        )
+        .values("customer_id")
+        .annotate(order_count=Count("id"), total_cents=Sum("total_cents"))
+        .order_by()
+    )
+
+
+def top_customers(limit):
+    """Top-N active customers by rollup total; served from rollup_total_desc_idx."""
+    return (
+        CustomerSpendRollup.objects.filter(customer__is_active=True)
+        .order_by("-total_cents", "-customer_id")[:limit]
+        .values("customer_id", "customer__email", "order_count", "total_cents")
+    )
+
+
+def _aggregate_paid_orders(customer_ids) -> dict:
+    rows = paid_order_totals(customer_ids)
+    return {row["customer_id"]: (row["order_count"], row["total_cents"] or 0) for row in rows}
+
+
+def refresh_customer_rollups(customer_ids, create_missing=True, batch_size=REFRESH_BATCH_SIZE) -> int:
+    """Recompute rollup rows for the given customers from the orders table.
+
+    With `create_missing=False` only existing rows are updated; that is what delete
+    paths use so a cascading customer delete can't resurrect its rollup row.
+    """
+    refreshed = 0
+    for chunk in _chunks(customer_ids, batch_size):
+        totals = _aggregate_paid_orders(chunk)
+        if create_missing:
+            # Customers may have been deleted concurrently; only upsert rows that can exist.
+            existing = Customer.objects.filter(id__in=chunk).values_list("id", flat=True)
+            rows = [
+                CustomerSpendRollup(
+                    customer_id=customer_id,
+                    order_count=totals.get(customer_id, (0, 0))[0],
+                    total_cents=totals.get(customer_id, (0, 0))[1],
+                )
+                for customer_id in existing
+            ]
+            CustomerSpendRollup.objects.bulk_create(
+                rows,
+                update_conflicts=True,
+                unique_fields=["customer"],
+                update_fields=["order_count", "total_cents"],
+            )
+            refreshed += len(rows)
+        else:
+            for customer_id in chunk:
+                order_count, total_cents = totals.get(customer_id, (0, 0))
+                refreshed += CustomerSpendRollup.objects.filter(customer_id=customer_id).update(
+                    order_count=order_count, total_cents=total_cents
+                )
+    return refreshed
+
+
+def _adjust(customer_id, count_delta, total_delta, create_missing=True) -> bool:
+    if not count_delta and not total_delta:
+        return False
+    updated = CustomerSpendRollup.objects.filter(customer_id=customer_id).update(
+        order_count=F("order_count") + count_delta,
+        total_cents=F("total_cents") + total_delta,
+    )
+    if not updated and create_missing:
+        # Row is missing (e.g. customer inserted with bulk_create): build it from scratch.
+        refresh_customer_rollups([customer_id])
+    return True
+
+
+def apply_order_saved(order: Order, created: bool) -> bool:
+    """Apply an order write to the rollup. Returns False when no rollup value changed."""
+    previous = None if created else order.previous_state()
+    current = order.saved_state()
+    if not _is_complete(current) or (not created and not _is_complete(previous)):
+        # No trustworthy baseline (deferred fields / instance not loaded from the DB).
+        customer_ids = {order.customer_id}
+        if previous and "customer_id" in previous:
+            customer_ids.add(previous["customer_id"])
+        refresh_customer_rollups(customer_ids)
+        return True
+
+    old_count, old_total = order_contribution(previous)
+    new_count, new_total = order_contribution(current)
+    if previous and previous["customer_id"] != current["customer_id"]:
+        moved_out = _adjust(previous["customer_id"], -old_count, -old_total)
+        moved_in = _adjust(current["customer_id"], new_count, new_total)
+        return moved_out or moved_in
+    return _adjust(current["customer_id"], new_count - old_count, new_total - old_total)
+
+
+def apply_order_deleted(order: Order) -> bool:
+    state = order.previous_state()
+    if not _is_complete(state):
+        refresh_customer_rollups([order.customer_id], create_missing=False)
+        return True
+    count, total = order_contribution(state)
+    return _adjust(state["customer_id"], -count, -total, create_missing=False)
+
+
+def rebuild_customer_rollups(batch_size=REFRESH_BATCH_SIZE) -> int:
+    """Recompute every customer's rollup row. Returns the number of rows written."""
+    customer_ids = Customer.objects.order_by("id").values_list("id", flat=True)
+    return refresh_customer_rollups(list(customer_ids), batch_size=batch_size)
+
+
+def find_rollup_drift(batch_size=REFRESH_BATCH_SIZE) -> list[dict]:
+    """Rows whose stored values differ from what the orders table says (None = row missing)."""
+    drift = []
+    customer_ids = list(Customer.objects.order_by("id").values_list("id", flat=True))
+    for chunk in _chunks(customer_ids, batch_size):
+        expected = _aggregate_paid_orders(chunk)
+        stored = {
+            row[0]: (row[1], row[2])
+            for row in CustomerSpendRollup.objects.filter(customer_id__in=chunk).values_list(
+                "customer_id", "order_count", "total_cents"
+            )
+        }
+        for customer_id in chunk:
+            want = expected.get(customer_id, (0, 0))
+            have = stored.get(customer_id)
+            if have != want:
+                drift.append({
+                    "customer_id": customer_id,
+                    "expected_order_count": want[0],
+                    "expected_total_cents": want[1],
+                    "order_count": have[0] if have else None,
+                    "total_cents": have[1] if have else None,
+                })
+    return drift
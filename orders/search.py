@@ -0,0 +1,168 @@
+"""Customer email/name search without `LIKE '%x%'` scans.
+
+Two access paths:
+
+* `Customer.email_lower` is a stored, indexed lowercase copy of the email. Prefix search
+  is a range scan on it (`email_lower >= 'ali' AND email_lower < 'alj'`), which uses a plain
+  B-tree index on any database. `Customer.save` sets it; on SQLite, triggers also fill it in
+  for writes that bypass `save` (`bulk_create`, `.update(email=...)`, raw SQL). Elsewhere
+  those writers must set it themselves.
+* On SQLite with FTS5, `orders_customer_search` is a trigram index over email and name,
+  kept in sync with `orders_customer` by triggers (so `bulk_create` and raw SQL writes are
+  covered too). Substring lookups of 3+ characters are answered from it.
+
+Anything else (short terms, other databases, `CUSTOMER_SEARCH_FTS = False`) falls back to
+`icontains`. Django's SQLite backend rebuilds a table when some columns of it are altered,
+which drops its triggers (both kinds): run `python manage.py rebuild_customer_search` after
+such a migration on `Customer`.
+"""
+
+from django.conf import settings
+from django.db import DatabaseError, connections, transaction
+from django.db.models import Q
+from django.db.models.expressions import RawSQL
+
+FTS_TABLE = "orders_customer_search"
+FTS_MIN_TERM_LENGTH = 3  # the trigram tokenizer can't match anything shorter
+
+FTS_SQL = [
+    f"""CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5(
+        email, name, content='orders_customer', content_rowid='id', tokenize='trigram'
+    )""",
+    f"""CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ai AFTER INSERT ON orders_customer BEGIN
+        INSERT INTO {FTS_TABLE}(rowid, email, name) VALUES (new.id, new.email, new.name);
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ad AFTER DELETE ON orders_customer BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, email, name) VALUES ('delete', old.id, old.email, old.name);
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_au AFTER UPDATE OF email, name ON orders_customer BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, email, name) VALUES ('delete', old.id, old.email, old.name);
+        INSERT INTO {FTS_TABLE}(rowid, email, name) VALUES (new.id, new.email, new.name);
+    END""",
+    f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')",
+]
+
+DROP_FTS_SQL = [
+    f"DROP TRIGGER IF EXISTS {FTS_TABLE}_ai",
+    f"DROP TRIGGER IF EXISTS {FTS_TABLE}_ad",
+    f"DROP TRIGGER IF EXISTS {FTS_TABLE}_au",
+    f"DROP TABLE IF EXISTS {FTS_TABLE}",
+]
+
+# Only when the writer left email_lower alone, so the value `Customer.save` computed (with
+# Python's Unicode-aware lower()) wins over SQLite's ASCII-only lower().
+EMAIL_LOWER_SQL = [
+    """CREATE TRIGGER IF NOT EXISTS orders_customer_email_lower_ai AFTER INSERT ON orders_customer
+    WHEN new.email_lower = '' BEGIN
+        UPDATE orders_customer SET email_lower = lower(trim(new.email)) WHERE id = new.id;
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS orders_customer_email_lower_au AFTER UPDATE OF email ON orders_customer
+    WHEN new.email IS NOT old.email AND new.email_lower IS old.email_lower BEGIN
+        UPDATE orders_customer SET email_lower = lower(trim(new.email)) WHERE id = new.id;
+    END""",
+]
+
+DROP_EMAIL_LOWER_SQL = [
+    "DROP TRIGGER IF EXISTS orders_customer_email_lower_ai",
+    "DROP TRIGGER IF EXISTS orders_customer_email_lower_au",
+]
+
+# (alias, database name) -> bool; checked once per database instead of once per query.
+_fts_available = {}
+
+
+def install_email_lower_triggers(connection) -> bool:
+    """(Re)create the triggers that keep `email_lower` in sync. False if not SQLite."""
+    if connection.vendor != "sqlite":
+        return False
+    with transaction.atomic(using=connection.alias), connection.cursor() as cursor:
+        for statement in DROP_EMAIL_LOWER_SQL + EMAIL_LOWER_SQL:
+            cursor.execute(statement)
+    return True
+
+
+def install_fts(connection) -> bool:
+    """Create (or rebuild) the trigram index and its triggers. False if unsupported."""
+    if connection.vendor != "sqlite":
+        return False
+    try:
+        with transaction.atomic(using=connection.alias), connection.cursor() as cursor:
+            for statement in DROP_FTS_SQL + FTS_SQL:
+                cursor.execute(statement)
+    except DatabaseError:
+        # SQLite built without FTS5 or older than 3.34 (no trigram tokenizer).
+        return False
+    _fts_available[(connection.alias, connection.settings_dict["NAME"])] = True
+    return True
+
+
+def uninstall_fts(connection) -> None:
+    if connection.vendor == "sqlite":
+        with connection.cursor() as cursor:
+            for statement in DROP_FTS_SQL:
+                cursor.execute(statement)
+        _fts_available[(connection.alias, connection.settings_dict["NAME"])] = False
+
+
+def fts_enabled(using="default") -> bool:
+    if not getattr(settings, "CUSTOMER_SEARCH_FTS", True):
+        return False
+    connection = connections[using]
+    if connection.vendor != "sqlite":
+        return False
+    key = (using, connection.settings_dict["NAME"])
+    if key not in _fts_available:
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = %s", [FTS_TABLE])
+            _fts_available[key] = cursor.fetchone() is not None
+    return _fts_available[key]
+
+
+def normalize_email(email: str) -> str:
+    return (email or "").strip().lower()
+
+
+def prefix_range(prefix: str):
+    """Bounds such that lo <= value < hi  <=>  value.startswith(prefix)."""
+    return prefix, prefix[:-1] + chr(ord(prefix[-1]) + 1)
+
+
+def email_prefix_q(prefix: str, field="email_lower") -> Q:
+    lo, hi = prefix_range(normalize_email(prefix))
+    return Q(**{f"{field}__gte": lo, f"{field}__lt": hi})
+
+
+def _fts_phrase(term: str, column=None) -> str:
+    phrase = '"' + term.replace('"', '""') + '"'
+    return f"{column}:{phrase}" if column else phrase
+
+
+def matching_customer_ids(term: str, columns=("email",), using="default"):
+    """Subquery of customer ids whose columns contain `term`, or None if FTS can't answer it.
+
+    `using` is the alias the outer query runs on; the index must exist there.
+    """
+    term = term.strip()
+    if len(term) < FTS_MIN_TERM_LENGTH or not fts_enabled(using):
+        return None
+    if len(columns) == 1:
+        match = _fts_phrase(term, columns[0])
+    else:
+        match = "{" + " ".join(columns) + "}: " + _fts_phrase(term)
+    return RawSQL(f"SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s", [match])
+
+
+def filter_by_email(queryset, term: str, customer_field="customer"):
+    """Case-insensitive substring filter on the related customer's email (FTS when possible)."""
+    ids = matching_customer_ids(term, using=queryset.db)
+    if ids is None:
+        return queryset.filter(**{f"{customer_field}__email__icontains": term})
+    return queryset.filter(**{f"{customer_field}__in": ids})
+
+
+def search_customers(queryset, term: str):
+    """Customers whose email or name contains `term` (case-insensitive)."""
+    ids = matching_customer_ids(term, columns=("email", "name"), using=queryset.db)
+    if ids is None:
+        return queryset.filter(Q(email__icontains=term) | Q(name__icontains=term))
+    return queryset.filter(id__in=ids)
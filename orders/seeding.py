@@ -0,0 +1,108 @@
+"""Chunked bulk loader for sample customers, orders and items.
+
+Rows are generated one chunk of customers at a time and written with a handful of large
+`bulk_create` calls per table, so memory is bounded by `chunk_size` rather than by the
+total size of the dataset. Order totals are computed in memory; derived tables are
+refreshed once per chunk through `orders_bulk_changed`.
+"""
+
+import random
+import string
+
+from django.db import transaction
+
+from .events import orders_bulk_changed
+from .models import Customer, CustomerSpendRollup, Order, OrderItem
+
+DEFAULT_CHUNK_SIZE = 500  # customers per chunk
+INSERT_BATCH_SIZE = 2000  # rows per INSERT statement
+
+STATUS_VALUES = [Order.Status.PAID, Order.Status.DRAFT, Order.Status.SHIPPED]
+STATUS_WEIGHTS = [0.55, 0.35, 0.10]
+PRICE_VALUES = [199, 499, 999, 1499, 2499]
+
+
+def _email(i: int) -> str:
+    return f"user{i}@example.com"
+
+
+def _name(rng: random.Random) -> str:
+    return "User " + "".join(rng.choices(string.ascii_uppercase, k=5))
+
+
+def _next_customer_index() -> int:
+    last_id = Customer.objects.order_by("-id").values_list("id", flat=True).first() or 0
+    return int(last_id) + 1
+
+
+def _seed_chunk(indexes, orders_per_customer, items_per_order, rng) -> tuple[int, int, int]:
+    customers = Customer.objects.bulk_create(
+        [Customer(name=_name(rng), email=_email(i), email_lower=_email(i), is_active=True) for i in indexes],
+        batch_size=INSERT_BATCH_SIZE,
+    )
+    # No post_save for bulk-created customers, so start their rollup rows at zero here; the
+    # bulk-change refresh below fills in the ones that get paid orders.
+    CustomerSpendRollup.objects.bulk_create(
+        [CustomerSpendRollup(customer=customer) for customer in customers],
+        batch_size=INSERT_BATCH_SIZE,
+    )
+
+    orders = []
+    item_specs = []
+    for customer in customers:
+        for _ in range(orders_per_customer):
+            specs = [
+                (f"SKU-{rng.randint(1, 200)}", rng.randint(1, 5), rng.choice(PRICE_VALUES))
+                for _ in range(items_per_order)
+            ]
+            orders.append(Order(
+                customer=customer,
+                status=rng.choices(STATUS_VALUES, weights=STATUS_WEIGHTS)[0],
+                total_cents=sum(qty * price for _, qty, price in specs),
+            ))
+            item_specs.append(specs)
+    Order.objects.bulk_create(orders, batch_size=INSERT_BATCH_SIZE)
+
+    items = [
+        OrderItem(order=order, sku=sku, quantity=qty, unit_price_cents=price)
+        for order, specs in zip(orders, item_specs)
+        for sku, qty, price in specs
+    ]
+    OrderItem.objects.bulk_create(items, batch_size=INSERT_BATCH_SIZE)
+
+    orders_bulk_changed.send(sender=Order, order_ids=[order.id for order in orders], created=True)
+    return len(customers), len(orders), len(items)
+
+
+def seed_orders(
+    customers,
+    orders_per_customer,
+    items_per_order,
+    chunk_size=DEFAULT_CHUNK_SIZE,
+    seed=None,
+    progress=None,
+) -> dict:
+    """Insert `customers` new customers with their orders and items.
+
+    Each chunk commits in its own transaction (wrap the call in `transaction.atomic()`
+    for all-or-nothing). `seed` makes the generated data reproducible; `progress`, if
+    given, is called with the running totals after every chunk.
+    """
+    if chunk_size < 1:
+        raise ValueError("chunk_size must be positive")
+
+    rng = random.Random(seed)
+    start = _next_customer_index()
+    created = {"customers": 0, "orders": 0, "items": 0}
+
+    for chunk_start in range(start, start + customers, chunk_size):
+        indexes = range(chunk_start, min(chunk_start + chunk_size, start + customers))
+        with transaction.atomic():
+            n_customers, n_orders, n_items = _seed_chunk(indexes, orders_per_customer, items_per_order, rng)
+        created["customers"] += n_customers
+        created["orders"] += n_orders
+        created["items"] += n_items
+        if progress:
+            progress(created)
+
+    return created
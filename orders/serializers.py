@@ -1,5 +1,9 @@
+import datetime
+
+from django.utils import timezone
 from rest_framework import serializers
 from .models import Customer, Order, OrderItem
+from .stats import GRANULARITIES
 
 class CustomerSerializer(serializers.ModelSerializer):
     class Meta:
@@ -32,3 +36,75 @@ class OrderSerializer(serializers.ModelSerializer):
     def get_customer_email(self, obj: Order) -> str:
         # This triggers a DB fetch unless select_related("customer") is used.
         return obj.customer.email
+
+class BulkTransitionSerializer(serializers.Serializer):
+    MAX_IDS = 10000
+    # The list view's filters; anything else (a typo) would silently match every order.
+    FILTER_KEYS = ("status", "email")
+
+    ids = serializers.ListField(child=serializers.IntegerField(), required=False, max_length=MAX_IDS)
+    filter = serializers.DictField(child=serializers.CharField(allow_blank=True), required=False)
+    target = serializers.ChoiceField(choices=["cancelled", "archived", "paid"])
+
+    def validate_filter(self, value):
+        unknown = sorted(set(value) - set(self.FILTER_KEYS))
+        if unknown:
+            raise serializers.ValidationError(
+                f"Unknown key(s): {', '.join(unknown)}. Allowed: {', '.join(self.FILTER_KEYS)}."
+            )
+        if not any(criterion.strip() for criterion in value.values()):
+            raise serializers.ValidationError("At least one non-blank criterion is required.")
+        return value
+
+    def validate(self, attrs):
+        if ("ids" in attrs) == ("filter" in attrs):
+            raise serializers.ValidationError("Provide exactly one of `ids` or `filter`.")
+        return attrs
+
+class IngestItemSerializer(serializers.Serializer):
+    sku = serializers.CharField(max_length=64)
+    quantity = serializers.IntegerField(min_value=1, max_value=2**31 - 1, default=1)
+    unit_price_cents = serializers.IntegerField(min_value=0, max_value=2**31 - 1, default=0)
+
+class IngestOrderSerializer(serializers.Serializer):
+    """One NDJSON line of `POST /api/orders/ingest/`. Customers are checked per batch."""
+
+    MAX_ITEMS = 1000
+    # Range of the `total_cents` column the line total is stored in.
+    MAX_TOTAL_CENTS = 2**31 - 1
+
+    customer = serializers.IntegerField(min_value=1)
+    status = serializers.ChoiceField(choices=Order.Status.choices, default=Order.Status.DRAFT)
+    items = IngestItemSerializer(many=True, max_length=MAX_ITEMS, default=list)
+
+    def validate(self, attrs):
+        total = sum(item["quantity"] * item["unit_price_cents"] for item in attrs["items"])
+        if total > self.MAX_TOTAL_CENTS:
+            raise serializers.ValidationError(
+                {"items": [f"Order total {total} exceeds the maximum of {self.MAX_TOTAL_CENTS} cents."]}
+            )
+        return attrs
+
+class OrderStatsQuerySerializer(serializers.Serializer):
+    DEFAULT_DAYS = 30
+    MAX_DAYS = 3660
+
+    granularity = serializers.ChoiceField(choices=GRANULARITIES, default="day")
+    status = serializers.ChoiceField(choices=Order.Status.choices, required=False)
+
+    def get_fields(self):
+        fields = super().get_fields()
+        # `from` is a keyword, so the range fields can't be declared as class attributes.
+        fields["from"] = serializers.DateField(required=False)
+        fields["to"] = serializers.DateField(required=False)
+        return fields
+
+    def validate(self, attrs):
+        last = attrs.get("to") or timezone.localdate()
+        first = attrs.get("from") or last - datetime.timedelta(days=self.DEFAULT_DAYS - 1)
+        if first > last:
+            raise serializers.ValidationError({"from": "Must not be after `to`."})
+        if (last - first).days >= self.MAX_DAYS:
+            raise serializers.ValidationError({"from": f"Range is limited to {self.MAX_DAYS} days."})
+        attrs["from"], attrs["to"] = first, last
+        return attrs
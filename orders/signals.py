@@ -9,10 +9,12 @@ Scenario:
 Your job as candidate is to find the root cause and fix it safely with tests.
 """
 
-from django.db.models.signals import post_save
+from django.db.models.signals import post_delete, post_save, pre_delete
 from django.dispatch import receiver
 
-from .models import Order
+from . import outbox, rollups, sku_sales, stats, summary_cache, totals
+from .events import orders_bulk_changed
+from .models import ArchivedOrder, ArchivedOrderItem, Customer, CustomerSpendRollup, Order, OrderItem
 
 @receiver(post_save, sender=Order)
 def on_order_saved(sender, instance: Order, created, **kwargs):
@@ -21,3 +23,115 @@ def on_order_saved(sender, instance: Order, created, **kwargs):
     # But this signal currently does, causing unrelated regressions.
     if instance.status == Order.Status.CANCELLED:
         return
+
+@receiver(post_save, sender=Order)
+def record_status_change_event(sender, instance: Order, created, raw=False, update_fields=None, **kwargs):
+    # Only the INSERT happens here, inside Order.save's transaction; handlers run in drain_outbox.
+    if created or raw:
+        return
+    changes = instance.outbox_changes(update_fields)
+    if changes:
+        outbox.record_order_change(instance, changes)
+
+@receiver(post_save, sender=Order)
+def update_spend_rollup_on_order_save(sender, instance: Order, created, raw=False, **kwargs):
+    if raw:
+        return
+    if rollups.apply_order_saved(instance, created):
+        summary_cache.invalidate()
+
+@receiver(post_delete, sender=Order)
+def update_spend_rollup_on_order_delete(sender, instance: Order, **kwargs):
+    if rollups.apply_order_deleted(instance):
+        summary_cache.invalidate()
+
+@receiver(post_save, sender=Order)
+def update_daily_stats_on_order_save(sender, instance: Order, created, raw=False, **kwargs):
+    if not raw:
+        stats.apply_order_saved(instance, created)
+
+@receiver(post_delete, sender=Order)
+def update_daily_stats_on_order_delete(sender, instance: Order, **kwargs):
+    stats.apply_order_deleted(instance)
+
+@receiver(post_save, sender=Order)
+def update_sku_sales_on_order_save(sender, instance: Order, created, raw=False, **kwargs):
+    if not raw:
+        sku_sales.apply_order_saved(instance, created)
+
+@receiver(pre_delete, sender=Order)
+def update_sku_sales_on_order_delete(sender, instance: Order, **kwargs):
+    # Before the cascade removes the items, which are needed to know what to subtract.
+    sku_sales.apply_order_deleting(instance)
+
+@receiver(post_save, sender=Customer)
+def create_spend_rollup(sender, instance: Customer, created, raw=False, **kwargs):
+    # Every customer gets a row so the summary can list active customers with no paid orders.
+    if created and not raw:
+        CustomerSpendRollup.objects.create(customer=instance)
+
+@receiver(post_save, sender=Customer)
+def invalidate_summary_on_customer_save(sender, instance: Customer, created, update_fields=None, **kwargs):
+    # The summary shows email and filters on is_active; other customer fields don't matter.
+    if created or update_fields is None or {"email", "is_active"} & set(update_fields):
+        summary_cache.invalidate()
+
+@receiver(post_delete, sender=Customer)
+def invalidate_summary_on_customer_delete(sender, instance: Customer, **kwargs):
+    summary_cache.invalidate()
+
+@receiver(orders_bulk_changed, sender=Order)
+def refresh_spend_rollup_on_bulk_change(sender, order_ids, **kwargs):
+    order_ids = list(order_ids)
+    customer_ids = set()
+    for start in range(0, len(order_ids), rollups.REFRESH_BATCH_SIZE):
+        chunk = order_ids[start:start + rollups.REFRESH_BATCH_SIZE]
+        customer_ids.update(Order.objects.filter(id__in=chunk).values_list("customer_id", flat=True))
+    rollups.refresh_customer_rollups(customer_ids)
+    summary_cache.invalidate()
+
+@receiver(orders_bulk_changed, sender=Order)
+def refresh_daily_stats_on_bulk_change(sender, order_ids, created=False, **kwargs):
+    stats.apply_bulk_change(order_ids, created=created)
+
+@receiver(orders_bulk_changed, sender=Order)
+def refresh_sku_sales_on_bulk_change(sender, order_ids, created=False, fields=None, **kwargs):
+    sku_sales.apply_bulk_change(order_ids, created=created, fields=fields)
+
+@receiver(post_save, sender=OrderItem)
+def update_sku_sales_on_item_save(sender, instance: OrderItem, created, raw=False, **kwargs):
+    if not raw:
+        sku_sales.apply_item_saved(instance, created)
+
+@receiver(post_delete, sender=OrderItem)
+def update_sku_sales_on_item_delete(sender, instance: OrderItem, origin=None, **kwargs):
+    # Items of a deleted order were already subtracted by update_sku_sales_on_order_delete.
+    origin_model = getattr(origin, "model", type(origin))
+    if origin_model not in (Order, Customer):
+        sku_sales.apply_item_deleted(instance, origin)
+
+@receiver(post_save, sender=OrderItem)
+def update_order_total_on_item_save(sender, instance: OrderItem, created, raw=False, **kwargs):
+    if raw:
+        return
+    previous_order_id = (instance.previous_state() or {}).get("order_id")
+    if previous_order_id is not None and previous_order_id != instance.order_id:
+        totals.recompute_order_totals([previous_order_id])
+    totals.refresh_order_total(instance.order)
+
+@receiver(post_delete, sender=OrderItem)
+def update_order_total_on_item_delete(sender, instance: OrderItem, origin=None, **kwargs):
+    # Items removed because their order (or its customer) is being deleted need no total.
+    origin_model = getattr(origin, "model", type(origin))
+    if origin_model in (Order, Customer):
+        return
+    totals.recompute_order_totals([instance.order_id])
+
+@receiver(post_delete, sender=ArchivedOrder)
+def refresh_daily_stats_on_archived_order_delete(sender, instance: ArchivedOrder, **kwargs):
+    # Archived orders only go away with their customer; recount the day without them.
+    stats.refresh_days([stats.order_day(instance.created_at)])
+
+@receiver(post_delete, sender=ArchivedOrderItem)
+def refresh_sku_sales_on_archived_item_delete(sender, instance: ArchivedOrderItem, **kwargs):
+    sku_sales.refresh_skus([instance.sku])
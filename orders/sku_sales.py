@@ -0,0 +1,313 @@
+"""Per-SKU sales rollup behind `/api/items/top-skus/`.
+
+`SkuSalesRollup` holds units, revenue and the number of distinct orders per SKU over paid
+orders. It is adjusted by delta:
+
+* item writes on a paid order move the item's units/revenue between SKUs; an item counts
+  towards `order_count` when it is the only item of its SKU in its order (a queryset
+  delete of several such items takes the order out once);
+* an order becoming paid adds its items, grouped by SKU. An order ceasing to be paid, or
+  a paid order about to be deleted, has its items taken out by a single UPDATE whose
+  subqueries sum them per SKU (rows that are missing are left for a rebuild);
+* seeded orders (`orders_bulk_changed` with `created=True`) add their paid items with one
+  grouped query per batch.
+
+Bulk status changes don't carry the previous status, so the SKUs of those orders are
+recomputed from `orders_orderitem` (through `item_sku_order_idx`) and its archive twin,
+which keeps archived paid orders counted. Deltas for several SKUs are applied with a
+single UPDATE.
+"""
+
+import heapq
+import weakref
+
+from django.db.models import Case, Count, F, OuterRef, Subquery, Sum, Value, When
+from django.db.models.functions import Coalesce
+
+from .models import ArchivedOrderItem, Order, OrderItem, SkuSalesRollup
+
+REFRESH_BATCH_SIZE = 500
+
+# (order_id, sku) lines already taken out of `order_count`, per in-progress delete() call.
+_deleted_lines = weakref.WeakKeyDictionary()
+
+
+def _paid_items():
+    return OrderItem.objects.filter(order__status=Order.Status.PAID)
+
+
+def _archived_paid_items():
+    return ArchivedOrderItem.objects.filter(order__status=Order.Status.PAID)
+
+
+def _aggregate(items):
+    return (
+        items.values("sku")
+        .annotate(
+            units=Sum("quantity"),
+            revenue_cents=Sum(F("quantity") * F("unit_price_cents")),
+            order_count=Count("order_id", distinct=True),
+        )
+        .order_by()
+    )
+
+
+def _sku_totals(skus) -> dict:
+    """{sku: (units, revenue_cents, order_count)} over hot and archived paid items."""
+    totals = {}
+    for items in (_paid_items(), _archived_paid_items()):
+        for row in _aggregate(items.filter(sku__in=skus)):
+            _add(totals, row["sku"], row["units"] or 0, row["revenue_cents"] or 0, row["order_count"])
+    return totals
+
+
+def _upsert(rows) -> None:
+    SkuSalesRollup.objects.bulk_create(
+        rows,
+        update_conflicts=True,
+        unique_fields=["sku"],
+        update_fields=["units", "revenue_cents", "order_count"],
+    )
+
+
+def top_skus(limit):
+    """Best-selling SKUs by revenue; served from sku_rollup_revenue_idx."""
+    return (
+        SkuSalesRollup.objects.filter(order_count__gt=0)
+        .order_by("-revenue_cents", "sku")[:limit]
+        .values("sku", "units", "revenue_cents", "order_count")
+    )
+
+
+def refresh_skus(skus, batch_size=REFRESH_BATCH_SIZE) -> int:
+    """Recompute the given SKUs' rows from the items of paid orders."""
+    skus = sorted(set(skus))
+    written = 0
+    for start in range(0, len(skus), batch_size):
+        chunk = skus[start:start + batch_size]
+        rows = [
+            SkuSalesRollup(sku=sku, units=units, revenue_cents=revenue_cents, order_count=order_count)
+            for sku, (units, revenue_cents, order_count) in _sku_totals(chunk).items()
+        ]
+        _upsert(rows)
+        SkuSalesRollup.objects.filter(sku__in=set(chunk) - {row.sku for row in rows}).delete()
+        written += len(rows)
+    return written
+
+
+def _update(deltas) -> int:
+    """One UPDATE adding each SKU's deltas to its row. Returns the number of rows updated."""
+    def delta(index):
+        return Case(*[When(sku=sku, then=Value(values[index])) for sku, values in deltas.items()], default=Value(0))
+
+    return SkuSalesRollup.objects.filter(sku__in=list(deltas)).update(
+        units=F("units") + delta(0),
+        revenue_cents=F("revenue_cents") + delta(1),
+        order_count=F("order_count") + delta(2),
+    )
+
+
+def _apply(deltas) -> bool:
+    """Add {sku: (units, revenue_cents, order_count)} deltas. False if all are zero."""
+    deltas = {sku: values for sku, values in deltas.items() if any(values)}
+    if not deltas:
+        return False
+    if _update(deltas) < len(deltas):
+        # First sales of some SKUs: add empty rows for them (ignoring rows a concurrent
+        # writer just created) and apply their deltas.
+        existing = set(SkuSalesRollup.objects.filter(sku__in=list(deltas)).values_list("sku", flat=True))
+        missing = {sku: values for sku, values in deltas.items() if sku not in existing}
+        SkuSalesRollup.objects.bulk_create([SkuSalesRollup(sku=sku) for sku in missing], ignore_conflicts=True)
+        _update(missing)
+    return True
+
+
+def _add(deltas, sku, units, revenue_cents, order_count) -> None:
+    old = deltas.get(sku, (0, 0, 0))
+    deltas[sku] = (old[0] + units, old[1] + revenue_cents, old[2] + order_count)
+
+
+def _is_paid(order_id) -> bool:
+    return Order.objects.filter(id=order_id, status=Order.Status.PAID).exists()
+
+
+def _only_item_of_sku(item_pk, order_id, sku) -> int:
+    """1 if no other item of `order_id` has `sku` (so this one carries the order count)."""
+    return int(not OrderItem.objects.filter(order_id=order_id, sku=sku).exclude(pk=item_pk).exists())
+
+
+def _is_complete(state) -> bool:
+    return state is not None and all(name in state for name in OrderItem.TRACKED_FIELDS)
+
+
+def apply_item_saved(item: OrderItem, created: bool) -> bool:
+    previous = None if created else item.previous_state()
+    current = item.tracked_state()
+    if not _is_complete(current) or (not created and not _is_complete(previous)):
+        skus = {item.sku}
+        if previous and "sku" in previous:
+            skus.add(previous["sku"])
+        refresh_skus(skus)
+        return True
+    if previous == current:
+        return False
+
+    deltas = {}
+    same_line = previous and (previous["order_id"], previous["sku"]) == (current["order_id"], current["sku"])
+    if same_line:
+        if not _is_paid(current["order_id"]):
+            return False
+        _add(deltas, current["sku"],
+             current["quantity"] - previous["quantity"],
+             current["quantity"] * current["unit_price_cents"] - previous["quantity"] * previous["unit_price_cents"],
+             0)
+        return _apply(deltas)
+
+    if previous and _is_paid(previous["order_id"]):
+        _add(deltas, previous["sku"], -previous["quantity"], -previous["quantity"] * previous["unit_price_cents"],
+             -_only_item_of_sku(item.pk, previous["order_id"], previous["sku"]))
+    if _is_paid(current["order_id"]):
+        _add(deltas, current["sku"], current["quantity"], current["quantity"] * current["unit_price_cents"],
+             _only_item_of_sku(item.pk, current["order_id"], current["sku"]))
+    return _apply(deltas)
+
+
+def _first_of_line_in_delete(origin, order_id, sku) -> bool:
+    """True the first time `delete()` call `origin` reports an item of (order, sku).
+
+    A queryset delete removes all its rows before any post_delete fires, so every item of a
+    line then looks like the only one left; only the first may take the order count down.
+    """
+    seen = _deleted_lines.setdefault(origin, set())
+    if (order_id, sku) in seen:
+        return False
+    seen.add((order_id, sku))
+    return True
+
+
+def apply_item_deleted(item: OrderItem, origin=None) -> bool:
+    state = item.previous_state()
+    if not _is_complete(state):
+        refresh_skus([item.sku])
+        return True
+    if not _is_paid(state["order_id"]):
+        return False
+    order_count = _only_item_of_sku(item.pk, state["order_id"], state["sku"])
+    if order_count and origin is not None and origin is not item:
+        order_count = int(_first_of_line_in_delete(origin, state["order_id"], state["sku"]))
+    return _apply({state["sku"]: (
+        -state["quantity"],
+        -state["quantity"] * state["unit_price_cents"],
+        -order_count,
+    )})
+
+
+def _order_deltas(order_ids) -> dict:
+    return {
+        row["sku"]: (row["units"] or 0, row["revenue_cents"] or 0, row["order_count"])
+        for row in _aggregate(OrderItem.objects.filter(order_id__in=order_ids))
+    }
+
+
+def _remove_orders(order_ids) -> bool:
+    """Take the orders' items out of their SKUs' rows with one UPDATE (correlated subqueries)."""
+    items = OrderItem.objects.filter(order_id__in=order_ids)
+    line = items.filter(sku=OuterRef("sku")).order_by().values("sku")
+
+    def total(aggregate):
+        return Coalesce(Subquery(line.annotate(total=aggregate).values("total")), 0)
+
+    return bool(SkuSalesRollup.objects.filter(sku__in=items.values("sku")).update(
+        units=F("units") - total(Sum("quantity")),
+        revenue_cents=F("revenue_cents") - total(Sum(F("quantity") * F("unit_price_cents"))),
+        order_count=F("order_count") - total(Count("order_id", distinct=True)),
+    ))
+
+
+def apply_order_saved(order: Order, created: bool) -> bool:
+    if created:
+        return False  # no items yet
+    previous = order.previous_state()
+    current = order.saved_state()
+    if previous is None or "status" not in previous or "status" not in current:
+        return bool(refresh_skus(OrderItem.objects.filter(order_id=order.pk).values_list("sku", flat=True)))
+    was_paid = previous["status"] == Order.Status.PAID
+    is_paid = current["status"] == Order.Status.PAID
+    if was_paid == is_paid:
+        return False
+    if not is_paid:
+        return _remove_orders([order.pk])
+    return _apply(_order_deltas([order.pk]))
+
+
+def apply_order_deleting(order: Order) -> bool:
+    """Called before the order (and, by cascade, its items) is deleted."""
+    status = (order.previous_state() or {}).get("status")
+    if status is None:
+        status = Order.objects.filter(pk=order.pk).values_list("status", flat=True).first()
+    if status != Order.Status.PAID:
+        return False
+    return _remove_orders([order.pk])
+
+
+def apply_bulk_change(order_ids, created=False, fields=None, batch_size=REFRESH_BATCH_SIZE) -> None:
+    """Receiver side of `orders_bulk_changed`; only paid-ness matters here."""
+    if fields is not None and "status" not in fields:
+        return
+    order_ids = list(order_ids)
+    for start in range(0, len(order_ids), batch_size):
+        chunk = order_ids[start:start + batch_size]
+        if created:
+            items = OrderItem.objects.filter(order_id__in=chunk, order__status=Order.Status.PAID)
+            _apply({row["sku"]: (row["units"] or 0, row["revenue_cents"] or 0, row["order_count"])
+                    for row in _aggregate(items)})
+        else:
+            refresh_skus(OrderItem.objects.filter(order_id__in=chunk).values_list("sku", flat=True).distinct())
+
+
+def rebuild_sku_rollup(chunk_size=2000, batch_size=REFRESH_BATCH_SIZE, progress=None) -> int:
+    """Recompute every row by streaming paid items (hot and archived) in (sku, order) order.
+
+    Memory is bounded by `chunk_size` fetched rows per table plus `batch_size` pending rollup rows.
+    """
+    items = heapq.merge(*[
+        paid.order_by("sku", "order_id")
+        .values_list("sku", "order_id", "quantity", "unit_price_cents")
+        .iterator(chunk_size=chunk_size)
+        for paid in (_paid_items(), _archived_paid_items())
+    ])
+    pending = []
+    current = None
+    last_order_id = None
+    written = 0
+
+    def flush():
+        nonlocal written
+        _upsert(pending)
+        written += len(pending)
+        if progress:
+            progress(written)
+        pending.clear()
+
+    for sku, order_id, quantity, unit_price_cents in items:
+        if current is None or current.sku != sku:
+            if current is not None:
+                pending.append(current)
+                if len(pending) >= batch_size:
+                    flush()
+            current = SkuSalesRollup(sku=sku)
+            last_order_id = None
+        current.units += quantity
+        current.revenue_cents += quantity * unit_price_cents
+        if order_id != last_order_id:
+            current.order_count += 1
+            last_order_id = order_id
+    if current is not None:
+        pending.append(current)
+    flush()
+
+    # SKUs with no paid sales left.
+    SkuSalesRollup.objects.exclude(sku__in=_paid_items().values("sku")).exclude(
+        sku__in=_archived_paid_items().values("sku")
+    ).delete()
+    return written
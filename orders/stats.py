@@ -0,0 +1,232 @@
+"""Daily order/revenue aggregates behind `/api/orders/stats/`.
+
+`DailyOrderStats` holds one row per (day, status) that has orders, filled in by the
+migration that creates it. Single-order writes move an order's contribution between rows
+by delta, with one UPDATE for all the statuses involved. The delta is taken against the
+state the order's UPDATE matched in the row (see `Order._do_update`); when that state is
+unknown the day is recomputed instead. Inserts announced through `orders_bulk_changed`
+with `created=True` add theirs from one grouped query; other bulk changes (unknown
+previous state) recompute the affected days from the orders table, as does the backfill
+command. Recomputes read `ArchivedOrder` too, so orders moved to the archive keep being
+counted. Any range is served by summing at most one row per day and status.
+"""
+
+import datetime
+
+from django.db import transaction
+from django.db.models import Case, Count, F, Max, Min, Q, Sum, Value, When
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+from .models import ArchivedOrder, DailyOrderStats, Order
+
+REFRESH_BATCH_SIZE = 500
+BACKFILL_BATCH_DAYS = 31
+
+GRANULARITIES = ("day", "week", "month")
+
+
+def order_day(created_at) -> datetime.date:
+    return timezone.localtime(created_at).date()
+
+
+def _day_start(day):
+    return timezone.make_aware(datetime.datetime.combine(day, datetime.time.min))
+
+
+def _day_ranges(days):
+    """Merge days into [first, last] runs of consecutive dates."""
+    runs = []
+    for day in sorted(set(days)):
+        if runs and day == runs[-1][1] + datetime.timedelta(days=1):
+            runs[-1][1] = day
+        else:
+            runs.append([day, day])
+    return runs
+
+
+def _days_q(days) -> Q:
+    q = Q()
+    for first, last in _day_ranges(days):
+        q |= Q(created_at__gte=_day_start(first), created_at__lt=_day_start(last + datetime.timedelta(days=1)))
+    return q
+
+
+def _aggregate(queryset):
+    return (
+        queryset.annotate(day=TruncDate("created_at"))
+        .values("day", "status")
+        .annotate(order_count=Count("id"), total_cents=Sum("total_cents"))
+        .order_by()
+    )
+
+
+def _day_totals(days) -> dict:
+    """{(day, status): (order_count, total_cents)} over hot and archived orders."""
+    totals = {}
+    for model in (Order, ArchivedOrder):
+        for row in _aggregate(model.objects.filter(_days_q(days))):
+            count, total = totals.get((row["day"], row["status"]), (0, 0))
+            totals[row["day"], row["status"]] = (count + row["order_count"], total + (row["total_cents"] or 0))
+    return totals
+
+
+def refresh_days(days, batch_size=REFRESH_BATCH_SIZE) -> int:
+    """Recompute every status row of the given days from the orders and archive tables."""
+    days = sorted(set(days))
+    written = 0
+    for start in range(0, len(days), batch_size):
+        chunk = days[start:start + batch_size]
+        rows = [
+            DailyOrderStats(day=day, status=status, order_count=order_count, total_cents=total_cents)
+            for (day, status), (order_count, total_cents) in _day_totals(chunk).items()
+        ]
+        with transaction.atomic():
+            DailyOrderStats.objects.filter(day__in=chunk).delete()
+            DailyOrderStats.objects.bulk_create(rows)
+        written += len(rows)
+    return written
+
+
+def _apply_deltas(day, deltas) -> bool:
+    """Add {status: (count_delta, total_delta)} to `day`'s rows. False if all deltas are zero.
+
+    Two statements whatever the number of statuses: rows an order moves into are inserted
+    empty if missing (first order of that day and status; rows that exist or a concurrent
+    writer adds are ignored), then one UPDATE applies every delta.
+    """
+    deltas = {status: values for status, values in deltas.items() if any(values)}
+    if not deltas:
+        return False
+    gaining = [status for status, (count_delta, _) in deltas.items() if count_delta > 0]
+    if gaining:
+        DailyOrderStats.objects.bulk_create(
+            [DailyOrderStats(day=day, status=status) for status in gaining], ignore_conflicts=True
+        )
+
+    def delta(index):
+        return Case(*[When(status=status, then=Value(values[index])) for status, values in deltas.items()],
+                    default=Value(0))
+
+    updated = DailyOrderStats.objects.filter(day=day, status__in=list(deltas)).update(
+        order_count=F("order_count") + delta(0), total_cents=F("total_cents") + delta(1)
+    )
+    if updated < len(deltas):
+        # Changing a row that doesn't exist: the table has drifted.
+        refresh_days([day])
+    return True
+
+
+def _has_baseline(state) -> bool:
+    return state is not None and "status" in state and "total_cents" in state
+
+
+def apply_order_saved(order: Order, created: bool) -> bool:
+    """Move the order's contribution to its current (day, status). False if nothing changed."""
+    previous = None if created else order.previous_state()
+    current = order.saved_state()
+    day = order_day(order.created_at)
+    if not _has_baseline(current) or (not created and not _has_baseline(previous)):
+        refresh_days([day])
+        return True
+
+    new_total = int(current["total_cents"] or 0)
+    if created:
+        return _apply_deltas(day, {current["status"]: (1, new_total)})
+
+    old_total = int(previous["total_cents"] or 0)
+    if previous["status"] == current["status"]:
+        return _apply_deltas(day, {current["status"]: (0, new_total - old_total)})
+    return _apply_deltas(day, {previous["status"]: (-1, -old_total), current["status"]: (1, new_total)})
+
+
+def apply_order_deleted(order: Order) -> bool:
+    state = order.previous_state()
+    created_at = order.__dict__.get("created_at")
+    if created_at is None:
+        # Deferred, and the row is already gone; the backfill command will catch up.
+        return False
+    if not _has_baseline(state):
+        refresh_days([order_day(created_at)])
+        return True
+    return _apply_deltas(order_day(created_at), {state["status"]: (-1, -int(state["total_cents"] or 0))})
+
+
+def apply_bulk_change(order_ids, created=False, batch_size=REFRESH_BATCH_SIZE) -> None:
+    """Receiver side of `orders_bulk_changed`; see the module docstring."""
+    order_ids = list(order_ids)
+    for start in range(0, len(order_ids), batch_size):
+        chunk = Order.objects.filter(id__in=order_ids[start:start + batch_size])
+        if created:
+            deltas = {}
+            for row in _aggregate(chunk):
+                deltas.setdefault(row["day"], {})[row["status"]] = (row["order_count"], row["total_cents"] or 0)
+            for day, day_deltas in deltas.items():
+                _apply_deltas(day, day_deltas)
+        else:
+            refresh_days(chunk.annotate(day=TruncDate("created_at")).values_list("day", flat=True).distinct())
+
+
+def _created_bounds() -> dict:
+    """Earliest and latest `created_at` over hot and archived orders (None if there are none)."""
+    bounds = [
+        model.objects.aggregate(first=Min("created_at"), last=Max("created_at")) for model in (Order, ArchivedOrder)
+    ]
+    firsts = [row["first"] for row in bounds if row["first"] is not None]
+    lasts = [row["last"] for row in bounds if row["last"] is not None]
+    return {"first": min(firsts, default=None), "last": max(lasts, default=None)}
+
+
+def rebuild_daily_stats(first=None, last=None, batch_days=BACKFILL_BATCH_DAYS) -> int:
+    """Recompute stats for [first, last] (default: every day with orders), `batch_days` at a time."""
+    if first is None or last is None:
+        bounds = _created_bounds()
+        if bounds["first"] is None:
+            DailyOrderStats.objects.all().delete()
+            return 0
+        first = first or order_day(bounds["first"])
+        last = last or order_day(bounds["last"])
+        if first <= order_day(bounds["first"]) and last >= order_day(bounds["last"]):
+            # Full rebuild: drop rows for days that no longer have orders.
+            DailyOrderStats.objects.exclude(day__range=(first, last)).delete()
+
+    written = 0
+    window_start = first
+    while window_start <= last:
+        window_end = min(window_start + datetime.timedelta(days=batch_days - 1), last)
+        days = [window_start + datetime.timedelta(days=n) for n in range((window_end - window_start).days + 1)]
+        written += refresh_days(days)
+        window_start = window_end + datetime.timedelta(days=1)
+    return written
+
+
+def _period_start(day, granularity):
+    if granularity == "week":
+        return day - datetime.timedelta(days=day.weekday())
+    if granularity == "month":
+        return day.replace(day=1)
+    return day
+
+
+def bucketed_stats(first, last, granularity="day", status=None) -> list[dict]:
+    """Per-period totals and per-status breakdown for [first, last], oldest period first."""
+    queryset = DailyOrderStats.objects.filter(day__range=(first, last))
+    if status:
+        queryset = queryset.filter(status=status)
+
+    periods = {}
+    for day, row_status, order_count, total_cents in queryset.order_by("day").values_list(
+        "day", "status", "order_count", "total_cents"
+    ):
+        if not order_count and not total_cents:
+            continue
+        period = periods.setdefault(
+            _period_start(day, granularity), {"order_count": 0, "total_cents": 0, "by_status": {}}
+        )
+        period["order_count"] += order_count
+        period["total_cents"] += total_cents
+        by_status = period["by_status"].setdefault(row_status, {"order_count": 0, "total_cents": 0})
+        by_status["order_count"] += order_count
+        by_status["total_cents"] += total_cents
+
+    return [{"period": start.isoformat(), **values} for start, values in periods.items()]
@@ -0,0 +1,95 @@
+"""Cache for the `/api/orders/summary/` payload.
+
+Entries are keyed by `limit` under a generation number. Anything that can change the
+summary (see orders/signals.py) calls `invalidate()`, which bumps the generation so every
+cached limit is dropped at once; `SUMMARY_CACHE_TIMEOUT` is only a safety net.
+
+The default cache is local-memory, i.e. per process. Point `CACHES["default"]` at a
+shared backend (Redis/memcached) when running several workers. If the generation key is
+evicted it is re-seeded from the clock rather than restarted at 1, so entries cached under
+an earlier generation can't come back into use.
+
+Misses are built from the primary (`primary_reads()`): a replica that hasn't caught up with
+the write behind the last `invalidate()` would otherwise get its old rows cached as current.
+
+`aget_or_build()` is the same lookup for the async summary view, using the cache's async API.
+"""
+
+import hashlib
+import json
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+
+from regression_lab.db_router import primary_reads
+
+GENERATION_KEY = "orders:summary:generation"
+
+
+def _seed() -> int:
+    # Larger than any generation handed out before an eviction (barring clock jumps).
+    return time.time_ns()
+
+
+def _timeout():
+    return getattr(settings, "SUMMARY_CACHE_TIMEOUT", 300)
+
+
+def _generation() -> int:
+    generation = cache.get(GENERATION_KEY)
+    if generation is None:
+        seed = _seed()
+        cache.add(GENERATION_KEY, seed, timeout=None)
+        generation = cache.get(GENERATION_KEY, seed)
+    return generation
+
+
+def _bump_generation() -> None:
+    try:
+        cache.incr(GENERATION_KEY)
+    except ValueError:
+        cache.set(GENERATION_KEY, _seed(), timeout=None)
+
+
+def invalidate() -> None:
+    # Bump now so the writing request never sees stale data, and again after commit in case
+    # a concurrent reader cached pre-commit rows in between.
+    _bump_generation()
+    transaction.on_commit(_bump_generation)
+
+
+def get_or_build(limit, build):
+    """Return (payload, etag) for `limit`, calling `build()` on a miss."""
+    key = f"orders:summary:{_generation()}:{limit}"
+    entry = cache.get(key)
+    if entry is None:
+        with primary_reads():
+            payload = build()
+        body = json.dumps(payload, sort_keys=True, default=str).encode()
+        entry = (payload, hashlib.sha1(body).hexdigest())
+        cache.set(key, entry, timeout=_timeout())
+    return entry
+
+
+async def _ageneration() -> int:
+    generation = await cache.aget(GENERATION_KEY)
+    if generation is None:
+        seed = _seed()
+        await cache.aadd(GENERATION_KEY, seed, timeout=None)
+        generation = await cache.aget(GENERATION_KEY, seed)
+    return generation
+
+
+async def aget_or_build(limit, build):
+    """Async `get_or_build`; `build` is a coroutine function."""
+    key = f"orders:summary:{await _ageneration()}:{limit}"
+    entry = await cache.aget(key)
+    if entry is None:
+        with primary_reads():
+            payload = await build()
+        body = json.dumps(payload, sort_keys=True, default=str).encode()
+        entry = (payload, hashlib.sha1(body).hexdigest())
+        await cache.aset(key, entry, timeout=_timeout())
+    return entry
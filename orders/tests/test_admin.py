@@ -0,0 +1,85 @@
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+
+from orders.admin import OrderAdmin
+from orders.models import Customer, Order, OrderItem
+from orders.seeding import seed_orders
+
+
+@override_settings(QUERY_BUDGET_RAISE=True)
+class AdminChangelistTests(TestCase):
+    """Every changelist stays within its QUERY_BUDGETS entry (the middleware raises otherwise)."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_superuser("admin", "admin@example.com", "pw")
+
+    def setUp(self):
+        self.client.force_login(self.admin)
+
+    def changelist_queries(self, model, query=""):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(f"/admin/orders/{model}/{query}")
+        self.assertEqual(response.status_code, 200)
+        return len(queries)
+
+    def test_query_count_does_not_grow_with_rows(self):
+        seed_orders(2, 2, 2, seed=1)
+        small = {model: self.changelist_queries(model) for model in ("order", "orderitem", "customer")}
+        seed_orders(20, 5, 3, seed=2)
+        large = {model: self.changelist_queries(model) for model in ("order", "orderitem", "customer")}
+        self.assertEqual(small, large)
+        self.assertEqual(large, {"order": 4, "orderitem": 4, "customer": 4})
+
+    def test_filters_and_search_stay_within_budget(self):
+        seed_orders(5, 3, 2, seed=1)
+        order = Order.objects.order_by("id").first()
+        item = OrderItem.objects.order_by("id").first()
+        self.changelist_queries("order", "?status__exact=paid&is_archived__exact=0")
+        self.changelist_queries("order", f"?q={order.customer.email}")
+        self.changelist_queries("order", f"?q={order.id}")
+        self.changelist_queries("orderitem", f"?q={item.sku}")
+        self.changelist_queries("customer", "?q=user")
+
+    def test_search_matches(self):
+        alice = Customer.objects.create(name="Alice", email="alice@example.com")
+        order = Order.objects.create(customer=alice)
+        OrderItem.objects.create(order=order, sku="SKU-42", quantity=1, unit_price_cents=100)
+        OrderItem.objects.create(order=order, sku="SKU-420", quantity=1, unit_price_cents=100)
+
+        response = self.client.get(f"/admin/orders/order/?q={order.id}")
+        self.assertEqual(list(response.context["cl"].result_list), [order])
+        response = self.client.get("/admin/orders/orderitem/?q=SKU-42")
+        self.assertEqual([item.sku for item in response.context["cl"].result_list], ["SKU-42"])
+
+    def test_count_is_capped(self):
+        seed_orders(3, 4, 0, seed=1)
+        with mock.patch.object(OrderAdmin, "count_limit", 5):
+            response = self.client.get("/admin/orders/order/")
+        changelist = response.context["cl"]
+        self.assertEqual(changelist.result_count, 5)
+        self.assertFalse(changelist.show_full_result_count)
+        self.assertContains(response, "5+ orders")
+
+        with mock.patch.object(OrderAdmin, "count_limit", 12):
+            response = self.client.get("/admin/orders/order/")
+        self.assertEqual(str(response.context["cl"].result_count), "12")
+        self.assertContains(response, "12 orders")
+
+    def test_pages_continue_past_the_cap(self):
+        seed_orders(3, 4, 0, seed=1)
+        ids = list(Order.objects.order_by("-pk").values_list("id", flat=True))
+        with mock.patch.object(OrderAdmin, "count_limit", 5), mock.patch.object(OrderAdmin, "list_per_page", 2):
+            pages = []
+            for number in range(1, 7):
+                response = self.client.get(f"/admin/orders/order/?p={number}")
+                self.assertEqual(response.status_code, 200)
+                changelist = response.context["cl"]
+                pages.append([order.id for order in changelist.result_list])
+                self.assertEqual(changelist.paginator.num_pages > number, number < 6)
+            self.assertEqual(self.client.get("/admin/orders/order/?p=7").status_code, 302)
+        self.assertEqual(sum(pages, []), ids)
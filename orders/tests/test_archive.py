@@ -0,0 +1,106 @@
+import datetime
+from io import StringIO
+
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from orders.archive import archive_orders
+from orders.models import (
+    ArchivedOrder, ArchivedOrderItem, Customer, CustomerSpendRollup, DailyOrderStats, Order, OrderItem,
+)
+from orders.tests.test_sku_sales import stored_rollup
+
+
+def daily_stats():
+    rows = DailyOrderStats.objects.filter(order_count__gt=0)
+    return sorted(rows.values_list("day", "status", "order_count", "total_cents"))
+
+
+@override_settings(QUERY_BUDGET_RAISE=True)
+class OrderArchiveTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.alice = Customer.objects.create(name="Alice", email="alice@example.com")
+        self.live = self.order(Order.Status.PAID, sku="A")
+        self.archived = self.order(Order.Status.PAID, sku="A", quantity=3)
+        self.archived.is_archived = True
+        self.archived.save()
+        self.old_cancelled = self.order(Order.Status.CANCELLED, sku="B")
+        self.recent_cancelled = self.order(Order.Status.CANCELLED, sku="B")
+        Order.objects.filter(id=self.old_cancelled.id).update(
+            updated_at=timezone.now() - datetime.timedelta(days=120)
+        )
+
+    def order(self, status, sku, quantity=1):
+        order = Order.objects.create(customer=self.alice, status=status)
+        OrderItem.objects.create(order=order, sku=sku, quantity=quantity, unit_price_cents=100)
+        OrderItem.objects.create(order=order, sku="Z", quantity=1, unit_price_cents=5)
+        return Order.objects.get(id=order.id)
+
+    def test_moves_archived_and_old_cancelled_orders_with_items(self):
+        moved = archive_orders(batch_size=1)
+
+        self.assertEqual(moved, 2)
+        self.assertEqual(
+            set(Order.objects.values_list("id", flat=True)), {self.live.id, self.recent_cancelled.id}
+        )
+        self.assertEqual(
+            set(ArchivedOrder.objects.values_list("id", flat=True)), {self.archived.id, self.old_cancelled.id}
+        )
+        self.assertFalse(OrderItem.objects.filter(order_id__in=[self.archived.id, self.old_cancelled.id]).exists())
+        self.assertEqual(
+            sorted(ArchivedOrderItem.objects.filter(order=self.archived.id).values_list("sku", "quantity")),
+            [("A", 3), ("Z", 1)],
+        )
+        self.assertEqual(archive_orders(), 0)
+
+    def test_retrieve_falls_back_to_the_archive(self):
+        before = self.client.get(f"/api/orders/{self.archived.id}/").json()
+        archive_orders()
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(f"/api/orders/{self.archived.id}/")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json(), before)
+        self.assertEqual(len(queries), 2)
+        self.assertEqual(self.client.get("/api/orders/999999/").status_code, 404)
+
+        response = self.client.get(f"/api/async/orders/{self.archived.id}/")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json(), before)
+        self.assertEqual(self.client.get("/api/async/orders/999999/").status_code, 404)
+
+    def test_derived_tables_are_unchanged_and_rebuilds_include_the_archive(self):
+        stats, skus = daily_stats(), stored_rollup()
+        spend = CustomerSpendRollup.objects.get(customer=self.alice).total_cents
+        archive_orders()
+
+        self.assertEqual(daily_stats(), stats)
+        self.assertEqual(stored_rollup(), skus)
+        self.assertEqual(CustomerSpendRollup.objects.get(customer=self.alice).total_cents, spend)
+
+        call_command("backfill_order_stats", stdout=StringIO())
+        call_command("rebuild_sku_rollup", stdout=StringIO())
+        self.assertEqual(daily_stats(), stats)
+        self.assertEqual(stored_rollup(), skus)
+
+    def test_deleting_the_customer_removes_archived_orders_from_stats(self):
+        archive_orders()
+        self.alice.delete()
+        self.assertFalse(ArchivedOrder.objects.exists())
+        self.assertEqual(daily_stats(), [])
+        self.assertEqual(stored_rollup(), {})
+
+    def test_command(self):
+        out = StringIO()
+        call_command("archive_orders", "--dry-run", stdout=out)
+        self.assertIn("2 order(s) would be archived", out.getvalue())
+
+        call_command("archive_orders", "--limit", "1", stdout=out)
+        self.assertEqual(ArchivedOrder.objects.count(), 1)
+        call_command("archive_orders", "--cancelled-days", "0", "--batch-size", "1", stdout=out)
+        self.assertEqual(set(Order.objects.values_list("id", flat=True)), {self.live.id})
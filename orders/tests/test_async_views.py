@@ -0,0 +1,71 @@
+import json
+
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from rest_framework.test import APIClient
+
+from orders.models import Customer, Order
+from orders.seeding import seed_orders
+
+
+@override_settings(QUERY_BUDGET_RAISE=True)
+class AsyncReadViewTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        seed_orders(15, 3, 2, seed=3)
+        cls.order = Order.objects.order_by("id").first()
+        Order.objects.filter(id=cls.order.id + 1).update(is_archived=True)
+
+    def setUp(self):
+        cache.clear()
+        self.sync_client = APIClient()
+
+    def assert_same(self, sync_path, async_path):
+        expected = self.sync_client.get(sync_path)
+        actual = self.client.get(async_path)
+        self.assertEqual(actual.status_code, expected.status_code)
+        body = actual.json()
+        expected_body = expected.json()
+        for key in ("next", "previous"):
+            if expected_body.get(key):
+                expected_body[key] = expected_body[key].replace("/api/orders/", "/api/async/orders/")
+        self.assertEqual(body, expected_body)
+        return body
+
+    def test_list_matches_sync_endpoint(self):
+        body = self.assert_same("/api/orders/", "/api/async/orders/")
+        self.assertEqual(body["count"], 44)
+        self.assert_same("/api/orders/?page=2&status=paid", "/api/async/orders/?page=2&status=paid")
+        self.assert_same("/api/orders/?email=user1", "/api/async/orders/?email=user1")
+
+    def test_list_errors(self):
+        self.assertEqual(self.client.get("/api/async/orders/?status=bogus").status_code, 400)
+        self.assertEqual(self.client.get("/api/async/orders/?page=99").status_code, 404)
+        self.assertEqual(self.client.post("/api/async/orders/").status_code, 405)
+
+    def test_detail_matches_sync_endpoint(self):
+        self.assert_same(f"/api/orders/{self.order.id}/", f"/api/async/orders/{self.order.id}/")
+        self.assertEqual(self.client.get("/api/async/orders/999999/").status_code, 404)
+
+    def test_summary_shares_cache_and_etag(self):
+        sync_res = self.sync_client.get("/api/orders/summary/?limit=5")
+        res = self.client.get("/api/async/orders/summary/?limit=5")
+        self.assertEqual(res.json(), sync_res.json())
+        self.assertEqual(res["ETag"], sync_res["ETag"])
+
+        res = self.client.get("/api/async/orders/summary/?limit=5", HTTP_IF_NONE_MATCH=res["ETag"])
+        self.assertEqual(res.status_code, 304)
+
+    async def test_async_client_is_instrumented(self):
+        with self.assertLogs("regression_lab.perf", level="INFO") as logs:
+            res = await self.async_client.get(f"/api/async/orders/{self.order.id}/")
+        self.assertEqual(res.status_code, 200)
+        self.assertIn('desc="2 queries, 0 duplicated"', res["Server-Timing"])
+        record = json.loads(logs.records[0].getMessage())
+        self.assertEqual(record["view"], "async-orders-detail")
+
+    async def test_async_client_list(self):
+        customer = await Customer.objects.order_by("id").afirst()
+        res = await self.async_client.get(f"/api/async/orders/?email={customer.email}")
+        self.assertEqual(res.status_code, 200)
+        self.assertEqual({row["customer"] for row in res.json()["results"]}, {customer.id})
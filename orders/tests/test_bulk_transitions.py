@@ -0,0 +1,123 @@
+from unittest import mock
+
+from django.db import connection
+from django.db.models.signals import post_save
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from orders import transitions
+from orders.events import orders_bulk_changed
+from orders.models import Customer, CustomerSpendRollup, Order, OutboxEvent
+from orders.serializers import BulkTransitionSerializer
+
+
+class BulkTransitionTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.alice = Customer.objects.create(name="Alice", email="alice@example.com")
+        self.bob = Customer.objects.create(name="Bob", email="bob@example.com")
+        self.drafts = [Order.objects.create(customer=self.alice, status=Order.Status.DRAFT) for _ in range(5)]
+        self.paid = Order.objects.create(customer=self.alice, status=Order.Status.PAID, total_cents=900)
+        self.bob_draft = Order.objects.create(customer=self.bob, status=Order.Status.DRAFT)
+
+    def post(self, body):
+        return self.client.post("/api/orders/bulk-transition/", body, format="json")
+
+    def outcomes(self, res):
+        return {row["id"]: row["outcome"] for row in res.json()["results"]}
+
+    def test_cancel_by_ids_reports_per_id_outcomes(self):
+        Order.objects.filter(id=self.drafts[0].id).update(status=Order.Status.CANCELLED)
+        ids = [d.id for d in self.drafts] + [999999]
+
+        res = self.post({"target": "cancelled", "ids": ids})
+        self.assertEqual(res.status_code, 200)
+        self.assertEqual(res.json()["updated"], 4)
+
+        outcomes = self.outcomes(res)
+        self.assertEqual(outcomes[self.drafts[0].id], "unchanged")
+        self.assertEqual(outcomes[self.drafts[1].id], "updated")
+        self.assertEqual(outcomes[999999], "not_found")
+        self.assertEqual(
+            set(Order.objects.filter(id__in=ids).values_list("status", flat=True)), {Order.Status.CANCELLED}
+        )
+
+    def test_mark_paid_only_from_draft_and_refreshes_rollup(self):
+        cancelled = Order.objects.create(customer=self.alice, status=Order.Status.CANCELLED)
+        Order.objects.filter(id=self.drafts[0].id).update(total_cents=100)
+
+        res = self.post({"target": "paid", "ids": [self.drafts[0].id, cancelled.id]})
+        outcomes = self.outcomes(res)
+        self.assertEqual(outcomes[self.drafts[0].id], "updated")
+        self.assertEqual(outcomes[cancelled.id], "invalid_transition")
+
+        rollup = CustomerSpendRollup.objects.get(customer=self.alice)
+        self.assertEqual((rollup.order_count, rollup.total_cents), (2, 1000))
+
+    def test_rows_changed_after_the_read_are_not_reported_as_updated(self):
+        classify = transitions._classify
+        raced = self.drafts[1]
+
+        def classify_then_race(row, *args):
+            outcome = classify(row, *args)
+            if row["id"] == raced.id:
+                Order.objects.filter(id=raced.id).update(status=Order.Status.PAID)
+            return outcome
+
+        ids = [d.id for d in self.drafts]
+        with mock.patch.object(transitions, "_classify", side_effect=classify_then_race):
+            res = self.post({"target": "paid", "ids": ids})
+
+        self.assertEqual(res.json()["updated"], 4)
+        self.assertEqual(self.outcomes(res)[raced.id], "unchanged")
+        self.assertEqual(set(OutboxEvent.objects.values_list("order_id", flat=True)), set(ids) - {raced.id})
+
+    def test_archive_by_filter_uses_list_filters(self):
+        res = self.post({"target": "archived", "filter": {"status": "draft", "email": "alice"}})
+        self.assertEqual(res.json()["updated"], 5)
+        self.assertFalse(Order.objects.get(id=self.bob_draft.id).is_archived)
+        self.assertTrue(all(Order.objects.get(id=d.id).is_archived for d in self.drafts))
+
+    def test_hooks_fire_once_per_batch(self):
+        bulk_calls, row_saves = [], []
+
+        def on_bulk(sender, order_ids, **kwargs):
+            bulk_calls.append(list(order_ids))
+
+        def on_save(sender, **kwargs):
+            row_saves.append(kwargs["instance"].id)
+
+        orders_bulk_changed.connect(on_bulk)
+        post_save.connect(on_save, sender=Order)
+        try:
+            with CaptureQueriesContext(connection) as queries:
+                self.post({"target": "cancelled", "ids": [d.id for d in self.drafts]})
+        finally:
+            orders_bulk_changed.disconnect(on_bulk)
+            post_save.disconnect(on_save, sender=Order)
+
+        self.assertEqual(len(bulk_calls), 1)
+        self.assertEqual(sorted(bulk_calls[0]), sorted(d.id for d in self.drafts))
+        self.assertEqual(row_saves, [])
+        updates = [q for q in queries if q["sql"].startswith('UPDATE "orders_order"')]
+        self.assertEqual(len(updates), 1)
+
+    def test_validation(self):
+        self.assertEqual(self.post({"target": "cancelled"}).status_code, 400)
+        self.assertEqual(self.post({"target": "shipped", "ids": [1]}).status_code, 400)
+        self.assertEqual(self.post({"target": "cancelled", "ids": [1], "filter": {}}).status_code, 400)
+        self.assertEqual(self.post({"target": "cancelled", "filter": {"status": "bogus"}}).status_code, 400)
+
+    def test_filter_must_be_known_non_empty_and_capped(self):
+        for bad in ({"stauts": "draft"}, {}, {"status": " ", "email": ""}):
+            res = self.post({"target": "cancelled", "filter": bad})
+            self.assertEqual(res.status_code, 400, bad)
+            self.assertIn("filter", res.json())
+        self.assertFalse(Order.objects.filter(status=Order.Status.CANCELLED).exists())
+
+        with mock.patch.object(BulkTransitionSerializer, "MAX_IDS", 2):
+            res = self.post({"target": "cancelled", "filter": {"status": "draft"}})
+        self.assertEqual(res.status_code, 400)
+        self.assertIn("narrow", res.json()["filter"])
+        self.assertFalse(Order.objects.filter(status=Order.Status.CANCELLED).exists())
@@ -0,0 +1,78 @@
+from datetime import timedelta
+
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from orders.models import Customer, Order
+
+
+class CursorPaginationTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.alice = Customer.objects.create(name="Alice", email="alice@example.com")
+        self.bob = Customer.objects.create(name="Bob", email="bob@example.com")
+        for i in range(30):
+            Order.objects.create(
+                customer=self.alice if i % 2 else self.bob,
+                status=Order.Status.PAID if i % 3 else Order.Status.DRAFT,
+            )
+
+    def walk(self, url):
+        ids = []
+        while url:
+            res = self.client.get(url)
+            self.assertEqual(res.status_code, 200)
+            payload = res.json()
+            self.assertNotIn("count", payload)
+            ids.extend(row["id"] for row in payload["results"])
+            url = payload["next"]
+        return ids
+
+    def test_walks_all_orders_by_id_desc(self):
+        ids = self.walk("/api/orders/?pagination=cursor")
+        expected = list(Order.objects.order_by("-id").values_list("id", flat=True))
+        self.assertEqual(ids, expected)
+
+    def test_cursor_pages_skip_count_and_offset(self):
+        first = self.client.get("/api/orders/?pagination=cursor").json()
+        with CaptureQueriesContext(connection) as queries:
+            self.client.get(first["next"])
+        sql = " ".join(q["sql"] for q in queries)
+        self.assertNotIn("COUNT(", sql)
+        self.assertNotIn("OFFSET", sql)
+
+    def test_filters_are_kept_across_pages(self):
+        ids = self.walk("/api/orders/?pagination=cursor&status=paid&email=alice")
+        expected = list(
+            Order.objects.filter(status=Order.Status.PAID, customer=self.alice)
+            .order_by("-id")
+            .values_list("id", flat=True)
+        )
+        self.assertEqual(ids, expected)
+
+    def test_created_at_ordering_breaks_ties_on_id(self):
+        same_time = timezone.now() - timedelta(days=1)
+        Order.objects.update(created_at=same_time)
+        newest = Order.objects.order_by("id").first()
+        Order.objects.filter(id=newest.id).update(created_at=timezone.now())
+
+        ids = self.walk("/api/orders/?pagination=cursor&ordering=created_at")
+        expected = list(Order.objects.order_by("-created_at", "-id").values_list("id", flat=True))
+        self.assertEqual(ids, expected)
+        self.assertEqual(ids[0], newest.id)
+
+    def test_customers_support_cursor_mode(self):
+        ids = self.walk("/api/customers/?pagination=cursor")
+        self.assertEqual(ids, [self.bob.id, self.alice.id])
+
+    def test_invalid_cursor_and_ordering(self):
+        self.assertEqual(self.client.get("/api/orders/?cursor=not-a-cursor").status_code, 404)
+        self.assertEqual(self.client.get("/api/orders/?pagination=cursor&ordering=total").status_code, 400)
+
+    def test_page_number_mode_is_unchanged(self):
+        payload = self.client.get("/api/orders/").json()
+        self.assertEqual(payload["count"], 30)
+        self.assertEqual(len(payload["results"]), 20)
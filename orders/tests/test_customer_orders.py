@@ -0,0 +1,76 @@
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from orders.models import Customer, Order, OrderItem
+
+
+class CustomerOrdersEndpointTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.alice = Customer.objects.create(name="Alice", email="alice@example.com")
+        self.bob = Customer.objects.create(name="Bob", email="bob@example.com")
+        Order.objects.create(customer=self.bob, status=Order.Status.PAID)
+        Order.objects.create(customer=self.alice, status=Order.Status.PAID, is_archived=True)
+
+    def make_orders(self, count):
+        for i in range(count):
+            order = Order.objects.create(
+                customer=self.alice,
+                status=Order.Status.PAID if i % 2 else Order.Status.DRAFT,
+            )
+            OrderItem.objects.create(order=order, sku=f"SKU-{i}", quantity=1, unit_price_cents=100)
+            OrderItem.objects.create(order=order, sku="SKU-X", quantity=2, unit_price_cents=50)
+
+    def url(self, query=""):
+        return f"/api/customers/{self.alice.id}/orders/{query}"
+
+    def test_returns_customers_non_archived_orders_with_items(self):
+        self.make_orders(3)
+        res = self.client.get(self.url())
+        self.assertEqual(res.status_code, 200)
+
+        payload = res.json()
+        expected = list(
+            Order.objects.filter(customer=self.alice, is_archived=False).order_by("-id").values_list("id", flat=True)
+        )
+        self.assertEqual([row["id"] for row in payload["results"]], expected)
+        self.assertEqual(len(payload["results"][0]["items"]), 2)
+        self.assertEqual(payload["results"][0]["customer_email"], "alice@example.com")
+        self.assertIsNone(payload["next"])
+
+    def test_query_count_is_constant(self):
+        self.make_orders(2)
+        with CaptureQueriesContext(connection) as small:
+            self.client.get(self.url())
+
+        self.make_orders(30)
+        with CaptureQueriesContext(connection) as large:
+            res = self.client.get(self.url())
+
+        self.assertEqual(len(res.json()["results"]), 20)
+        # customer + page of orders + their items
+        self.assertEqual(len(small), 3)
+        self.assertEqual(len(large), 3)
+
+    def test_pagination_and_status_filter(self):
+        self.make_orders(25)
+        first = self.client.get(self.url("?status=paid")).json()
+        self.assertEqual(len(first["results"]), 12)
+        self.assertTrue(all(row["status"] == "paid" for row in first["results"]))
+        self.assertIsNone(first["next"])
+
+        page1 = self.client.get(self.url()).json()
+        page2 = self.client.get(page1["next"]).json()
+        self.assertEqual(len(page1["results"]) + len(page2["results"]), 25)
+        self.assertIsNone(page2["next"])
+        self.assertIsNotNone(page2["previous"])
+        self.assertFalse({r["id"] for r in page1["results"]} & {r["id"] for r in page2["results"]})
+
+    def test_errors(self):
+        self.assertEqual(self.client.get(self.url("?status=bogus")).status_code, 400)
+        self.assertEqual(self.client.get(self.url("?page=x")).status_code, 404)
+        self.assertEqual(self.client.get(self.url()).status_code, 200)
+        self.assertEqual(self.client.get(self.url("?page=2")).status_code, 404)
+        self.assertEqual(self.client.get("/api/customers/999999/orders/").status_code, 404)
@@ -0,0 +1,89 @@
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from orders.models import Customer, Order
+from orders.search import FTS_TABLE, fts_enabled, prefix_range
+
+
+class CustomerSearchTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.alice = Customer.objects.create(name="Alice Liddell", email="Alice.Smith@Example.com")
+        self.bob = Customer.objects.create(name="Bob Jones", email="bob@example.org")
+        self.alice_order = Order.objects.create(customer=self.alice)
+        self.bob_order = Order.objects.create(customer=self.bob)
+
+    def order_ids(self, email):
+        res = self.client.get("/api/orders/", {"email": email})
+        self.assertEqual(res.status_code, 200)
+        return {row["id"] for row in res.json()["results"]}
+
+    def customer_ids(self, **params):
+        res = self.client.get("/api/customers/", params)
+        self.assertEqual(res.status_code, 200)
+        return {row["id"] for row in res.json()["results"]}
+
+    def test_email_lower_is_maintained(self):
+        self.assertEqual(self.alice.email_lower, "alice.smith@example.com")
+        self.alice.email = "NEW@Example.com"
+        self.alice.save(update_fields=["email"])
+        self.assertEqual(Customer.objects.get(id=self.alice.id).email_lower, "new@example.com")
+
+    def test_prefix_range(self):
+        self.assertEqual(prefix_range("ali"), ("ali", "alj"))
+
+    def test_email_filter_matches_substrings_case_insensitively(self):
+        self.assertEqual(self.order_ids("SMITH@exa"), {self.alice_order.id})
+        self.assertEqual(self.order_ids("example"), {self.alice_order.id, self.bob_order.id})
+        self.assertEqual(self.order_ids("nobody"), set())
+
+    def test_email_filter_uses_trigram_index_on_sqlite(self):
+        if not fts_enabled():
+            self.skipTest("SQLite FTS5 trigram tokenizer not available")
+        with CaptureQueriesContext(connection) as queries:
+            self.order_ids("smith")
+        self.assertTrue(any(FTS_TABLE in q["sql"] for q in queries))
+        self.assertFalse(any("LIKE" in q["sql"] for q in queries))
+
+    def test_short_terms_fall_back_to_icontains(self):
+        self.assertEqual(self.order_ids("OB"), {self.bob_order.id})
+
+    @override_settings(CUSTOMER_SEARCH_FTS=False)
+    def test_fts_can_be_disabled(self):
+        self.assertEqual(self.order_ids("smith"), {self.alice_order.id})
+
+    def test_index_follows_bulk_inserts_updates_and_deletes(self):
+        (carol,) = Customer.objects.bulk_create([Customer(name="Carol", email="carol.king@example.net")])
+        self.assertEqual(self.customer_ids(search="king@"), {carol.id})
+
+        Customer.objects.filter(id=carol.id).update(email="carol@elsewhere.net")
+        self.assertEqual(self.customer_ids(search="king@"), set())
+        self.assertEqual(self.customer_ids(search="elsewhere"), {carol.id})
+
+        carol.delete()
+        self.assertEqual(self.customer_ids(search="elsewhere"), set())
+
+    def test_customer_search_covers_name_and_email(self):
+        self.assertEqual(self.customer_ids(search="liddell"), {self.alice.id})
+        self.assertEqual(self.customer_ids(search="example.org"), {self.bob.id})
+
+    def test_email_prefix(self):
+        self.assertEqual(self.customer_ids(email_prefix="ALICE.s"), {self.alice.id})
+        self.assertEqual(self.customer_ids(email_prefix="bob@"), {self.bob.id})
+        self.assertEqual(self.customer_ids(email_prefix="smith"), set())
+
+    def test_email_prefix_follows_writes_that_bypass_save(self):
+        if connection.vendor != "sqlite":
+            self.skipTest("email_lower triggers are SQLite-only")
+        (carol,) = Customer.objects.bulk_create([Customer(name="Carol", email="Carol.King@Example.net")])
+        self.assertEqual(self.customer_ids(email_prefix="carol.k"), {carol.id})
+
+        Customer.objects.filter(id=carol.id).update(email="CK@Elsewhere.net")
+        self.assertEqual(self.customer_ids(email_prefix="carol"), set())
+        self.assertEqual(self.customer_ids(email_prefix="ck@else"), {carol.id})
+
+        # A value set by the writer is kept.
+        Customer.objects.filter(id=self.bob.id).update(email="Bob@Example.org", email_lower="bob@example.org")
+        self.assertEqual(Customer.objects.get(id=self.bob.id).email_lower, "bob@example.org")
@@ -0,0 +1,141 @@
+import json
+import re
+from unittest import mock
+
+from django.core.cache import cache
+from django.db import connections, transaction
+from django.test import TransactionTestCase, override_settings
+from rest_framework.test import APIClient
+
+from orders import search
+from orders.models import Customer, Order
+from orders.seeding import seed_orders
+from regression_lab.db_router import PrimaryReplicaRouter, RoutingState, _state
+
+WRITE_SQL = re.compile(r"^\s*(INSERT|UPDATE|DELETE|REPLACE|CREATE|DROP|ALTER)\b", re.IGNORECASE)
+
+
+class StatementLog:
+    def __init__(self, alias):
+        self.alias = alias
+        self.statements = []
+
+    def __call__(self, execute, sql, params, many, context):
+        self.statements.append(sql)
+        return execute(sql, params, many, context)
+
+    def writes(self):
+        return [sql for sql in self.statements if WRITE_SQL.match(sql)]
+
+    def reads(self):
+        return [sql for sql in self.statements if sql.lstrip().upper().startswith("SELECT")]
+
+
+class ReplicaRoutingTests(TransactionTestCase):
+    # `replica` mirrors `default` under test, so it sees committed rows.
+    databases = {"default", "replica"}
+
+    def setUp(self):
+        cache.clear()
+        seed_orders(5, 3, 2, seed=1)
+        self.order = Order.objects.filter(status=Order.Status.PAID).order_by("id").first()
+        self.client = APIClient()
+
+    def record(self, fn):
+        logs = {alias: StatementLog(alias) for alias in ("default", "replica")}
+        with connections["default"].execute_wrapper(logs["default"]), \
+                connections["replica"].execute_wrapper(logs["replica"]):
+            fn()
+        return logs["default"], logs["replica"]
+
+    def test_reads_outside_requests_use_the_primary(self):
+        router = PrimaryReplicaRouter()
+        self.assertEqual(router.db_for_read(Order), "default")
+        self.assertEqual(router.db_for_write(Order), "default")
+
+    def test_safe_requests_on_opted_in_views_read_from_the_replica(self):
+        for path in ("/api/orders/", f"/api/orders/{self.order.id}/", "/api/orders/summary/",
+                     "/api/orders/stats/", "/api/customers/", "/api/items/top-skus/", "/api/async/orders/"):
+            self.client.get(path)  # cache misses read from the primary (see below)
+            default, replica = self.record(lambda: self.assertEqual(self.client.get(path).status_code, 200))
+            self.assertEqual(default.statements, [], path)
+            if path != "/api/orders/summary/":  # answered from the cache once warm
+                self.assertTrue(replica.reads(), path)
+
+    def test_shared_cache_entries_are_built_from_the_primary(self):
+        # A lagging replica must not have its rows cached for every client.
+        seed_orders(10, 3, 1, seed=2)  # more than one page of orders
+        for path in ("/api/orders/summary/", "/api/async/orders/summary/"):
+            cache.clear()
+            default, replica = self.record(lambda: self.assertEqual(self.client.get(path).status_code, 200))
+            self.assertTrue(default.reads(), path)
+            self.assertEqual(replica.statements, [], path)
+
+        for path in ("/api/orders/", "/api/async/orders/"):
+            cache.clear()
+            default, replica = self.record(lambda: self.assertEqual(self.client.get(path).status_code, 200))
+            self.assertEqual(len(default.reads()), 1, path)
+            self.assertIn("COUNT(", default.reads()[0].upper(), path)
+            self.assertTrue(replica.reads(), path)
+
+        # An exact total read off the replica is reported but not cached.
+        cache.clear()
+        self.assertTrue(self.client.get("/api/orders/?count=exact").json()["count_exact"])
+        default, _ = self.record(lambda: self.client.get("/api/orders/"))
+        self.assertEqual(len(default.reads()), 1)
+
+    def test_email_search_checks_for_the_index_on_the_replica(self):
+        # The primary has the trigram index, the replica (as far as the probe knows) doesn't.
+        probes = {("default", connections["default"].settings_dict["NAME"]): True,
+                  ("replica", connections["replica"].settings_dict["NAME"]): False}
+        for path in ("/api/orders/?email=user1", "/api/async/orders/?email=user1", "/api/customers/?search=user1"):
+            with mock.patch.dict(search._fts_available, probes, clear=True):
+                _, replica = self.record(lambda: self.assertEqual(self.client.get(path).status_code, 200))
+            sql = " ".join(replica.reads()).upper()
+            self.assertIn("LIKE", sql, path)
+            self.assertNotIn(search.FTS_TABLE.upper(), sql, path)
+
+    def test_writes_never_go_to_the_replica(self):
+        customer = Customer.objects.order_by("id").first()
+        ndjson = json.dumps({"customer": customer.id, "status": "paid", "items": [{"sku": "X", "quantity": 1}]})
+
+        def writes():
+            self.client.post("/api/customers/", {"name": "New", "email": "new@example.com"}, format="json")
+            self.client.post(f"/api/orders/{self.order.id}/cancel/")
+            self.client.post(f"/api/orders/{self.order.id + 1}/archive/")
+            self.client.post("/api/items/", {"order": self.order.id, "sku": "Y", "quantity": 2}, format="json")
+            self.client.post("/api/orders/bulk-transition/", {"target": "paid", "filter": {"status": "draft"}},
+                             format="json")
+            self.client.generic("POST", "/api/orders/ingest/", ndjson + "\n", content_type="application/x-ndjson")
+            self.client.post("/api/dev/seed/", {"customers": 1, "orders_per_customer": 1, "items_per_order": 1},
+                             format="json")
+            self.client.delete(f"/api/customers/{customer.id}/")
+
+        default, replica = self.record(writes)
+        self.assertTrue(default.writes())
+        self.assertEqual(replica.statements, [])
+
+    def test_reads_stick_to_the_primary_after_a_write(self):
+        response = self.client.post(f"/api/orders/{self.order.id}/cancel/")
+        self.assertIn("db_pin", response.cookies)
+
+        default, replica = self.record(lambda: self.client.get(f"/api/orders/{self.order.id}/"))
+        self.assertEqual(replica.statements, [])
+        self.assertTrue(default.reads())
+
+        self.client.cookies.pop("db_pin")
+        default, replica = self.record(lambda: self.client.get(f"/api/orders/{self.order.id}/"))
+        self.assertEqual(default.statements, [])
+        self.assertEqual(self.client.get(f"/api/orders/{self.order.id}/").json()["status"], "cancelled")
+
+    def test_reads_inside_a_primary_transaction_stay_on_the_primary(self):
+        router = PrimaryReplicaRouter()
+        token = _state.set(RoutingState(read_alias="replica"))
+        try:
+            self.assertEqual(router.db_for_read(Order), "replica")
+            with transaction.atomic():
+                self.assertEqual(router.db_for_read(Order), "default")
+            router.db_for_write(Order)
+            self.assertEqual(router.db_for_read(Order), "default")
+        finally:
+            _state.reset(token)
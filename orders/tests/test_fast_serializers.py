@@ -0,0 +1,61 @@
+import json
+
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from orders.fast_serializers import serialize_orders
+from orders.models import Customer, Order, OrderItem
+from orders.serializers import OrderSerializer
+
+
+def as_json(data):
+    return json.loads(json.dumps(data))
+
+
+class FastSerializerParityTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.alice = Customer.objects.create(name="Alice", email="alice@example.com")
+        cls.bob = Customer.objects.create(name="Bob", email="bob@example.com")
+        for i in range(25):
+            order = Order.objects.create(
+                customer=cls.alice if i % 2 else cls.bob,
+                status=Order.Status.PAID if i % 3 else Order.Status.DRAFT,
+            )
+            for j in range(i % 4):
+                OrderItem.objects.create(order=order, sku=f"SKU-{j}", quantity=j + 1, unit_price_cents=199)
+
+    def setUp(self):
+        cache.clear()  # list counts are cached across requests
+        self.client = APIClient()
+
+    def test_serialize_orders_matches_order_serializer(self):
+        orders = Order.objects.select_related("customer").prefetch_related("items").order_by("-id")
+        expected = OrderSerializer(orders, many=True).data
+        self.assertEqual(serialize_orders([o.id for o in orders]), as_json(expected))
+
+    def test_list_pages_match_serializer(self):
+        for url in ("/api/orders/", "/api/orders/?page=2", "/api/orders/?status=paid&email=alice"):
+            payload = self.client.get(url).json()
+            ids = [row["id"] for row in payload["results"]]
+            orders = Order.objects.filter(id__in=ids).order_by("-id")
+            self.assertEqual(payload["results"], as_json(OrderSerializer(orders, many=True).data), url)
+
+    def test_retrieve_matches_serializer(self):
+        order = Order.objects.filter(items__isnull=False).first()
+        res = self.client.get(f"/api/orders/{order.id}/")
+        self.assertEqual(res.status_code, 200)
+        self.assertEqual(res.json(), as_json(OrderSerializer(order).data))
+
+    def test_retrieve_missing_or_malformed_id_is_404(self):
+        self.assertEqual(self.client.get("/api/orders/999999/").status_code, 404)
+        self.assertEqual(self.client.get("/api/orders/abc/").status_code, 404)
+
+    def test_list_page_costs_fixed_queries(self):
+        with CaptureQueriesContext(connection) as queries:
+            self.client.get("/api/orders/")
+        # count + page ids + orders + items
+        self.assertEqual(len(queries), 4)
@@ -0,0 +1,148 @@
+import io
+import json
+from unittest import mock
+
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from orders.ingest import iter_lines
+from orders.models import Customer, CustomerSpendRollup, DailyOrderStats, Order, OrderItem
+from orders.rollups import paid_order_totals
+from orders.tests.test_sku_sales import expected_rollup, stored_rollup
+
+
+def ndjson(*rows):
+    return "".join((row if isinstance(row, str) else json.dumps(row)) + "\n" for row in rows)
+
+
+class OrderIngestTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.alice = Customer.objects.create(name="Alice", email="alice@example.com")
+        self.bob = Customer.objects.create(name="Bob", email="bob@example.com")
+
+    def ingest(self, body, **params):
+        query = "&".join(f"{key}={value}" for key, value in params.items())
+        return self.client.generic(
+            "POST", f"/api/orders/ingest/?{query}", body, content_type="application/x-ndjson"
+        )
+
+    def test_creates_orders_with_items_and_totals(self):
+        response = self.ingest(ndjson(
+            {"customer": self.alice.id, "status": "paid", "items": [
+                {"sku": "A", "quantity": 2, "unit_price_cents": 150},
+                {"sku": "B", "unit_price_cents": 99},
+            ]},
+            {"customer": self.bob.id},
+        ))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["created"], 2)
+        self.assertEqual(response.data["failed"], 0)
+        paid, draft = Order.objects.filter(id__in=response.data["order_ids"]).order_by("id")
+        self.assertEqual((paid.status, paid.total_cents), ("paid", 399))
+        self.assertEqual(
+            list(paid.items.order_by("sku").values_list("sku", "quantity", "unit_price_cents")),
+            [("A", 2, 150), ("B", 1, 99)],
+        )
+        self.assertEqual((draft.status, draft.total_cents, draft.items.count()), ("draft", 0, 0))
+
+    def test_bad_lines_are_reported_without_aborting(self):
+        response = self.ingest(ndjson(
+            {"customer": self.alice.id, "items": [{"sku": "A", "unit_price_cents": 100}]},
+            "{not json",
+            "[1, 2]",
+            {"customer": 999999},
+            {"customer": self.alice.id, "status": "bogus"},
+            {"customer": self.alice.id, "items": [{"sku": "A", "quantity": 0}]},
+            "",
+            {"customer": self.bob.id, "status": "paid"},
+        ), batch_size=3)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["created"], 2)
+        self.assertEqual(response.data["failed"], 5)
+        errors = {error["line"]: error["errors"] for error in response.data["errors"]}
+        self.assertEqual(sorted(errors), [2, 3, 4, 5, 6])
+        self.assertIn("Invalid JSON", errors[2]["non_field_errors"][0])
+        self.assertIn("customer", errors[4])
+        self.assertIn("status", errors[5])
+        self.assertIn("items", errors[6])
+        self.assertEqual(Order.objects.count(), 2)
+
+    def test_total_out_of_column_range_is_a_line_error(self):
+        huge = {"sku": "A", "quantity": 2**31 - 1, "unit_price_cents": 2**31 - 1}
+        response = self.ingest(ndjson(
+            {"customer": self.alice.id, "items": [huge] * 3},
+            {"customer": self.alice.id, "items": [{"sku": "A", "quantity": 1, "unit_price_cents": 2**31 - 1}]},
+        ))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual((response.data["created"], response.data["failed"]), (1, 1))
+        self.assertEqual(response.data["errors"][0]["line"], 1)
+        self.assertIn("exceeds", str(response.data["errors"][0]["errors"]["items"]))
+
+    def test_reported_order_ids_are_capped(self):
+        with mock.patch("orders.ingest.MAX_REPORTED_ORDER_IDS", 3):
+            response = self.ingest(ndjson(*[{"customer": self.alice.id}] * 5), batch_size=2)
+        self.assertEqual(response.data["created"], 5)
+        self.assertEqual(len(response.data["order_ids"]), 3)
+        self.assertTrue(response.data["order_ids_truncated"])
+
+    def test_nothing_created_is_a_400(self):
+        response = self.ingest(ndjson({"customer": 999999}))
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.data["failed"], 1)
+
+        response = self.ingest("", batch_size="many")
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("batch_size", response.data)
+
+    def test_overlong_lines_are_skipped(self):
+        body = io.BytesIO(b"x" * 50 + b"\n\n" + b'{"a": 1}\n')
+        self.assertEqual(list(iter_lines(body.readline, max_line_bytes=10)), [(1, None), (3, b'{"a": 1}\n')])
+
+    def test_derived_tables_match_source(self):
+        rows = [
+            {"customer": customer.id, "status": status, "items": [
+                {"sku": f"SKU-{n % 3}", "quantity": n % 4 + 1, "unit_price_cents": 100 + n},
+            ]}
+            for n, (customer, status) in enumerate(
+                [(self.alice, "paid"), (self.bob, "paid"), (self.alice, "draft"), (self.bob, "cancelled")] * 3
+            )
+        ]
+        self.ingest(ndjson(*rows), batch_size=5)
+
+        for customer in (self.alice, self.bob):
+            row = CustomerSpendRollup.objects.get(customer=customer)
+            expected = paid_order_totals([customer.id]).get()
+            self.assertEqual((row.order_count, row.total_cents), (expected["order_count"], expected["total_cents"]))
+        self.assertEqual(stored_rollup(), expected_rollup())
+        today = timezone.localdate()
+        for status in ("paid", "draft", "cancelled"):
+            orders = Order.objects.filter(status=status)
+            stats = DailyOrderStats.objects.get(day=today, status=status)
+            self.assertEqual(
+                (stats.order_count, stats.total_cents),
+                (orders.count(), sum(orders.values_list("total_cents", flat=True))),
+            )
+
+    def test_queries_scale_with_batches_not_rows(self):
+        def run(count):
+            body = ndjson(*[
+                {"customer": self.alice.id, "status": "paid", "items": [
+                    {"sku": "A", "quantity": 1, "unit_price_cents": 100},
+                    {"sku": "B", "quantity": 2, "unit_price_cents": 50},
+                ]}
+                for _ in range(count)
+            ])
+            with CaptureQueriesContext(connection) as queries:
+                response = self.ingest(body, batch_size=50)
+            self.assertEqual(response.data["created"], count)
+            return len(queries)
+
+        run(1)  # first sale of each SKU / first order of the day creates derived rows
+        self.assertEqual(run(10), run(50))
+        self.assertEqual(OrderItem.objects.count(), 122)
@@ -0,0 +1,104 @@
+import json
+from unittest import mock
+
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase, override_settings
+from rest_framework.test import APIClient
+
+from orders import search
+from orders.models import Customer, Order
+from orders.seeding import seed_orders
+from regression_lab.instrumentation import QueryBudgetExceeded, QueryRecorder, fingerprint
+
+
+@override_settings(QUERY_BUDGET_RAISE=True)
+class QueryInstrumentationTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        seed_orders(10, 4, 3, seed=1)
+        cls.customer = Customer.objects.order_by("id").first()
+        cls.order = Order.objects.order_by("id").first()
+
+    def setUp(self):
+        cache.clear()  # list counts are cached across requests
+        self.client = APIClient()
+
+    def test_server_timing_header(self):
+        res = self.client.get("/api/orders/")
+        header = res["Server-Timing"]
+        self.assertIn("db;dur=", header)
+        self.assertIn('desc="4 queries, 0 duplicated"', header)
+        self.assertIn("total;dur=", header)
+
+    def test_structured_log_line_reports_duplicates(self):
+        with self.assertLogs("regression_lab.perf", level="INFO") as logs:
+            self.client.get("/api/customers/")
+        record = json.loads(logs.records[0].getMessage())
+        self.assertEqual(record["view"], "customers-list")
+        self.assertEqual(record["status"], 200)
+        self.assertEqual(record["queries"], 1)  # a single page needs no COUNT
+        self.assertEqual(record["duplicates"], [])
+
+    def test_hot_views_stay_within_budget(self):
+        urls = [
+            "/api/orders/summary/?limit=50",
+            "/api/orders/",
+            "/api/orders/?status=paid&email=user",
+            f"/api/orders/{self.order.id}/",
+            "/api/customers/",
+            f"/api/customers/{self.customer.id}/",
+            "/api/items/",
+        ]
+        for url in urls:
+            self.assertEqual(self.client.get(url).status_code, 200, url)
+        self.assertEqual(self.client.post(f"/api/orders/{self.order.id}/cancel/").status_code, 200)
+        self.assertEqual(self.client.post(f"/api/orders/{self.order.id}/archive/").status_code, 200)
+
+    def test_writes_are_not_held_to_read_budgets(self):
+        order = Order.objects.filter(customer=self.customer).order_by("id").last()
+        res = self.client.post("/api/items/", {"order": order.id, "sku": "X", "quantity": 2}, format="json")
+        self.assertEqual(res.status_code, 201)
+        res = self.client.patch(f"/api/orders/{order.id}/", {"status": "paid"}, format="json")
+        self.assertEqual(res.status_code, 200)
+        res = self.client.post("/api/customers/", {"name": "New", "email": "new@example.com"}, format="json")
+        self.assertEqual(res.status_code, 201)
+        self.assertEqual(self.client.delete(f"/api/customers/{res.json()['id']}/").status_code, 204)
+
+    def test_cold_email_filter_stays_within_budget(self):
+        with mock.patch.dict(search._fts_available, clear=True):
+            self.assertEqual(self.client.get("/api/orders/?email=user").status_code, 200)
+            self.assertEqual(self.client.get("/api/async/orders/?email=user").status_code, 200)
+
+    @override_settings(QUERY_BUDGETS={"GET orders-list": 1})
+    def test_exceeding_budget_fails(self):
+        with self.assertRaises(QueryBudgetExceeded):
+            self.client.get("/api/orders/")
+
+    @override_settings(QUERY_BUDGETS={"GET orders-list": 1}, QUERY_BUDGET_RAISE=False)
+    def test_exceeding_budget_only_warns_when_not_strict(self):
+        with self.assertLogs("regression_lab.perf", level="WARNING") as logs:
+            res = self.client.get("/api/orders/")
+        self.assertEqual(res.status_code, 200)
+        self.assertIn("query budget exceeded", logs.output[-1])
+
+    def test_fingerprint_collapses_in_lists(self):
+        self.assertEqual(
+            fingerprint("SELECT 1 WHERE id IN (%s, %s, %s)"),
+            fingerprint("SELECT 1 WHERE id IN (%s, %s)"),
+        )
+
+
+class QueryRecorderTests(TestCase):
+    def test_repeated_queries_are_reported_as_duplicates(self):
+        customer = Customer.objects.create(name="Alice", email="alice@example.com")
+        recorder = QueryRecorder()
+        with connection.execute_wrapper(recorder):
+            for _ in range(3):
+                Customer.objects.get(id=customer.id)
+            Order.objects.count()
+
+        self.assertEqual(recorder.count, 4)
+        (duplicate,) = recorder.duplicates()
+        self.assertEqual(duplicate["count"], 3)
+        self.assertIn("orders_customer", duplicate["fingerprint"])
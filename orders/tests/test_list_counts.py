@@ -0,0 +1,75 @@
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from orders.models import Customer, Order
+from orders.seeding import seed_orders
+
+
+class ListCountCacheTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        seed_orders(10, 3, 1, seed=2)
+        cls.customer = Customer.objects.order_by("id").first()
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+
+    def count_queries(self, url):
+        with CaptureQueriesContext(connection) as queries:
+            payload = self.client.get(url).json()
+        return payload, [q for q in queries if "COUNT(" in q["sql"]]
+
+    def test_repeat_pages_reuse_the_count(self):
+        payload, counts = self.count_queries("/api/orders/")
+        self.assertEqual((payload["count"], payload["count_exact"], len(counts)), (30, False, 1))
+
+        payload, counts = self.count_queries("/api/orders/?page=2")
+        self.assertEqual((payload["count"], len(counts)), (30, 0))
+
+        # A page with no next one gives the exact total without a COUNT.
+        payload, counts = self.count_queries("/api/orders/?status=paid")
+        self.assertEqual(payload["count"], Order.objects.filter(status="paid").count())
+        self.assertEqual((payload["count_exact"], len(counts)), (True, 0))
+
+    def test_cached_count_may_lag_but_exact_does_not(self):
+        self.client.get("/api/orders/")
+        Order.objects.create(customer=self.customer)
+
+        self.assertEqual(self.client.get("/api/orders/").json()["count"], 30)
+        payload, counts = self.count_queries("/api/orders/?count=exact")
+        self.assertEqual((payload["count"], payload["count_exact"], len(counts)), (31, True, 1))
+        self.assertEqual(self.client.get("/api/async/orders/?count=exact").json()["count"], 31)
+
+    def test_customers_and_async_list_share_the_mechanism(self):
+        payload, counts = self.count_queries("/api/customers/")
+        self.assertEqual((payload["count"], payload["count_exact"], len(counts)), (10, True, 0))
+
+        self.client.get("/api/orders/")
+        payload, counts = self.count_queries("/api/async/orders/")
+        self.assertEqual((payload["count"], payload["count_exact"], len(counts)), (30, False, 0))
+
+    def test_stale_count_never_hides_pages(self):
+        for url in ("/api/orders/", "/api/async/orders/"):
+            cache.clear()
+            Order.objects.filter(id__gt=Order.objects.order_by("id")[29].id).delete()
+            self.assertEqual(self.client.get(url).json()["count"], 30)  # cached
+            for _ in range(13):
+                Order.objects.create(customer=self.customer)
+
+            page = self.client.get(f"{url}?page=2").json()
+            self.assertIsNotNone(page["next"], url)
+            self.assertEqual((page["count"], page["count_exact"]), (43, True))  # recounted
+            page = self.client.get(f"{url}?page=3").json()
+            self.assertEqual((len(page["results"]), page["next"], page["count"]), (3, None, 43))
+            self.assertEqual(self.client.get(f"{url}?page=4").status_code, 404)
+
+    def test_stale_high_count_is_corrected_on_the_last_page(self):
+        self.client.get("/api/orders/")
+        Order.objects.filter(id__in=Order.objects.order_by("-id").values("id")[:5]).delete()
+        page = self.client.get("/api/orders/?page=2").json()
+        self.assertEqual((len(page["results"]), page["next"], page["count"]), (5, None, 25))
+        self.assertEqual(self.client.get("/api/orders/").json()["count"], 25)
@@ -0,0 +1,67 @@
+import csv
+import io
+import json
+
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from orders.exports import iter_ndjson
+from orders.models import Customer, Order, OrderItem
+from orders.serializers import OrderSerializer
+
+
+class OrderExportTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.alice = Customer.objects.create(name="Alice", email="alice@example.com")
+        self.bob = Customer.objects.create(name="Bob", email="bob@example.com")
+        self.paid = Order.objects.create(customer=self.alice, status=Order.Status.PAID)
+        OrderItem.objects.create(order=self.paid, sku="SKU-1", quantity=2, unit_price_cents=500)
+        OrderItem.objects.create(order=self.paid, sku="SKU-2", quantity=1, unit_price_cents=250)
+        self.draft = Order.objects.create(customer=self.bob, status=Order.Status.DRAFT)
+        Order.objects.create(customer=self.bob, status=Order.Status.PAID, is_archived=True)
+
+    def content(self, res):
+        return b"".join(res.streaming_content).decode()
+
+    def test_ndjson_matches_serializer_and_skips_archived(self):
+        res = self.client.get("/api/orders/export/?format=ndjson")
+        self.assertEqual(res.status_code, 200)
+        self.assertEqual(res["Content-Type"], "application/x-ndjson")
+
+        rows = [json.loads(line) for line in self.content(res).splitlines()]
+        expected = OrderSerializer(
+            Order.objects.filter(is_archived=False).order_by("-id"), many=True
+        ).data
+        self.assertEqual(rows, json.loads(json.dumps(expected)))
+
+    def test_csv_has_one_line_per_item(self):
+        res = self.client.get("/api/orders/export/?format=csv")
+        self.assertEqual(res.status_code, 200)
+        lines = list(csv.DictReader(io.StringIO(self.content(res))))
+
+        self.assertEqual([line["id"] for line in lines], [str(self.draft.id), str(self.paid.id), str(self.paid.id)])
+        self.assertEqual(lines[0]["sku"], "")
+        self.assertEqual({line["sku"] for line in lines[1:]}, {"SKU-1", "SKU-2"})
+        self.assertEqual(lines[1]["customer_email"], "alice@example.com")
+
+    def test_export_uses_list_filters(self):
+        res = self.client.get("/api/orders/export/?status=paid&email=alice")
+        rows = [json.loads(line) for line in self.content(res).splitlines()]
+        self.assertEqual([row["id"] for row in rows], [self.paid.id])
+
+        res = self.client.get("/api/orders/export/?status=bogus")
+        self.assertEqual(res.status_code, 400)
+
+    def test_queries_grow_with_chunks_not_rows(self):
+        for _ in range(20):
+            order = Order.objects.create(customer=self.alice, status=Order.Status.PAID)
+            OrderItem.objects.create(order=order, sku="SKU-3", quantity=1, unit_price_cents=100)
+
+        with CaptureQueriesContext(connection) as queries:
+            lines = list(iter_ndjson(Order.objects.order_by("-id"), chunk_size=10))
+        self.assertEqual(len(lines), 23)
+        # One id scan, then per chunk one orders+customer query and one items query.
+        self.assertLessEqual(len(queries), 7)
@@ -0,0 +1,146 @@
+import datetime
+from io import StringIO
+from unittest import mock
+
+from django.core.management import CommandError, call_command
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from orders.models import Customer, DailyOrderStats, Order, OrderItem
+from orders.seeding import seed_orders
+from orders.transitions import bulk_transition
+
+
+def at(day):
+    return timezone.make_aware(datetime.datetime.combine(day, datetime.time(12)))
+
+
+class DailyOrderStatsTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.alice = Customer.objects.create(name="Alice", email="alice@example.com")
+        self.today = timezone.localdate()
+
+    def stats(self, status=None, day=None):
+        rows = DailyOrderStats.objects.filter(day=day or self.today)
+        if status:
+            rows = rows.filter(status=status)
+        return {row.status: (row.order_count, row.total_cents) for row in rows if row.order_count or row.total_cents}
+
+    def expected(self, day=None):
+        day = day or self.today
+        rows = {}
+        for order in Order.objects.all():
+            if timezone.localtime(order.created_at).date() == day:
+                count, total = rows.get(order.status, (0, 0))
+                rows[order.status] = (count + 1, total + order.total_cents)
+        return rows
+
+    def test_create_status_change_total_change_and_delete(self):
+        order = Order.objects.create(customer=self.alice, status=Order.Status.DRAFT)
+        self.assertEqual(self.stats(), {"draft": (1, 0)})
+
+        OrderItem.objects.create(order=order, sku="SKU-1", quantity=2, unit_price_cents=500)
+        self.assertEqual(self.stats(), {"draft": (1, 1000)})
+
+        self.client.post(f"/api/orders/{order.id}/cancel/")
+        self.assertEqual(self.stats(), {"cancelled": (1, 1000)})
+
+        Order.objects.get(id=order.id).delete()
+        self.assertEqual(self.stats(), {})
+
+    def test_stale_copies_do_not_apply_a_change_twice(self):
+        order = Order.objects.create(customer=self.alice, status=Order.Status.PAID, total_cents=100)
+        copies = [Order.objects.get(id=order.id) for _ in range(3)]
+        for copy in copies[:2]:
+            copy.status = Order.Status.CANCELLED
+            copy.save(update_fields=["status", "updated_at"])
+        self.assertEqual(self.stats(), {"cancelled": (1, 100)})
+
+        # No usable baseline left (every compare-and-set lost): the day is recomputed.
+        with mock.patch.object(Order, "SAVE_ATTEMPTS", 0):
+            copies[2].status = Order.Status.SHIPPED
+            copies[2].save()
+        self.assertEqual(self.stats(), {"shipped": (1, 100)})
+
+    def test_archived_orders_still_count(self):
+        order = Order.objects.create(customer=self.alice, status=Order.Status.PAID, total_cents=700)
+        self.client.post(f"/api/orders/{order.id}/archive/")
+        self.assertEqual(self.stats(), {"paid": (1, 700)})
+
+    def test_bulk_paths(self):
+        seed_orders(5, 4, 2, seed=7)
+        self.assertEqual(self.stats(), self.expected())
+
+        drafts = list(Order.objects.filter(status=Order.Status.DRAFT).values_list("id", flat=True))
+        bulk_transition(drafts, "paid")
+        self.assertEqual(self.stats(), self.expected())
+
+        Customer.objects.filter(email="user2@example.com").delete()
+        self.assertEqual(self.stats(), self.expected())
+
+    def test_backfill_command(self):
+        order = Order.objects.create(customer=self.alice, status=Order.Status.PAID, total_cents=300)
+        old_day = self.today - datetime.timedelta(days=40)
+        Order.objects.filter(id=order.id).update(created_at=at(old_day))
+        DailyOrderStats.objects.all().delete()
+        DailyOrderStats.objects.create(day=self.today - datetime.timedelta(days=3), status="paid", order_count=9)
+
+        out = StringIO()
+        call_command("backfill_order_stats", "--batch-days", "7", stdout=out)
+        self.assertIn("Wrote 1", out.getvalue())
+        self.assertEqual(
+            list(DailyOrderStats.objects.values_list("day", "status", "order_count", "total_cents")),
+            [(old_day, "paid", 1, 300)],
+        )
+        with self.assertRaises(CommandError):
+            call_command("backfill_order_stats", "--from", "2026-02-30")
+
+
+class OrderStatsEndpointTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        alice = Customer.objects.create(name="Alice", email="alice@example.com")
+        # Mon 2026-03-30, Tue 2026-03-31, Wed 2026-04-01
+        for day, status, total in [
+            (datetime.date(2026, 3, 30), Order.Status.PAID, 100),
+            (datetime.date(2026, 3, 30), Order.Status.DRAFT, 50),
+            (datetime.date(2026, 3, 31), Order.Status.PAID, 200),
+            (datetime.date(2026, 4, 1), Order.Status.PAID, 400),
+        ]:
+            order = Order.objects.create(customer=alice, status=status, total_cents=total)
+            Order.objects.filter(id=order.id).update(created_at=at(day))
+        call_command("backfill_order_stats", stdout=StringIO())
+
+    def get(self, query):
+        return self.client.get(f"/api/orders/stats/?from=2026-03-01&to=2026-04-30&{query}")
+
+    def test_daily_buckets_with_status_breakdown(self):
+        with CaptureQueriesContext(connection) as queries:
+            res = self.get("granularity=day")
+        self.assertEqual(len(queries), 1)
+        buckets = res.json()["buckets"]
+        self.assertEqual([b["period"] for b in buckets], ["2026-03-30", "2026-03-31", "2026-04-01"])
+        self.assertEqual(buckets[0]["order_count"], 2)
+        self.assertEqual(buckets[0]["total_cents"], 150)
+        self.assertEqual(buckets[0]["by_status"]["draft"], {"order_count": 1, "total_cents": 50})
+
+    def test_week_and_month_rollup(self):
+        weeks = self.get("granularity=week").json()["buckets"]
+        self.assertEqual([(b["period"], b["total_cents"]) for b in weeks], [("2026-03-30", 750)])
+
+        months = self.get("granularity=month&status=paid").json()["buckets"]
+        self.assertEqual([(b["period"], b["order_count"], b["total_cents"]) for b in months], [
+            ("2026-03-01", 2, 300), ("2026-04-01", 1, 400),
+        ])
+
+    def test_validation(self):
+        self.assertEqual(self.client.get("/api/orders/stats/?granularity=year").status_code, 400)
+        self.assertEqual(self.client.get("/api/orders/stats/?from=2026-05-01&to=2026-04-01").status_code, 400)
+        self.assertEqual(self.client.get("/api/orders/stats/?from=nope").status_code, 400)
+        res = self.client.get("/api/orders/stats/")
+        self.assertEqual(res.status_code, 200)
+        self.assertEqual(res.json()["to"], timezone.localdate().isoformat())
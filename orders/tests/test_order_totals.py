@@ -0,0 +1,83 @@
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from orders.models import Customer, CustomerSpendRollup, Order, OrderItem
+from orders.totals import batch_total_updates, recompute_order_totals
+
+
+class OrderTotalTests(TestCase):
+    def setUp(self):
+        self.customer = Customer.objects.create(name="Alice", email="alice@example.com")
+        self.order = Order.objects.create(customer=self.customer, status=Order.Status.PAID)
+
+    def total(self, order):
+        return Order.objects.values_list("total_cents", flat=True).get(id=order.id)
+
+    def test_item_create_update_and_delete_keep_total_in_sync(self):
+        item = OrderItem.objects.create(order=self.order, sku="SKU-1", quantity=2, unit_price_cents=500)
+        OrderItem.objects.create(order=self.order, sku="SKU-2", quantity=1, unit_price_cents=300)
+        self.assertEqual(self.total(self.order), 1300)
+
+        item.quantity = 3
+        item.save()
+        self.assertEqual(self.total(self.order), 1800)
+
+        item.delete()
+        self.assertEqual(self.total(self.order), 300)
+
+    def test_item_write_cost_does_not_grow_with_item_count(self):
+        def queries_for_one_item():
+            with CaptureQueriesContext(connection) as queries:
+                OrderItem.objects.create(order=self.order, sku="SKU", quantity=1, unit_price_cents=100)
+            return len(queries)
+
+        queries_for_one_item()  # the first sale of a SKU also creates its rollup row
+        first = queries_for_one_item()
+        OrderItem.objects.bulk_create(
+            [OrderItem(order=self.order, sku="SKU", quantity=1, unit_price_cents=100) for _ in range(50)]
+        )
+        self.assertEqual(queries_for_one_item(), first)
+
+    def test_moving_item_updates_both_orders(self):
+        other = Order.objects.create(customer=self.customer, status=Order.Status.DRAFT)
+        item = OrderItem.objects.create(order=self.order, sku="SKU-1", quantity=1, unit_price_cents=700)
+
+        item = OrderItem.objects.get(id=item.id)
+        item.order = other
+        item.save()
+
+        self.assertEqual(self.total(self.order), 0)
+        self.assertEqual(self.total(other), 700)
+
+    def test_recompute_order_totals_repairs_bulk_inserted_items_and_rollup(self):
+        other = Order.objects.create(customer=self.customer, status=Order.Status.PAID)
+        OrderItem.objects.bulk_create([
+            OrderItem(order=self.order, sku="SKU-1", quantity=2, unit_price_cents=250),
+            OrderItem(order=other, sku="SKU-2", quantity=1, unit_price_cents=100),
+        ])
+
+        self.assertEqual(recompute_order_totals([self.order.id, other.id]), 2)
+        self.assertEqual(self.total(self.order), 500)
+        self.assertEqual(self.total(other), 100)
+        self.assertEqual(CustomerSpendRollup.objects.get(customer=self.customer).total_cents, 600)
+
+    def test_batch_total_updates_recomputes_once_at_exit(self):
+        with CaptureQueriesContext(connection) as queries:
+            with batch_total_updates():
+                for _ in range(5):
+                    OrderItem.objects.create(order=self.order, sku="SKU", quantity=1, unit_price_cents=100)
+                self.assertEqual(self.total(self.order), 0)
+
+        self.assertEqual(self.total(self.order), 500)
+        updates = [q for q in queries if q["sql"].startswith('UPDATE "orders_order"')]
+        self.assertEqual(len(updates), 1)
+
+    def test_deleting_order_skips_per_item_recompute(self):
+        OrderItem.objects.bulk_create(
+            [OrderItem(order=self.order, sku="SKU", quantity=1, unit_price_cents=100) for _ in range(20)]
+        )
+        with CaptureQueriesContext(connection) as queries:
+            self.order.delete()
+        updates = [q for q in queries if q["sql"].startswith('UPDATE "orders_order"')]
+        self.assertEqual(updates, [])
@@ -0,0 +1,145 @@
+import datetime
+import threading
+from io import StringIO
+from unittest import mock
+
+from django.core.management import call_command
+from django.db import transaction
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from orders import outbox
+from orders.models import Customer, Order, OutboxEvent
+from orders.transitions import bulk_transition
+
+delivered = []
+failures = {"left": 0}
+
+
+def record(event):
+    delivered.append((event.idempotency_key, event.payload["changes"]))
+
+
+def flaky(event):
+    if failures["left"]:
+        failures["left"] -= 1
+        raise RuntimeError("downstream unavailable")
+    record(event)
+
+
+@override_settings(OUTBOX_HANDLERS={outbox.STATUS_CHANGED: ["orders.tests.test_outbox.record"]})
+class OutboxTests(TestCase):
+    def setUp(self):
+        delivered.clear()
+        failures["left"] = 0
+        self.client = APIClient()
+        self.alice = Customer.objects.create(name="Alice", email="alice@example.com")
+        self.order = Order.objects.create(customer=self.alice, status=Order.Status.PAID)
+
+    def events(self):
+        return list(OutboxEvent.objects.order_by("id").values_list("order_id", "payload__changes", "status"))
+
+    def test_status_changes_write_one_event_each(self):
+        self.assertEqual(self.events(), [])  # creating an order is not a change
+        self.order.total_cents = 500
+        self.order.save()
+        self.assertEqual(self.events(), [])
+
+        self.client.post(f"/api/orders/{self.order.id}/cancel/")
+        self.client.post(f"/api/orders/{self.order.id}/archive/")
+        self.assertEqual(self.events(), [
+            (self.order.id, {"status": ["paid", "cancelled"]}, "pending"),
+            (self.order.id, {"is_archived": [False, True]}, "pending"),
+        ])
+
+    def test_event_rolls_back_with_the_change(self):
+        with self.assertRaises(RuntimeError), transaction.atomic():
+            self.order.status = Order.Status.CANCELLED
+            self.order.save()
+            raise RuntimeError
+        self.assertEqual(self.events(), [])
+
+    def test_bulk_transition_writes_events(self):
+        other = Order.objects.create(customer=self.alice, status=Order.Status.DRAFT)
+        bulk_transition([self.order.id, other.id], "cancelled")
+        self.assertEqual(sorted(self.events()), [
+            (self.order.id, {"status": ["paid", "cancelled"]}, "pending"),
+            (other.id, {"status": ["draft", "cancelled"]}, "pending"),
+        ])
+
+    def test_drain_delivers_each_event_once(self):
+        for status in (Order.Status.CANCELLED, Order.Status.DRAFT):
+            self.order.status = status
+            self.order.save()
+
+        totals = outbox.drain(batch_size=1, workers=2)
+
+        self.assertEqual(totals, {"done": 2, "retried": 0, "failed": 0})
+        self.assertEqual([changes for _, changes in delivered], [
+            {"status": ["paid", "cancelled"]}, {"status": ["cancelled", "draft"]},
+        ])
+        self.assertEqual(len({key for key, _ in delivered}), 2)
+        self.assertEqual(outbox.drain(), {"done": 0, "retried": 0, "failed": 0})
+        self.assertEqual(OutboxEvent.objects.filter(status="done", processed_at__isnull=False).count(), 2)
+
+    def test_drain_closes_each_pool_threads_connections(self):
+        closed_on = set()
+
+        def close_all():
+            closed_on.add(threading.get_ident())
+
+        with mock.patch.object(outbox.connections, "close_all", side_effect=close_all):
+            outbox.drain(workers=3)
+        self.assertEqual(len(closed_on), 3)
+        self.assertNotIn(threading.get_ident(), closed_on)
+
+    @override_settings(OUTBOX_HANDLERS={outbox.STATUS_CHANGED: ["orders.tests.test_outbox.flaky"]})
+    def test_failures_are_retried_with_backoff_then_given_up(self):
+        failures["left"] = 1
+        self.order.status = Order.Status.CANCELLED
+        self.order.save()
+
+        with self.assertLogs("orders.outbox", "WARNING"):
+            self.assertEqual(outbox.drain(), {"done": 0, "retried": 1, "failed": 0})
+        event = OutboxEvent.objects.get()
+        self.assertEqual((event.status, event.attempts), ("pending", 1))
+        self.assertIn("downstream unavailable", event.last_error)
+        self.assertGreater(event.available_at, timezone.now())
+        self.assertEqual(outbox.drain(), {"done": 0, "retried": 0, "failed": 0})  # not due yet
+
+        OutboxEvent.objects.update(available_at=timezone.now())
+        self.assertEqual(outbox.drain(), {"done": 1, "retried": 0, "failed": 0})
+        self.assertEqual(len(delivered), 1)
+
+        failures["left"] = 10
+        self.order.status = Order.Status.DRAFT
+        self.order.save()
+        with self.assertLogs("orders.outbox", "WARNING"):
+            outbox.drain(max_attempts=1)
+        self.assertEqual(OutboxEvent.objects.get(status="failed").attempts, 1)
+
+    def test_expired_claims_are_reclaimed(self):
+        self.order.status = Order.Status.CANCELLED
+        self.order.save()
+        token, events = outbox.claim()
+        self.assertEqual(len(events), 1)
+        self.assertEqual(outbox.claim(), ("", []))  # leased to the first drainer
+
+        OutboxEvent.objects.update(available_at=timezone.now() - datetime.timedelta(seconds=1))
+        self.assertEqual(outbox.drain(), {"done": 1, "retried": 0, "failed": 0})
+        self.assertEqual(OutboxEvent.objects.get().attempts, 2)
+
+    def test_recording_is_idempotent(self):
+        changes = {"status": ("paid", "cancelled")}
+        outbox.record_order_change(self.order, changes)
+        outbox.record_order_change(self.order, changes)
+        self.assertEqual(OutboxEvent.objects.count(), 1)
+
+    def test_command(self):
+        self.order.status = Order.Status.CANCELLED
+        self.order.save()
+        out = StringIO()
+        call_command("drain_outbox", "--workers", "1", stdout=out)
+        self.assertIn("Delivered 1 event(s)", out.getvalue())
+        self.assertEqual(len(delivered), 1)
@@ -0,0 +1,91 @@
+import datetime
+import re
+from unittest import skipUnless
+
+from django.db import connection
+from django.test import TestCase
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from orders.models import Customer, DailyOrderStats, Order, OrderItem
+from orders.rollups import paid_order_totals, top_customers
+from orders.search import email_prefix_q, fts_enabled
+from orders.sku_sales import top_skus
+from orders.stats import _days_q
+from orders.views import OrderViewSet
+
+# "SCAN <table>" without "USING [COVERING] INDEX" is a full table scan.
+FULL_SCAN = re.compile(r"^SCAN (TABLE )?\w+$")
+
+
+@skipUnless(connection.vendor == "sqlite", "EXPLAIN QUERY PLAN output is SQLite-specific")
+class QueryPlanTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.customer = Customer.objects.create(name="Alice", email="alice@example.com")
+        Order.objects.create(customer=cls.customer, status=Order.Status.PAID, total_cents=500)
+
+    def plan(self, queryset):
+        sql, params = queryset.query.sql_with_params()
+        with connection.cursor() as cursor:
+            cursor.execute("EXPLAIN QUERY PLAN " + sql, params)
+            return [row[-1] for row in cursor.fetchall()]
+
+    def assertUsesIndexes(self, queryset, allow_sort=False):
+        plan = self.plan(queryset)
+        scans = [detail for detail in plan if FULL_SCAN.match(detail)]
+        self.assertEqual(scans, [], f"full table scan in plan: {plan}")
+        if not allow_sort:
+            sorts = [detail for detail in plan if "TEMP B-TREE" in detail]
+            self.assertEqual(sorts, [], f"sort not served by an index: {plan}")
+        return plan
+
+    def order_list_queryset(self, query_string=""):
+        view = OrderViewSet(action="list", format_kwarg=None)
+        view.request = Request(APIRequestFactory().get(f"/api/orders/{query_string}"))
+        return view.get_queryset()[:20]
+
+    def test_summary_reads_rollup_index(self):
+        plan = self.assertUsesIndexes(top_customers(50))
+        self.assertTrue(any("rollup_total_desc_idx" in detail for detail in plan), plan)
+
+    def test_rollup_aggregate_uses_partial_paid_index(self):
+        plan = self.assertUsesIndexes(paid_order_totals([self.customer.id]), allow_sort=True)
+        self.assertTrue(any("order_paid_live_cust_idx" in detail for detail in plan), plan)
+
+    def test_order_list(self):
+        self.assertUsesIndexes(self.order_list_queryset())
+
+    def test_order_list_filtered_by_status(self):
+        plan = self.assertUsesIndexes(self.order_list_queryset("?status=paid"))
+        self.assertTrue(any("order_live_status_id_idx" in detail for detail in plan), plan)
+
+    def test_order_list_filtered_by_email(self):
+        if not fts_enabled():
+            self.skipTest("SQLite FTS5 trigram tokenizer not available")
+        self.assertUsesIndexes(self.order_list_queryset("?email=alice"), allow_sort=True)
+
+    def test_customer_email_prefix(self):
+        plan = self.assertUsesIndexes(Customer.objects.filter(email_prefix_q("ali")), allow_sort=True)
+        self.assertTrue(any("email_lower" in detail for detail in plan), plan)
+
+    def test_order_list_by_created_at_keyset(self):
+        queryset = Order.objects.order_by("-created_at", "-id")[:20]
+        self.assertUsesIndexes(queryset)
+
+    def test_customer_orders(self):
+        self.assertUsesIndexes(Order.objects.filter(customer_id=self.customer.id).order_by("-id")[:20])
+        self.assertUsesIndexes(
+            Order.objects.filter(customer_id=self.customer.id, status=Order.Status.PAID).order_by("-id")[:20]
+        )
+
+    def test_daily_stats_range_and_refresh(self):
+        today = datetime.date.today()
+        self.assertUsesIndexes(DailyOrderStats.objects.filter(day__range=(today, today)).order_by("day"))
+        self.assertUsesIndexes(Order.objects.filter(_days_q([today])), allow_sort=True)
+
+    def test_top_skus_and_sku_refresh(self):
+        plan = self.assertUsesIndexes(top_skus(20))
+        self.assertTrue(any("sku_rollup_revenue_idx" in detail for detail in plan), plan)
+        plan = self.assertUsesIndexes(OrderItem.objects.filter(sku__in=["SKU-1", "SKU-2"]), allow_sort=True)
+        self.assertTrue(any("item_sku_order_idx" in detail for detail in plan), plan)
@@ -0,0 +1,151 @@
+from io import StringIO
+
+from django.core.management import call_command
+from django.db import connection
+from django.db.models import Count, F, Sum
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from orders.models import Customer, Order, OrderItem, SkuSalesRollup
+from orders.seeding import seed_orders
+from orders.transitions import bulk_transition
+
+
+def expected_rollup():
+    return {
+        row["sku"]: (row["units"], row["revenue_cents"], row["order_count"])
+        for row in OrderItem.objects.filter(order__status=Order.Status.PAID)
+        .values("sku")
+        .annotate(
+            units=Sum("quantity"),
+            revenue_cents=Sum(F("quantity") * F("unit_price_cents")),
+            order_count=Count("order_id", distinct=True),
+        )
+    }
+
+
+def stored_rollup():
+    return {
+        sku: (units, revenue, orders)
+        for sku, units, revenue, orders in SkuSalesRollup.objects.values_list(
+            "sku", "units", "revenue_cents", "order_count"
+        )
+        if orders or units or revenue
+    }
+
+
+class SkuSalesRollupTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.alice = Customer.objects.create(name="Alice", email="alice@example.com")
+        self.paid = Order.objects.create(customer=self.alice, status=Order.Status.PAID)
+        self.draft = Order.objects.create(customer=self.alice, status=Order.Status.DRAFT)
+
+    def test_item_writes_on_paid_orders(self):
+        first = OrderItem.objects.create(order=self.paid, sku="A", quantity=2, unit_price_cents=100)
+        OrderItem.objects.create(order=self.paid, sku="A", quantity=1, unit_price_cents=100)
+        OrderItem.objects.create(order=self.draft, sku="A", quantity=9, unit_price_cents=100)
+        self.assertEqual(stored_rollup(), {"A": (3, 300, 1)})
+
+        first = OrderItem.objects.get(id=first.id)
+        first.sku = "B"
+        first.quantity = 4
+        first.save()
+        self.assertEqual(stored_rollup(), {"A": (1, 100, 1), "B": (4, 400, 1)})
+
+        first.order = self.draft
+        first.save()
+        self.assertEqual(stored_rollup(), {"A": (1, 100, 1)})
+
+        self.client.delete(f"/api/items/{OrderItem.objects.get(order=self.paid).id}/")
+        self.assertEqual(stored_rollup(), {})
+
+    def test_status_changes_and_order_delete(self):
+        OrderItem.objects.create(order=self.draft, sku="A", quantity=2, unit_price_cents=100)
+        OrderItem.objects.create(order=self.draft, sku="B", quantity=1, unit_price_cents=500)
+        self.assertEqual(stored_rollup(), {})
+
+        draft = Order.objects.get(id=self.draft.id)
+        draft.status = Order.Status.PAID
+        draft.save()
+        self.assertEqual(stored_rollup(), {"A": (2, 200, 1), "B": (1, 500, 1)})
+
+        self.client.post(f"/api/orders/{draft.id}/cancel/")
+        self.assertEqual(stored_rollup(), {})
+
+        bulk_transition([draft.id], "paid")  # cancelled -> paid is invalid: nothing changes
+        Order.objects.filter(id=draft.id).update(status=Order.Status.PAID)
+        call_command("rebuild_sku_rollup", stdout=StringIO())
+        self.assertEqual(stored_rollup(), {"A": (2, 200, 1), "B": (1, 500, 1)})
+
+        Order.objects.get(id=draft.id).delete()
+        self.assertEqual(stored_rollup(), {})
+
+    def test_cancel_is_set_based_whatever_the_number_of_skus(self):
+        other = Order.objects.create(customer=self.alice, status=Order.Status.PAID)
+        OrderItem.objects.create(order=other, sku="A", quantity=1, unit_price_cents=100)
+        queries = []
+        for skus in (["A"], ["A", "A", "B", "C", "D"]):
+            order = Order.objects.create(customer=self.alice, status=Order.Status.PAID)
+            for sku in skus:
+                OrderItem.objects.create(order=order, sku=sku, quantity=2, unit_price_cents=100)
+            with CaptureQueriesContext(connection) as captured:
+                self.assertEqual(self.client.post(f"/api/orders/{order.id}/cancel/").status_code, 200)
+            queries.append(len(captured))
+            self.assertEqual(stored_rollup(), {"A": (1, 100, 1)})
+        self.assertEqual(queries[0], queries[1])
+
+    def test_queryset_delete_counts_each_order_once(self):
+        OrderItem.objects.create(order=self.paid, sku="A", quantity=1, unit_price_cents=100)
+        OrderItem.objects.create(order=self.paid, sku="A", quantity=2, unit_price_cents=100)
+        other = Order.objects.create(customer=self.alice, status=Order.Status.PAID)
+        OrderItem.objects.create(order=other, sku="A", quantity=1, unit_price_cents=100)
+
+        OrderItem.objects.filter(order=self.paid).delete()
+        self.assertEqual(stored_rollup(), {"A": (1, 100, 1)})
+        self.assertEqual(stored_rollup(), expected_rollup())
+
+    def test_stale_order_copies_do_not_apply_a_change_twice(self):
+        OrderItem.objects.create(order=self.paid, sku="A", quantity=1, unit_price_cents=100)
+        copies = [Order.objects.get(id=self.paid.id) for _ in range(2)]
+        for copy in copies:
+            copy.status = Order.Status.CANCELLED
+            copy.save(update_fields=["status", "updated_at"])
+        self.assertEqual(SkuSalesRollup.objects.values_list("units", "order_count").get(sku="A"), (0, 0))
+
+    def test_bulk_paths_match_source_of_truth(self):
+        seed_orders(20, 3, 3, seed=4)
+        self.assertEqual(stored_rollup(), expected_rollup())
+
+        drafts = list(Order.objects.filter(status=Order.Status.DRAFT).values_list("id", flat=True))
+        bulk_transition(drafts, "paid")
+        self.assertEqual(stored_rollup(), expected_rollup())
+
+        bulk_transition(drafts[:10], "cancelled")
+        Customer.objects.filter(email="user3@example.com").delete()
+        self.assertEqual(stored_rollup(), expected_rollup())
+
+    def test_rebuild_streams_and_drops_stale_rows(self):
+        seed_orders(10, 2, 3, seed=5)
+        SkuSalesRollup.objects.all().delete()
+        SkuSalesRollup.objects.create(sku="GONE", units=5, revenue_cents=5, order_count=1)
+
+        out = StringIO()
+        call_command("rebuild_sku_rollup", "--chunk-size", "7", "--batch-size", "3", stdout=out)
+        self.assertIn("Rebuilt", out.getvalue())
+        self.assertEqual(stored_rollup(), expected_rollup())
+
+    def test_top_skus_endpoint(self):
+        OrderItem.objects.create(order=self.paid, sku="CHEAP", quantity=10, unit_price_cents=10)
+        OrderItem.objects.create(order=self.paid, sku="PRICEY", quantity=1, unit_price_cents=1000)
+        OrderItem.objects.create(order=self.draft, sku="DRAFT-ONLY", quantity=50, unit_price_cents=1000)
+
+        with CaptureQueriesContext(connection) as queries:
+            res = self.client.get("/api/items/top-skus/?limit=5")
+        self.assertEqual(len(queries), 1)
+        self.assertEqual(res.json(), {"limit": 5, "rows": [
+            {"sku": "PRICEY", "units": 1, "revenue_cents": 1000, "order_count": 1},
+            {"sku": "CHEAP", "units": 10, "revenue_cents": 100, "order_count": 1},
+        ]})
+        self.assertEqual(self.client.get("/api/items/top-skus/?limit=x").status_code, 400)
@@ -0,0 +1,142 @@
+from io import StringIO
+
+from django.core.management import CommandError, call_command
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from orders.models import Customer, CustomerSpendRollup, DailyOrderStats, Order, OrderItem, OutboxEvent
+
+
+class SpendRollupTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.alice = Customer.objects.create(name="Alice", email="alice@example.com")
+        self.bob = Customer.objects.create(name="Bob", email="bob@example.com")
+
+    def rollup(self, customer):
+        row = CustomerSpendRollup.objects.get(customer=customer)
+        return row.order_count, row.total_cents
+
+    def test_new_customer_gets_empty_rollup(self):
+        self.assertEqual(self.rollup(self.alice), (0, 0))
+
+    def test_paid_orders_are_added(self):
+        Order.objects.create(customer=self.alice, status=Order.Status.PAID, total_cents=500)
+        Order.objects.create(customer=self.alice, status=Order.Status.PAID, total_cents=700)
+        Order.objects.create(customer=self.alice, status=Order.Status.DRAFT, total_cents=9999)
+        self.assertEqual(self.rollup(self.alice), (2, 1200))
+
+    def test_cancel_and_archive_remove_contribution(self):
+        cancelled = Order.objects.create(customer=self.alice, status=Order.Status.PAID, total_cents=500)
+        archived = Order.objects.create(customer=self.alice, status=Order.Status.PAID, total_cents=700)
+
+        self.client.post(f"/api/orders/{cancelled.id}/cancel/")
+        self.assertEqual(self.rollup(self.alice), (1, 700))
+
+        self.client.post(f"/api/orders/{archived.id}/archive/")
+        self.assertEqual(self.rollup(self.alice), (0, 0))
+
+    def test_total_change_and_status_change_to_paid(self):
+        order = Order.objects.create(customer=self.alice, status=Order.Status.DRAFT)
+        OrderItem.objects.create(order=order, sku="SKU-1", quantity=2, unit_price_cents=500)
+        self.assertEqual(self.rollup(self.alice), (0, 0))
+
+        order = Order.objects.get(id=order.id)
+        order.status = Order.Status.PAID
+        order.save()
+        self.assertEqual(self.rollup(self.alice), (1, 1000))
+
+        OrderItem.objects.create(order=order, sku="SKU-2", quantity=1, unit_price_cents=250)
+        self.assertEqual(self.rollup(self.alice), (1, 1250))
+
+    def test_reassigning_customer_moves_contribution(self):
+        order = Order.objects.create(customer=self.alice, status=Order.Status.PAID, total_cents=500)
+        order.customer = self.bob
+        order.save()
+        self.assertEqual(self.rollup(self.alice), (0, 0))
+        self.assertEqual(self.rollup(self.bob), (1, 500))
+
+    def test_deleting_orders_and_customers(self):
+        order = Order.objects.create(customer=self.alice, status=Order.Status.PAID, total_cents=500)
+        Order.objects.create(customer=self.bob, status=Order.Status.PAID, total_cents=300)
+
+        order.delete()
+        self.assertEqual(self.rollup(self.alice), (0, 0))
+
+        self.bob.delete()
+        self.assertFalse(CustomerSpendRollup.objects.filter(customer_id=self.bob.id).exists())
+
+    def test_missing_row_is_rebuilt_on_next_order_write(self):
+        (carol,) = Customer.objects.bulk_create([Customer(name="Carol", email="carol@example.com")])
+        Order.objects.create(customer=carol, status=Order.Status.PAID, total_cents=400)
+        self.assertEqual(self.rollup(carol), (1, 400))
+
+    def test_summary_reads_rollup_in_one_query(self):
+        Order.objects.create(customer=self.alice, status=Order.Status.PAID, total_cents=500)
+        with CaptureQueriesContext(connection) as queries:
+            res = self.client.get("/api/orders/summary/?limit=10")
+        self.assertEqual(res.status_code, 200)
+        self.assertEqual(len(queries), 1)
+        self.assertNotIn("orders_order", queries[0]["sql"])
+        self.assertEqual(res.json()["rows"][0]["email"], "alice@example.com")
+
+    def test_command_detects_and_repairs_drift(self):
+        Order.objects.create(customer=self.alice, status=Order.Status.PAID, total_cents=500)
+        # Queryset updates bypass signals, so this is exactly the drift the check exists for.
+        Order.objects.filter(customer=self.alice).update(total_cents=800)
+
+        with self.assertRaises(CommandError):
+            call_command("rebuild_spend_rollup", "--check", stdout=StringIO())
+
+        call_command("rebuild_spend_rollup", stdout=StringIO())
+        self.assertEqual(self.rollup(self.alice), (1, 800))
+        call_command("rebuild_spend_rollup", "--check", stdout=StringIO())
+
+    def test_stale_copies_do_not_apply_a_change_twice(self):
+        order = Order.objects.create(customer=self.alice, status=Order.Status.PAID, total_cents=100)
+        first, second = Order.objects.get(id=order.id), Order.objects.get(id=order.id)
+        for copy in (first, second):  # two concurrent cancels of the same paid order
+            copy.status = Order.Status.CANCELLED
+            copy.save(update_fields=["status", "updated_at"])
+        self.assertEqual(self.rollup(self.alice), (0, 0))
+        self.assertEqual(OutboxEvent.objects.filter(order_id=order.id).count(), 1)
+
+        # A stale copy changing something else still starts from what the row holds now.
+        first.total_cents = 300
+        first.status = Order.Status.PAID
+        Order.objects.filter(id=order.id).update(total_cents=200)
+        first.save()
+        self.assertEqual(self.rollup(self.alice), (1, 300))
+
+    def day_counts(self):
+        return dict(DailyOrderStats.objects.filter(order_count__gt=0).values_list("status", "order_count"))
+
+    def test_partial_save_of_a_stale_copy_keeps_the_other_fields_from_the_row(self):
+        order = Order.objects.create(customer=self.alice)
+        stale = Order.objects.get(id=order.id)
+        other = Order.objects.get(id=order.id)  # a second writer pays the order
+        other.status = Order.Status.PAID
+        other.save()
+        self.assertEqual(self.rollup(self.alice), (1, 0))
+
+        stale.total_cents = 999
+        stale.save(update_fields=["total_cents", "updated_at"])
+        self.assertEqual(Order.objects.filter(id=order.id).values_list("status", "total_cents").get(), ("paid", 999))
+        self.assertEqual(self.rollup(self.alice), (1, 999))
+        self.assertEqual(self.day_counts(), {"paid": 1})
+        self.assertEqual(stale.saved_state()["status"], "paid")
+
+    def test_item_writes_through_a_stale_cached_order(self):
+        order = Order.objects.create(customer=self.alice)
+        item = OrderItem.objects.create(order=order, sku="A", quantity=1, unit_price_cents=100)
+        paid = Order.objects.get(id=order.id)
+        paid.status = Order.Status.PAID
+        paid.save()
+        self.assertEqual(self.rollup(self.alice), (1, 100))
+
+        item.quantity = 5  # item.order is the cached, still-draft instance
+        item.save()
+        self.assertEqual(self.rollup(self.alice), (1, 500))
+        self.assertEqual(self.day_counts(), {"paid": 1})
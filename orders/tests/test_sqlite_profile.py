@@ -0,0 +1,41 @@
+import tempfile
+from pathlib import Path
+
+from django.db import connection
+from django.db.backends.sqlite3.base import DatabaseWrapper
+from django.test import SimpleTestCase, override_settings
+
+from regression_lab.sqlite import pragmas
+
+
+class SQLiteProfileTests(SimpleTestCase):
+    def pragma_values(self, profile, *names):
+        # A fresh connection to a file database, so the connection_created hook runs.
+        with tempfile.TemporaryDirectory() as workdir, override_settings(SQLITE_PROFILE=profile):
+            wrapper = DatabaseWrapper({**connection.settings_dict, "NAME": str(Path(workdir) / "db.sqlite3")}, "probe")
+            try:
+                with wrapper.cursor() as cursor:
+                    values = []
+                    for name in names:
+                        cursor.execute(f"PRAGMA {name}")
+                        values.append(cursor.fetchone()[0])
+            finally:
+                wrapper.close()
+        return values
+
+    def test_tuned_profile(self):
+        self.assertEqual(
+            self.pragma_values("tuned", "journal_mode", "synchronous", "busy_timeout", "cache_size"),
+            ["wal", 1, 5000, -65536],
+        )
+
+    def test_stock_profile_leaves_defaults(self):
+        self.assertEqual(self.pragma_values("stock", "journal_mode", "synchronous"), ["delete", 2])
+
+    @override_settings(SQLITE_PROFILE="tuned", SQLITE_PRAGMAS={"mmap_size": 0})
+    def test_overrides_and_unknown_profile(self):
+        self.assertEqual(pragmas()["mmap_size"], 0)
+        self.assertEqual(pragmas()["journal_mode"], "WAL")
+        with override_settings(SQLITE_PROFILE="fast"):
+            with self.assertRaises(ValueError):
+                pragmas()
@@ -0,0 +1,56 @@
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+from django.test import SimpleTestCase
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+
+PROBE = """
+import json, sys
+import django
+django.setup()
+from django.db.models.signals import post_save
+from orders.models import Order
+print(json.dumps({
+    "modules": sorted(sys.modules),
+    "has_order_receivers": post_save.has_listeners(Order),
+}))
+"""
+
+
+def setup_in_fresh_interpreter(settings_module):
+    env = {**os.environ, "DJANGO_SETTINGS_MODULE": settings_module}
+    result = subprocess.run(
+        [sys.executable, "-c", PROBE], cwd=REPO_ROOT, env=env, capture_output=True, text=True, check=True
+    )
+    probe = json.loads(result.stdout)
+    return set(probe["modules"]), probe["has_order_receivers"]
+
+
+class StartupProfileTests(SimpleTestCase):
+    def test_worker_profile_skips_http_only_apps_but_keeps_signals(self):
+        modules, has_receivers = setup_in_fresh_interpreter("regression_lab.settings_worker")
+        for module in ("django.contrib.admin", "django.contrib.sessions", "django.contrib.messages", "rest_framework"):
+            self.assertNotIn(module, modules)
+        self.assertIn("orders.signals", modules)
+        self.assertTrue(has_receivers)
+
+    def test_asgi_entry_point_does_not_keep_connections(self):
+        probe = (
+            "import json; from regression_lab.asgi import application; from django.conf import settings; "
+            "print(json.dumps([settings.DATABASES[alias]['CONN_MAX_AGE'] for alias in ('default', 'replica')]))"
+        )
+        env = {key: value for key, value in os.environ.items() if key != "DB_CONN_MAX_AGE"}
+        result = subprocess.run(
+            [sys.executable, "-c", probe], cwd=REPO_ROOT, env=env, capture_output=True, text=True, check=True
+        )
+        self.assertEqual(json.loads(result.stdout), [0, 0])
+
+    def test_full_profile_setup_does_not_import_drf_serializers(self):
+        # Admin autodiscovery must not drag in DRF (and pygments through it).
+        modules, _ = setup_in_fresh_interpreter("regression_lab.settings")
+        self.assertNotIn("rest_framework.serializers", modules)
+        self.assertNotIn("orders.pagination", modules)
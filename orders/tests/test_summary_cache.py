@@ -0,0 +1,92 @@
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from orders import summary_cache
+from orders.models import Customer, Order
+
+
+class SummaryCacheTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.alice = Customer.objects.create(name="Alice", email="alice@example.com")
+        self.order = Order.objects.create(customer=self.alice, status=Order.Status.PAID, total_cents=500)
+
+    def summary(self, **headers):
+        return self.client.get("/api/orders/summary/?limit=10", **headers)
+
+    def total_for_alice(self):
+        rows = self.summary().json()["rows"]
+        return {row["email"]: row["total_cents"] for row in rows}["alice@example.com"]
+
+    def test_repeat_requests_hit_cache(self):
+        self.summary()
+        with CaptureQueriesContext(connection) as queries:
+            res = self.summary()
+        self.assertEqual(res.status_code, 200)
+        self.assertEqual(len(queries), 0)
+
+    def test_limits_are_cached_separately(self):
+        Customer.objects.create(name="Bob", email="bob@example.com")
+        self.assertEqual(len(self.client.get("/api/orders/summary/?limit=1").json()["rows"]), 1)
+        self.assertEqual(len(self.client.get("/api/orders/summary/?limit=2").json()["rows"]), 2)
+
+    def test_limit_is_clamped_and_validated(self):
+        self.assertEqual(self.client.get("/api/orders/summary/?limit=100000").json()["limit"], 500)
+        self.assertEqual(self.client.get("/api/orders/summary/?limit=-3").json()["limit"], 1)
+        self.assertEqual(self.client.get("/api/orders/summary/?limit=abc").status_code, 400)
+        self.assertEqual(self.client.get("/api/async/orders/summary/?limit=100000").json()["limit"], 500)
+        self.assertEqual(self.client.get("/api/async/orders/summary/?limit=abc").status_code, 400)
+
+    def test_evicted_generation_does_not_resurrect_old_entries(self):
+        self.assertEqual(self.total_for_alice(), 500)
+        stale_generation = cache.get(summary_cache.GENERATION_KEY)
+        self.order.total_cents = 800
+        self.order.save()
+        self.assertEqual(self.total_for_alice(), 800)
+
+        # The generation key goes (eviction, restart of a shared cache) while old entries stay.
+        cache.delete(summary_cache.GENERATION_KEY)
+        self.assertNotEqual(summary_cache._generation(), stale_generation)
+        self.assertEqual(self.total_for_alice(), 800)
+
+    def test_order_changes_invalidate(self):
+        self.assertEqual(self.total_for_alice(), 500)
+
+        self.order.total_cents = 800
+        self.order.save()
+        self.assertEqual(self.total_for_alice(), 800)
+
+        self.client.post(f"/api/orders/{self.order.id}/cancel/")
+        self.assertEqual(self.total_for_alice(), 0)
+
+    def test_irrelevant_order_write_keeps_cache(self):
+        self.summary()
+        Order.objects.create(customer=self.alice, status=Order.Status.DRAFT, total_cents=100)
+        with CaptureQueriesContext(connection) as queries:
+            self.summary()
+        self.assertEqual(len(queries), 0)
+
+    def test_customer_deactivation_invalidates(self):
+        self.summary()
+        self.alice.is_active = False
+        self.alice.save(update_fields=["is_active"])
+        emails = [row["email"] for row in self.summary().json()["rows"]]
+        self.assertNotIn("alice@example.com", emails)
+
+    def test_etag_round_trip(self):
+        first = self.summary()
+        etag = first["ETag"]
+        self.assertTrue(etag)
+
+        res = self.summary(HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(res.status_code, 304)
+        self.assertEqual(res.content, b"")
+
+        Order.objects.create(customer=self.alice, status=Order.Status.PAID, total_cents=100)
+        res = self.summary(HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(res.status_code, 200)
+        self.assertNotEqual(res["ETag"], etag)
@@ -0,0 +1,89 @@
+"""Order.total_cents maintenance.
+
+Totals are derived from the order's items with one SQL aggregate rather than by walking
+`order.items.all()` in Python. Single item writes go through `refresh_order_total`, which
+re-saves the order so the usual post_save receivers run. Bulk item imports should call
+`recompute_order_totals` once per batch, or wrap their writes in `batch_total_updates()`.
+"""
+
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.db.models import F, OuterRef, Subquery, Sum, Value
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from .events import orders_bulk_changed
+from .models import Order, OrderItem
+
+RECOMPUTE_BATCH_SIZE = 500
+
+# Order ids collected while inside batch_total_updates(); None when not batching.
+_pending_order_ids = ContextVar("pending_order_ids", default=None)
+
+
+def line_total_expression():
+    return F("quantity") * F("unit_price_cents")
+
+
+def compute_order_total(order_id) -> int:
+    return OrderItem.objects.filter(order_id=order_id).aggregate(
+        total=Coalesce(Sum(line_total_expression()), Value(0))
+    )["total"]
+
+
+def refresh_order_total(order: Order) -> None:
+    """Recompute one order's total and save it (post_save receivers see the change)."""
+    pending = _pending_order_ids.get()
+    if pending is not None:
+        pending.add(order.pk)
+        return
+    order.total_cents = compute_order_total(order.pk)
+    order.save(update_fields=["total_cents", "updated_at"])
+
+
+def recompute_order_totals(order_ids, batch_size=RECOMPUTE_BATCH_SIZE) -> int:
+    """Set-based recompute: one UPDATE ... SET total_cents = (SELECT SUM(...)) per batch.
+
+    Sends `orders_bulk_changed` once per batch. Returns the number of orders updated.
+    """
+    ids = sorted(set(order_ids))
+    pending = _pending_order_ids.get()
+    if pending is not None:
+        pending.update(ids)
+        return 0
+
+    item_totals = (
+        OrderItem.objects.filter(order_id=OuterRef("pk"))
+        .values("order_id")
+        .annotate(total=Sum(line_total_expression()))
+        .values("total")
+    )
+    updated = 0
+    for start in range(0, len(ids), batch_size):
+        chunk = ids[start:start + batch_size]
+        updated += Order.objects.filter(id__in=chunk).update(
+            total_cents=Coalesce(Subquery(item_totals), Value(0)),
+            updated_at=timezone.now(),
+        )
+        orders_bulk_changed.send(sender=Order, order_ids=chunk, fields=("total_cents",))
+    return updated
+
+
+@contextmanager
+def batch_total_updates():
+    """Defer total maintenance for item writes in the block to one recompute at exit.
+
+    Nothing is recomputed if the block raises; nested blocks join the outermost one.
+    """
+    if _pending_order_ids.get() is not None:
+        yield
+        return
+    pending = set()
+    token = _pending_order_ids.set(pending)
+    try:
+        yield
+    finally:
+        _pending_order_ids.reset(token)
+    if pending:
+        recompute_order_totals(pending)
@@ -0,0 +1,94 @@
+"""Set-based order state transitions (cancel / archive / mark paid many orders at once).
+
+Each batch is read once to classify ids, then moved with a single guarded UPDATE. Per-row
+`post_save` does not fire; `orders_bulk_changed` is sent once for all updated ids so
+rollups and caches are refreshed once per request instead of once per order. Outbox
+events for the moved orders are inserted with the UPDATE, in the same transaction.
+"""
+
+from django.db import transaction
+from django.utils import timezone
+
+from . import outbox
+from .events import orders_bulk_changed
+from .models import Order
+
+TRANSITION_BATCH_SIZE = 500
+
+UPDATED = "updated"
+UNCHANGED = "unchanged"
+NOT_FOUND = "not_found"
+INVALID = "invalid_transition"
+
+# target -> (field, new value, statuses allowed to move; None = any)
+TRANSITIONS = {
+    "cancelled": ("status", Order.Status.CANCELLED, None),
+    "paid": ("status", Order.Status.PAID, {Order.Status.DRAFT}),
+    "archived": ("is_archived", True, None),
+}
+
+
+def _classify(row, field, value, allowed_from):
+    if row[field] == value:
+        return UNCHANGED
+    if allowed_from is not None and row["status"] not in allowed_from:
+        return INVALID
+    return UPDATED
+
+
+def _moved_by_update(order_ids, changed_at, outcomes, field, value, allowed_from) -> list:
+    """Ids among `order_ids` the guarded UPDATE stamped with `changed_at`.
+
+    The rest changed between the read and the UPDATE; their outcome is re-derived from the
+    row as it is now.
+    """
+    current = {
+        row["id"]: row
+        for row in Order.objects.filter(id__in=order_ids).values("id", "status", "is_archived", "updated_at")
+    }
+    moved = []
+    for order_id in order_ids:
+        row = current.get(order_id)
+        if row and row[field] == value and row["updated_at"] == changed_at:
+            moved.append(order_id)
+        else:
+            outcomes[order_id] = _classify(row, field, value, allowed_from) if row else NOT_FOUND
+    return moved
+
+
+def bulk_transition(order_ids, target, batch_size=TRANSITION_BATCH_SIZE) -> dict:
+    """Apply `target` to every id in one transaction. Returns {order_id: outcome}."""
+    field, value, allowed_from = TRANSITIONS[target]
+    ids = list(dict.fromkeys(order_ids))
+    outcomes = {}
+    updated_ids = []
+
+    with transaction.atomic():
+        for start in range(0, len(ids), batch_size):
+            chunk = ids[start:start + batch_size]
+            rows = {
+                row["id"]: row
+                for row in Order.objects.filter(id__in=chunk).values("id", "customer_id", "status", "is_archived")
+            }
+            to_update = []
+            for order_id in chunk:
+                row = rows.get(order_id)
+                outcome = _classify(row, field, value, allowed_from) if row else NOT_FOUND
+                outcomes[order_id] = outcome
+                if outcome == UPDATED:
+                    to_update.append(order_id)
+
+            if to_update:
+                queryset = Order.objects.filter(id__in=to_update).exclude(**{field: value})
+                if allowed_from is not None:
+                    queryset = queryset.filter(status__in=allowed_from)
+                changed_at = timezone.now()
+                if queryset.update(**{field: value, "updated_at": changed_at}) != len(to_update):
+                    to_update = _moved_by_update(to_update, changed_at, outcomes, field, value, allowed_from)
+                outbox.record_bulk_change([rows[order_id] for order_id in to_update], field, value, changed_at)
+                updated_ids.extend(to_update)
+
+        if updated_ids:
+            orders_bulk_changed.send(sender=Order, order_ids=updated_ids, fields=(field,))
+
+    return outcomes
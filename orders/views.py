@@ -1,43 +1,228 @@
-from django.db.models import Count, IntegerField, Q, Sum, Value
-from django.db.models.functions import Coalesce
-from rest_framework import viewsets
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.db.models import Prefetch
+from django.http import Http404
+from django.utils.http import parse_etags, quote_etag
+from rest_framework import status, viewsets
 from rest_framework.decorators import action
-from rest_framework.exceptions import ValidationError
+from rest_framework.exceptions import NotFound, ValidationError
 from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
 from rest_framework.views import APIView
 
+from . import search, summary_cache
+from .exports import CSVRenderer, NDJSONRenderer, streaming_export_response
+from .fast_serializers import serialize_archived_order, serialize_order_queryset, serialize_orders
+from .ingest import INGEST_BATCH_SIZE, ingest_orders, iter_lines
 from .models import Customer, Order, OrderItem
-from .serializers import CustomerSerializer, OrderSerializer, OrderItemSerializer
+from .pagination import OptInCursorPagination
+from .rollups import top_customers
+from .sku_sales import top_skus
+from .serializers import (
+    BulkTransitionSerializer, CustomerSerializer, OrderSerializer, OrderItemSerializer, OrderStatsQuerySerializer,
+)
+from .stats import bucketed_stats
+from .transitions import UPDATED, bulk_transition
+
+def parse_status_param(params) -> str:
+    status_value = (params.get("status") or "").strip()
+    if status_value:
+        allowed_statuses = {choice for choice, _ in Order.Status.choices}
+        if status_value not in allowed_statuses:
+            allowed_text = ", ".join(sorted(allowed_statuses))
+            raise ValidationError({"status": f"Invalid status. Use one of: {allowed_text}."})
+    return status_value
+
+def apply_order_list_filters(qs, params):
+    """Filters shared by the order list, export, bulk transitions and the async list."""
+    qs = qs.filter(is_archived=False)
+
+    status_value = parse_status_param(params)
+    email_value = (params.get("email") or "").strip()
+
+    if status_value:
+        qs = qs.filter(status=status_value)
+
+    if email_value:
+        qs = search.filter_by_email(qs, email_value)
+
+    return qs
+
+def summary_row(row) -> dict:
+    return {
+        "customer_id": row["customer_id"],
+        "email": row["customer__email"],
+        "order_count": row["order_count"],
+        "total_cents": row["total_cents"],
+    }
 
 class CustomerViewSet(viewsets.ModelViewSet):
     queryset = Customer.objects.all().order_by("-id")
     serializer_class = CustomerSerializer
+    pagination_class = OptInCursorPagination
+    # GET/HEAD are served from the read replica (regression_lab/db_router.py).
+    replica_reads = True
+
+    def get_queryset(self):
+        qs = super().get_queryset()
+        if self.action == "list":
+            # ?search= matches email or name substrings; ?email_prefix= is an index range scan.
+            search_value = (self.request.query_params.get("search") or "").strip()
+            prefix_value = (self.request.query_params.get("email_prefix") or "").strip()
+            if search_value:
+                qs = search.search_customers(qs, search_value)
+            if prefix_value:
+                qs = qs.filter(search.email_prefix_q(prefix_value))
+        if self.action == "orders":
+            # One query for the page of orders (a windowed slice per customer) and one for
+            # their items, however many orders the customer has.
+            orders_qs = Order.objects.filter(is_archived=False).order_by("-id")
+            status_value = parse_status_param(self.request.query_params)
+            if status_value:
+                orders_qs = orders_qs.filter(status=status_value)
+
+            page_number, page_size = self.get_orders_page()
+            offset = (page_number - 1) * page_size
+            qs = qs.prefetch_related(
+                Prefetch("orders", queryset=orders_qs[offset:offset + page_size + 1], to_attr="order_page"),
+                "order_page__items",
+            )
+        return qs
+
+    def get_orders_page(self):
+        """(page_number, page_size) for the nested orders endpoint."""
+        paginator = self.paginator
+        try:
+            page_number = max(int(self.request.query_params.get(paginator.page_query_param, 1)), 1)
+        except ValueError:
+            raise NotFound("Invalid page.")
+        return page_number, paginator.get_page_size(self.request)
+
+    @action(detail=True, methods=["get"])
+    def orders(self, request, pk=None):
+        """Non-archived orders of one customer, newest first, with items (`?status=`, `?page=`)."""
+        customer = self.get_object()
+        page_number, page_size = self.get_orders_page()
+        if page_number > 1 and not customer.order_page:
+            # Same as the main list: only the first page may be empty.
+            raise NotFound("Invalid page.")
+        orders = customer.order_page[:page_size]
+
+        url = request.build_absolute_uri()
+        next_url = (
+            replace_query_param(url, self.paginator.page_query_param, page_number + 1)
+            if len(customer.order_page) > page_size else None
+        )
+        previous_url = None
+        if page_number > 1:
+            previous_url = replace_query_param(url, self.paginator.page_query_param, page_number - 1)
+
+        return Response({
+            "customer_id": customer.id,
+            "next": next_url,
+            "previous": previous_url,
+            "results": OrderSerializer(orders, many=True).data,
+        })
 
 class OrderViewSet(viewsets.ModelViewSet):
     queryset = Order.objects.all().order_by("-id")
     serializer_class = OrderSerializer
+    pagination_class = OptInCursorPagination
+    replica_reads = True
 
     def get_queryset(self):
-        qs = super().get_queryset().select_related("customer").prefetch_related("items")
-        # Default behavior: hide archived orders in list views.
+        qs = super().get_queryset()
+        if self.action not in ("cancel", "archive"):
+            # Those two only save the order; the other actions may serialize it with its items.
+            qs = qs.select_related("customer").prefetch_related("items")
+        # Default behavior: hide archived orders in list views (and the export, which mirrors them).
         # (Note: detail views should still retrieve by id.)
-        if self.action == "list":
-            qs = qs.filter(is_archived=False)
+        if self.action in ("list", "export"):
+            qs = self.apply_list_filters(qs, self.request.query_params)
 
-            status_value = (self.request.query_params.get("status") or "").strip()
-            email_value = (self.request.query_params.get("email") or "").strip()
+        return qs
 
-            if status_value:
-                allowed_statuses = {choice for choice, _ in Order.Status.choices}
-                if status_value not in allowed_statuses:
-                    allowed_text = ", ".join(sorted(allowed_statuses))
-                    raise ValidationError({"status": f"Invalid status. Use one of: {allowed_text}."})
-                qs = qs.filter(status=status_value)
+    def apply_list_filters(self, qs, params):
+        return apply_order_list_filters(qs, params)
 
-            if email_value:
-                qs = qs.filter(customer__email__icontains=email_value)
+    def list(self, request, *args, **kwargs):
+        # Read path: paginate on ids only, then build the page with the fast serializer.
+        queryset = self.filter_queryset(self.get_queryset())
+        page = self.paginate_queryset(
+            queryset.select_related(None).prefetch_related(None).only("id", "created_at")
+        )
+        if page is not None:
+            return self.get_paginated_response(serialize_orders([order.id for order in page]))
+        return Response(serialize_order_queryset(queryset))
 
-        return qs
+    def retrieve(self, request, *args, **kwargs):
+        # No object-level permissions are configured here, so no instance is needed.
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        try:
+            queryset = self.filter_queryset(self.get_queryset()).filter(
+                **{self.lookup_field: self.kwargs[lookup_url_kwarg]}
+            )
+            rows = serialize_order_queryset(queryset)
+            if not rows:
+                # Moved out of the hot tables by `manage.py archive_orders` (orders/archive.py).
+                archived = serialize_archived_order(self.kwargs[lookup_url_kwarg])
+                rows = [archived] if archived else []
+        except (TypeError, ValueError, DjangoValidationError):
+            raise Http404
+        if not rows:
+            raise Http404
+        return Response(rows[0])
+
+    @action(detail=False, methods=["get"], renderer_classes=[NDJSONRenderer, CSVRenderer])
+    def export(self, request):
+        """Stream every order matching the list filters as NDJSON (default) or CSV (?format=csv)."""
+        queryset = self.filter_queryset(self.get_queryset()).prefetch_related(None)
+        return streaming_export_response(queryset, request.accepted_renderer.format)
+
+    @action(detail=False, methods=["post"], url_path="bulk-transition")
+    def bulk_transition(self, request):
+        """Move many orders to `target` (cancelled|archived|paid) with set-based UPDATEs.
+
+        Body: {"target": ..., "ids": [...]} or {"target": ..., "filter": {"status": ..., "email": ...}}
+        where `filter` selects the same orders as the list view: only those keys, at least one
+        non-blank, and at most `MAX_IDS` matches (the cap `ids` has too).
+        """
+        serializer = BulkTransitionSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        target = serializer.validated_data["target"]
+
+        if "ids" in serializer.validated_data:
+            order_ids = serializer.validated_data["ids"]
+        else:
+            queryset = self.apply_list_filters(Order.objects.order_by("id"), serializer.validated_data["filter"])
+            order_ids = list(queryset.values_list("id", flat=True)[:BulkTransitionSerializer.MAX_IDS + 1])
+            if len(order_ids) > BulkTransitionSerializer.MAX_IDS:
+                raise ValidationError({
+                    "filter": f"Matches more than {BulkTransitionSerializer.MAX_IDS} orders; narrow it down."
+                })
+
+        outcomes = bulk_transition(order_ids, target)
+        return Response({
+            "target": target,
+            "updated": sum(1 for outcome in outcomes.values() if outcome == UPDATED),
+            "results": [{"id": order_id, "outcome": outcome} for order_id, outcome in outcomes.items()],
+        })
+
+    @action(detail=False, methods=["post"])
+    def ingest(self, request):
+        """Create orders with nested items from an NDJSON body, one order per line.
+
+        Line format: {"customer": id, "status": ..., "items": [{"sku", "quantity", "unit_price_cents"}]}.
+        Lines are validated and written `?batch_size=` (default 500, max 5000) at a time;
+        bad lines are reported by line number and skipped. 400 only if nothing was created.
+        """
+        try:
+            batch_size = min(max(int(request.query_params.get("batch_size", INGEST_BATCH_SIZE)), 1), 5000)
+        except ValueError:
+            raise ValidationError({"batch_size": "A valid integer is required."})
+        # Read the body as a stream; `request.data` would buffer and parse all of it.
+        report = ingest_orders(iter_lines(request.readline), batch_size=batch_size)
+        failed_outright = report["failed"] and not report["created"]
+        return Response(report, status=status.HTTP_400_BAD_REQUEST if failed_outright else status.HTTP_200_OK)
 
     @action(detail=True, methods=["post"])
     def cancel(self, request, pk=None):
@@ -56,40 +241,67 @@ class OrderViewSet(viewsets.ModelViewSet):
 class OrderItemViewSet(viewsets.ModelViewSet):
     queryset = OrderItem.objects.all().order_by("-id")
     serializer_class = OrderItemSerializer
+    replica_reads = True
+
+    @action(detail=False, methods=["get"], url_path="top-skus")
+    def top_skus(self, request):
+        """Best-selling SKUs among paid orders by revenue (`?limit=`, default 20, max 500)."""
+        try:
+            limit = min(max(int(request.query_params.get("limit", 20)), 1), 500)
+        except ValueError:
+            raise ValidationError({"limit": "A valid integer is required."})
+        return Response({"limit": limit, "rows": list(top_skus(limit))})
 
 class OrdersSummaryView(APIView):
-    """Intentionally slow summary endpoint.
+    """Top customers by total spent (paid, non-archived orders only).
 
-    Returns top customers by total spent (paid orders only).
-    This is written in a purposely inefficient way to give candidates a perf target.
+    Reads the top-N straight off the indexed `CustomerSpendRollup` table, which
+    orders/signals.py keeps in sync, instead of aggregating every order per request.
+    `?limit=` defaults to 50 and is clamped to 1..500. Payloads are cached per `limit` (see
+    orders/summary_cache.py) and carry an ETag, so clients sending `If-None-Match` get a
+    bodiless 304 while nothing has changed.
     """
 
+    replica_reads = True
+
     def get(self, request):
-        limit = int(request.query_params.get("limit", 50))
-
-        paid_filter = Q(orders__status=Order.Status.PAID, orders__is_archived=False)
-        customer_rows = (
-            Customer.objects.filter(is_active=True)
-            .annotate(
-                order_count=Count("orders", filter=paid_filter),
-                total_cents=Coalesce(
-                    Sum("orders__total_cents", filter=paid_filter),
-                    Value(0),
-                    output_field=IntegerField(),
-                ),
-            )
-            .order_by("-total_cents", "-id")[:limit]
-            .values("id", "email", "order_count", "total_cents")
-        )
+        try:
+            limit = min(max(int(request.query_params.get("limit", 50)), 1), 500)
+        except ValueError:
+            raise ValidationError({"limit": "A valid integer is required."})
+
+        def build():
+            rows = [summary_row(row) for row in top_customers(limit)]
+            return {"limit": limit, "rows": rows}
+
+        payload, etag = summary_cache.get_or_build(limit, build)
+        quoted_etag = quote_etag(etag)
+        if quoted_etag in parse_etags(request.headers.get("If-None-Match", "")):
+            response = Response(status=status.HTTP_304_NOT_MODIFIED)
+        else:
+            response = Response(payload)
+        response["ETag"] = quoted_etag
+        return response
 
-        rows = [
-            {
-                "customer_id": row["id"],
-                "email": row["email"],
-                "order_count": row["order_count"],
-                "total_cents": row["total_cents"],
-            }
-            for row in customer_rows
-        ]
-
-        return Response({"limit": limit, "rows": rows})
+class OrderStatsView(APIView):
+    """Order count and revenue per day, week or month, with a per-status breakdown.
+
+    `?granularity=day|week|month&from=YYYY-MM-DD&to=YYYY-MM-DD[&status=paid]`; the range
+    defaults to the last 30 days. Sums the pre-aggregated `DailyOrderStats` rows (see
+    orders/stats.py), so the cost depends on the number of days, not orders. Weeks start
+    on Monday; periods without orders are omitted.
+    """
+
+    replica_reads = True
+
+    def get(self, request):
+        serializer = OrderStatsQuerySerializer(data=request.query_params)
+        serializer.is_valid(raise_exception=True)
+        params = serializer.validated_data
+        return Response({
+            "granularity": params["granularity"],
+            "from": params["from"].isoformat(),
+            "to": params["to"].isoformat(),
+            "status": params.get("status"),
+            "buckets": bucketed_stats(params["from"], params["to"], params["granularity"], params.get("status")),
+        })
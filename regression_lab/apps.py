@@ -0,0 +1,10 @@
+from django.apps import AppConfig
+
+
+class RegressionLabConfig(AppConfig):
+    """Project-level hooks that don't belong to any one app."""
+
+    name = "regression_lab"
+
+    def ready(self):
+        from . import sqlite  # noqa: F401  (connects the PRAGMA profile to connection_created)
@@ -0,0 +1,7 @@
+import os
+from django.core.asgi import get_asgi_application
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "regression_lab.settings")
+# Don't keep per-thread connections open between requests (see DATABASES in settings.py).
+os.environ.setdefault("DB_CONN_MAX_AGE", "0")
+application = get_asgi_application()
@@ -0,0 +1,145 @@
+"""Primary/replica routing with read-your-writes stickiness.
+
+Writes always go to `default`. Reads go to the `replica` alias only while a request for
+an opted-in view is being served: DRF views with `replica_reads = True`, or function
+views decorated with `@replica_reads`. The request must also use a safe method (GET,
+HEAD, OPTIONS). Everything else reads from `default`: management commands, scripts,
+unsafe requests, and reads inside a transaction on `default`.
+
+Stickiness: once a request writes, the rest of that request reads from `default`. The
+response then sets a `REPLICA_PIN_COOKIE` for `REPLICA_PIN_SECONDS`, so the same client's
+next requests read from the primary while the replica catches up.
+
+Values cached for every client (the summary payload, list counts) must not come from a
+lagging replica, or a read right after an invalidation would cache pre-write data until the
+next one. Code that fills such caches reads inside `primary_reads()`.
+
+`ReplicaRoutingMiddleware` holds the per-request state in a context variable. ASGI
+requests (and the sync threads their ORM calls run in) therefore see the same state.
+"""
+
+import contextvars
+from contextlib import contextmanager
+from dataclasses import dataclass
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.urls import Resolver404, resolve
+
+REPLICA_ALIAS = "replica"
+SAFE_METHODS = ("GET", "HEAD", "OPTIONS")
+
+
+@dataclass
+class RoutingState:
+    read_alias: str = DEFAULT_DB_ALIAS
+    wrote: bool = False
+
+
+_state = contextvars.ContextVar("db_routing_state", default=None)
+
+
+def replica_reads(view):
+    """Mark a function view (or view class) as safe to serve GET/HEAD from the replica."""
+    view.replica_reads = True
+    return view
+
+
+@contextmanager
+def primary_reads():
+    """Send the reads in this block to `default`, whatever the current request's routing."""
+    token = _state.set(None)
+    try:
+        yield
+    finally:
+        _state.reset(token)
+
+
+def _pin_cookie():
+    return getattr(settings, "REPLICA_PIN_COOKIE", "db_pin")
+
+
+def _pin_seconds():
+    return getattr(settings, "REPLICA_PIN_SECONDS", 5)
+
+
+def _view_opted_in(request) -> bool:
+    try:
+        func = resolve(request.path_info, getattr(request, "urlconf", None)).func
+    except Resolver404:
+        return False
+    return bool(getattr(func, "replica_reads", False) or getattr(getattr(func, "cls", None), "replica_reads", False))
+
+
+def _read_alias_for(request) -> str:
+    if REPLICA_ALIAS not in settings.DATABASES:
+        return DEFAULT_DB_ALIAS
+    if request.method not in SAFE_METHODS or request.COOKIES.get(_pin_cookie()):
+        return DEFAULT_DB_ALIAS
+    return REPLICA_ALIAS if _view_opted_in(request) else DEFAULT_DB_ALIAS
+
+
+class PrimaryReplicaRouter:
+    def db_for_read(self, model, **hints):
+        instance = hints.get("instance")
+        if instance is not None and instance._state.db:
+            # Related lookups follow the object they start from.
+            return instance._state.db
+        state = _state.get()
+        if state is None or state.read_alias == DEFAULT_DB_ALIAS:
+            return DEFAULT_DB_ALIAS
+        # Inside a transaction on the primary, reads must see its uncommitted writes.
+        if connections[DEFAULT_DB_ALIAS].in_atomic_block:
+            return DEFAULT_DB_ALIAS
+        return state.read_alias
+
+    def db_for_write(self, model, **hints):
+        state = _state.get()
+        if state is not None:
+            state.wrote = True
+            state.read_alias = DEFAULT_DB_ALIAS
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # The replica gets its schema from the primary.
+        return db != REPLICA_ALIAS
+
+
+class ReplicaRoutingMiddleware:
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.is_async = iscoroutinefunction(get_response)
+        if self.is_async:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.is_async:
+            return self.__acall__(request)
+        state = RoutingState(read_alias=_read_alias_for(request))
+        token = _state.set(state)
+        try:
+            response = self.get_response(request)
+        finally:
+            _state.reset(token)
+        return self.finish(request, response, state)
+
+    async def __acall__(self, request):
+        state = RoutingState(read_alias=_read_alias_for(request))
+        token = _state.set(state)
+        try:
+            response = await self.get_response(request)
+        finally:
+            _state.reset(token)
+        return self.finish(request, response, state)
+
+    def finish(self, request, response, state):
+        if state.wrote or request.method not in SAFE_METHODS:
+            response.set_cookie(_pin_cookie(), "1", max_age=_pin_seconds(), httponly=True, samesite="Lax")
+        return response
@@ -0,0 +1,141 @@
+"""Per-request DB query / latency instrumentation.
+
+`QueryInstrumentationMiddleware` wraps every DB connection with an execute wrapper for the
+duration of a request and records query count, DB time, total time and duplicate-query
+fingerprints. Results are emitted as a `Server-Timing` header and as one JSON log line on
+the `regression_lab.perf` logger.
+
+Query budgets live in `settings.QUERY_BUDGETS` keyed by method and URL name (e.g.
+"GET orders-list"), so a write isn't held to the budget of the read on the same route.
+Requests without an entry aren't checked. Exceeding one logs a warning, or raises
+`QueryBudgetExceeded` when `settings.QUERY_BUDGET_RAISE` is true, which the test client
+re-raises so the test fails.
+
+Streaming responses are measured up to the point the response is returned; queries run
+while the body streams are not counted.
+
+Under ASGI the middleware runs async. DB connections are per thread and the async ORM runs
+its queries in the request's sync thread (see `asgiref.sync.ThreadSensitiveContext`), so
+the execute wrappers are installed and removed from that thread.
+"""
+
+import json
+import logging
+import re
+import time
+from collections import Counter
+from contextlib import ExitStack
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.db import connections
+
+logger = logging.getLogger("regression_lab.perf")
+
+# Collapse "IN (%s, %s, %s)" style lists so batches of different sizes share a fingerprint.
+_PLACEHOLDER_LIST = re.compile(r"%s(?:\s*,\s*%s)+")
+
+
+class QueryBudgetExceeded(AssertionError):
+    pass
+
+
+def fingerprint(sql: str) -> str:
+    return _PLACEHOLDER_LIST.sub("%s, ...", sql)
+
+
+class QueryRecorder:
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+        self.fingerprints = Counter()
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.duration += time.perf_counter() - start
+            self.count += 1
+            self.fingerprints[fingerprint(sql)] += 1
+
+    def duplicates(self) -> list[dict]:
+        return [
+            {"fingerprint": sql[:300], "count": count}
+            for sql, count in self.fingerprints.most_common()
+            if count > 1
+        ]
+
+
+def _install(stack, recorder) -> None:
+    for connection in connections.all():
+        stack.enter_context(connection.execute_wrapper(recorder))
+
+
+class QueryInstrumentationMiddleware:
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.is_async = iscoroutinefunction(get_response)
+        if self.is_async:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.is_async:
+            return self.__acall__(request)
+        recorder = QueryRecorder()
+        start = time.perf_counter()
+        with ExitStack() as stack:
+            _install(stack, recorder)
+            response = self.get_response(request)
+        return self.finish(request, response, recorder, start)
+
+    async def __acall__(self, request):
+        recorder = QueryRecorder()
+        start = time.perf_counter()
+        stack = ExitStack()
+        await sync_to_async(_install)(stack, recorder)
+        try:
+            response = await self.get_response(request)
+        finally:
+            await sync_to_async(stack.close)()
+        return self.finish(request, response, recorder, start)
+
+    def finish(self, request, response, recorder, start):
+        total_ms = (time.perf_counter() - start) * 1000
+        db_ms = recorder.duration * 1000
+
+        match = getattr(request, "resolver_match", None)
+        view_name = (match.view_name if match else None) or request.path
+        duplicates = recorder.duplicates()
+        duplicated = sum(row["count"] - 1 for row in duplicates)
+
+        response["Server-Timing"] = ", ".join([
+            f'db;dur={db_ms:.2f};desc="{recorder.count} queries, {duplicated} duplicated"',
+            f"app;dur={max(total_ms - db_ms, 0):.2f}",
+            f"total;dur={total_ms:.2f}",
+        ])
+
+        record = {
+            "view": view_name,
+            "method": request.method,
+            "path": request.path,
+            "status": response.status_code,
+            "queries": recorder.count,
+            "db_ms": round(db_ms, 2),
+            "total_ms": round(total_ms, 2),
+            "duplicates": duplicates[:5],
+        }
+        logger.info(json.dumps(record))
+
+        route = f"{'GET' if request.method == 'HEAD' else request.method} {view_name}"
+        budget = getattr(settings, "QUERY_BUDGETS", {}).get(route)
+        if budget is not None and recorder.count > budget:
+            message = f"{route} ran {recorder.count} queries (budget {budget})"
+            if getattr(settings, "QUERY_BUDGET_RAISE", False):
+                raise QueryBudgetExceeded(message)
+            logger.warning("query budget exceeded: %s", json.dumps({**record, "budget": budget}))
+
+        return response
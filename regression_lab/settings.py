@@ -1,3 +1,4 @@
+import os
 from pathlib import Path
 
 BASE_DIR = Path(__file__).resolve().parent.parent
@@ -14,11 +15,14 @@ INSTALLED_APPS = [
     "django.contrib.messages",
     "django.contrib.staticfiles",
     "rest_framework",
+    "regression_lab.apps.RegressionLabConfig",
     "orders.apps.OrdersConfig",
     "api.apps.ApiConfig",
 ]
 
 MIDDLEWARE = [
+    "regression_lab.instrumentation.QueryInstrumentationMiddleware",
+    "regression_lab.db_router.ReplicaRoutingMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
@@ -47,14 +51,103 @@ TEMPLATES = [
 ]
 
 WSGI_APPLICATION = "regression_lab.wsgi.application"
+ASGI_APPLICATION = "regression_lab.asgi.application"
 
 DATABASES = {
     "default": {
         "ENGINE": "django.db.backends.sqlite3",
         "NAME": BASE_DIR / "db.sqlite3",
+        # Keep connections (and their PRAGMAs) across requests; 0 reconnects every request.
+        # regression_lab/asgi.py defaults it to 0: async views run their queries on
+        # whichever thread is free, and a connection left open on each would outlive its use.
+        "CONN_MAX_AGE": int(os.environ.get("DB_CONN_MAX_AGE", 60)),
+        "CONN_HEALTH_CHECKS": True,
+    },
+}
+# Read replica for GET/HEAD on opted-in views (regression_lab/db_router.py). Defaults to the
+# same SQLite file: in WAL mode its readers don't block the writer. Point DB_REPLICA_NAME at
+# a replicated copy to split the load. Tests mirror `default`.
+DATABASES["replica"] = {
+    **DATABASES["default"],
+    "NAME": os.environ.get("DB_REPLICA_NAME", DATABASES["default"]["NAME"]),
+    "CONN_MAX_AGE": int(os.environ.get("DB_REPLICA_CONN_MAX_AGE", DATABASES["default"]["CONN_MAX_AGE"])),
+    "TEST": {"MIRROR": "default"},
+}
+DATABASE_ROUTERS = ["regression_lab.db_router.PrimaryReplicaRouter"]
+# After a write, the client reads from the primary for this long (read-your-writes).
+REPLICA_PIN_SECONDS = 5
+REPLICA_PIN_COOKIE = "db_pin"
+
+# PRAGMA profile applied to every SQLite connection: "tuned" or "stock" (regression_lab/sqlite.py).
+SQLITE_PROFILE = os.environ.get("SQLITE_PROFILE", "tuned")
+# Per-PRAGMA overrides on top of the profile, e.g. {"mmap_size": 0}.
+SQLITE_PRAGMAS = {}
+
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
     }
 }
 
+# Safety-net TTL for the cached /api/orders/summary/ payload; it is invalidated on writes.
+SUMMARY_CACHE_TIMEOUT = 300
+# How stale a list endpoint's total `count` may be (orders/counts.py); `?count=exact` bypasses it.
+LIST_COUNT_CACHE_TIMEOUT = 30
+# `manage.py archive_orders` moves cancelled orders untouched for this long (orders/archive.py).
+ARCHIVE_CANCELLED_AFTER_DAYS = 90
+# Handlers `manage.py drain_outbox` runs per outbox event kind (orders/outbox.py).
+OUTBOX_HANDLERS = {
+    "order.status_changed": ["orders.outbox.log_status_change"],
+}
+
+# Max DB queries per request, keyed by "METHOD url-name" (see regression_lab/instrumentation.py).
+# Only listed method/route pairs are checked; HEAD uses the GET budget.
+QUERY_BUDGETS = {
+    "GET orders-summary": 1,
+    "GET orders-stats": 1,
+    # Page ids, COUNT on a count-cache miss, page rows, items; plus, once per process, the
+    # FTS availability probe when filtering by email.
+    "GET orders-list": 5,
+    "GET orders-detail": 2,
+    # Cancelling a paid order also writes an outbox event, updates the spend rollup, moves
+    # the order between daily stats rows (INSERT OR IGNORE + one UPDATE) and subtracts its
+    # items from the SKU rollup (one UPDATE), in a transaction (SAVEPOINT/RELEASE under
+    # tests, BEGIN otherwise). None of it grows with the number of items or SKUs.
+    "POST orders-cancel": 9,
+    "POST orders-archive": 6,
+    "GET customers-list": 2,
+    "GET customers-detail": 1,
+    "GET customers-orders": 3,
+    "GET items-list": 2,
+    "GET items-top-skus": 1,
+    "GET async-orders-summary": 1,
+    "GET async-orders-list": 5,
+    "GET async-orders-detail": 2,
+    # Admin changelists: session + user, capped count, one page of rows with their FKs; the
+    # order and customer searches can add the once-per-process FTS probe.
+    "GET admin:orders_order_changelist": 5,
+    "GET admin:orders_orderitem_changelist": 4,
+    "GET admin:orders_customer_changelist": 5,
+}
+# Raise instead of logging a warning when a budget is exceeded (tests turn this on).
+QUERY_BUDGET_RAISE = os.environ.get("QUERY_BUDGET_RAISE") == "1"
+
+LOGGING = {
+    "version": 1,
+    "disable_existing_loggers": False,
+    "handlers": {
+        "console": {"class": "logging.StreamHandler"},
+    },
+    "loggers": {
+        # Set PERF_LOG_LEVEL=INFO to get one JSON line per request.
+        "regression_lab.perf": {
+            "handlers": ["console"],
+            "level": os.environ.get("PERF_LOG_LEVEL", "WARNING"),
+            "propagate": False,
+        },
+    },
+}
+
 AUTH_PASSWORD_VALIDATORS = []
 
 LANGUAGE_CODE = "en-us"
@@ -0,0 +1,29 @@
+"""Slim settings for management commands and batch workers.
+
+    DJANGO_SETTINGS_MODULE=regression_lab.settings_worker python manage.py drain_outbox
+
+Same database, cache and orders settings as `regression_lab.settings`, without what only the
+HTTP side uses: admin, auth, sessions, messages, staticfiles, DRF, the `api` app, middleware
+and templates. `django.setup()` then imports the ORM, the project's SQLite PRAGMA hook and
+the orders app (models, signal receivers) and little else. `scripts/bench_startup.py`
+compares the two.
+
+The orders signals stay connected, so derived tables are maintained exactly as under the
+full profile. Run `migrate`, `runserver` and the test suite with the full settings: this
+profile doesn't know about the contrib apps' tables.
+"""
+
+from .settings import *  # noqa: F401,F403
+
+INSTALLED_APPS = [
+    "regression_lab.apps.RegressionLabConfig",
+    "orders.apps.OrdersConfig",
+]
+
+MIDDLEWARE = []
+
+ROOT_URLCONF = "regression_lab.urls_worker"
+
+TEMPLATES = []
+
+STATICFILES_DIRS = []
@@ -0,0 +1,7 @@
+"""URLconf for `regression_lab.settings_worker`: workers serve no HTTP.
+
+The system checks that management commands run load `ROOT_URLCONF`; the full one would
+import the admin and every DRF view.
+"""
+
+urlpatterns = []
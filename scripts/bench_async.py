@@ -0,0 +1,194 @@
+"""Concurrency benchmark: sync (WSGI) vs async (ASGI) read endpoints.
+
+Seeds a throwaway SQLite database, then drives Django's real WSGI and ASGI handlers
+in-process with N concurrent clients, each sending `--requests` sequential requests.
+
+* WSGI: a pool of `--wsgi-threads` worker threads (like a threaded gunicorn worker) serves
+  `/api/orders/...`; clients beyond the pool size queue for a thread.
+* ASGI: one event loop serves `/api/async/orders/...`; every client is a coroutine.
+
+SQLite answers in microseconds, which hides exactly what the async path is for, so
+`--db-latency-ms` adds a sleep to every query to model a network database round trip.
+
+    python scripts/bench_async.py
+    python scripts/bench_async.py --concurrency 50,100,200 --db-latency-ms 5 --wsgi-threads 8
+"""
+
+import argparse
+import asyncio
+import io
+import os
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from urllib.parse import urlsplit
+from wsgiref.util import setup_testing_defaults
+
+from bench_summary import percentile, use_fresh_database
+
+ENDPOINTS = {
+    "list": "/api/{prefix}orders/?status=paid",
+    "detail": "/api/{prefix}orders/{order_id}/",
+    "summary": "/api/{prefix}orders/summary/?limit=50",
+}
+
+
+def install_db_latency(latency_ms):
+    from django.db.backends.signals import connection_created
+
+    def sleep_wrapper(execute, sql, params, many, context):
+        time.sleep(latency_ms / 1000)
+        return execute(sql, params, many, context)
+
+    def on_connection_created(sender, connection, **kwargs):
+        if sleep_wrapper not in connection.execute_wrappers:
+            connection.execute_wrappers.append(sleep_wrapper)
+
+    # Connections are per thread; this catches every one the handlers open.
+    connection_created.connect(on_connection_created, weak=False)
+
+
+def request_paths(endpoints, order_ids, prefix, count):
+    for i in range(count):
+        template = ENDPOINTS[endpoints[i % len(endpoints)]]
+        yield template.format(prefix=prefix, order_id=order_ids[i % len(order_ids)])
+
+
+def wsgi_call(handler, path):
+    url = urlsplit(path)
+    environ = {"PATH_INFO": url.path, "QUERY_STRING": url.query, "wsgi.input": io.BytesIO()}
+    setup_testing_defaults(environ)
+    statuses = []
+    body = handler(environ, lambda status, headers, exc_info=None: statuses.append(status))
+    b"".join(body)
+    body.close()
+    return int(statuses[0].split()[0])
+
+
+async def asgi_call(handler, path):
+    url = urlsplit(path)
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": "GET",
+        "scheme": "http", "path": url.path, "raw_path": url.path.encode(),
+        "query_string": url.query.encode(), "headers": [(b"host", b"testserver")],
+        "client": ("127.0.0.1", 0), "server": ("testserver", 80),
+    }
+    messages = []
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        messages.append(message)
+
+    await handler(scope, receive, send)
+    return next(m["status"] for m in messages if m["type"] == "http.response.start")
+
+
+def summarize(name, clients, timings, statuses, elapsed):
+    timings.sort()
+    errors = sum(count for code, count in statuses.items() if code >= 400)
+    print(
+        f"{name:<5} clients={clients:>4} rps={len(timings) / elapsed:>8.1f} "
+        f"p50={percentile(timings, 50):>8.2f}ms p95={percentile(timings, 95):>8.2f}ms "
+        f"p99={percentile(timings, 99):>8.2f}ms errors={errors}"
+    )
+
+
+def run_wsgi(clients, args, order_ids):
+    from django.core.handlers.wsgi import WSGIHandler
+
+    handler = WSGIHandler()
+    paths = list(request_paths(args.endpoints, order_ids, "", clients * args.requests))
+    timings, statuses = [], {}
+
+    with ThreadPoolExecutor(max_workers=args.wsgi_threads) as workers:
+
+        def client(my_paths):
+            for path in my_paths:
+                t0 = time.perf_counter()
+                code = workers.submit(wsgi_call, handler, path).result()
+                timings.append((time.perf_counter() - t0) * 1000)
+                statuses[code] = statuses.get(code, 0) + 1
+
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=clients) as client_pool:
+            for future in [client_pool.submit(client, paths[i::clients]) for i in range(clients)]:
+                future.result()
+        elapsed = time.perf_counter() - start
+    summarize("wsgi", clients, timings, statuses, elapsed)
+
+
+def run_asgi(clients, args, order_ids):
+    from django.core.handlers.asgi import ASGIHandler
+
+    from django.db import connection
+
+    # Every ASGI request gets its own sync thread, so persistent connections would pile up.
+    connection.settings_dict["CONN_MAX_AGE"] = 0
+    handler = ASGIHandler()
+    paths = list(request_paths(args.endpoints, order_ids, "async/", clients * args.requests))
+    timings, statuses = [], {}
+
+    async def client(my_paths):
+        for path in my_paths:
+            t0 = time.perf_counter()
+            code = await asgi_call(handler, path)
+            timings.append((time.perf_counter() - t0) * 1000)
+            statuses[code] = statuses.get(code, 0) + 1
+
+    async def main():
+        await asyncio.gather(*(client(paths[i::clients]) for i in range(clients)))
+
+    start = time.perf_counter()
+    asyncio.run(main())
+    summarize("asgi", clients, timings, statuses, time.perf_counter() - start)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--orders", type=int, default=5000, help="Orders to seed.")
+    parser.add_argument("--concurrency", default="50,100,200", help="Comma-separated client counts.")
+    parser.add_argument("--requests", type=int, default=5, help="Sequential requests per client.")
+    parser.add_argument("--wsgi-threads", type=int, default=8, help="Worker threads on the WSGI side.")
+    parser.add_argument("--db-latency-ms", type=float, default=10.0, help="Simulated per-query latency.")
+    parser.add_argument("--endpoints", default="list,detail,summary", help=f"Any of {', '.join(ENDPOINTS)}.")
+    args = parser.parse_args()
+    args.endpoints = [name for name in args.endpoints.split(",") if name in ENDPOINTS]
+
+    repo_root = Path(__file__).resolve().parents[1]
+    sys.path.insert(0, str(repo_root))
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "regression_lab.settings")
+    os.environ.setdefault("PERF_LOG_LEVEL", "ERROR")  # keep budget warnings out of the output
+
+    import django
+
+    django.setup()
+
+    from django.conf import settings
+    from django.db import connection
+
+    from orders.models import Order
+    from orders.seeding import seed_orders
+
+    settings.ALLOWED_HOSTS = ["*"]
+    with tempfile.TemporaryDirectory() as workdir:
+        use_fresh_database(Path(workdir) / "bench_async.sqlite3")
+        seed_orders(max(1, args.orders // 10), 10, 4, seed=0)
+        order_ids = list(Order.objects.order_by("-id").values_list("id", flat=True)[:1000])
+        connection.close()
+
+        install_db_latency(args.db_latency_ms)
+        print(
+            f"{args.orders} orders, endpoints={','.join(args.endpoints)}, "
+            f"db latency {args.db_latency_ms}ms/query, {args.wsgi_threads} WSGI threads"
+        )
+        for clients in [int(value) for value in args.concurrency.split(",") if value.strip()]:
+            run_wsgi(clients, args, order_ids)
+            run_asgi(clients, args, order_ids)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""Per-row cost of `OrderSerializer` vs the `.values()`-based fast read path.
+
+Seeds a throwaway SQLite database in a temporary directory (the dev `db.sqlite3` is left
+alone) and times serializing the same orders both ways.
+
+    python scripts/bench_serializers.py --orders 2000 --repeats 5
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from bench_summary import use_fresh_database
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Per-row cost of OrderSerializer vs the fast read path.")
+    parser.add_argument("--orders", type=int, default=2000, help="Orders to serialize per run.")
+    parser.add_argument("--repeats", type=int, default=5)
+    args = parser.parse_args()
+
+    repo_root = Path(__file__).resolve().parents[1]
+    sys.path.insert(0, str(repo_root))
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "regression_lab.settings")
+
+    import django
+
+    django.setup()
+
+    from orders.models import Order
+    from orders.seeding import seed_orders
+
+    with tempfile.TemporaryDirectory() as workdir:
+        use_fresh_database(Path(workdir) / "bench_serializers.sqlite3")
+        seed_orders(customers=args.orders // 8 + 1, orders_per_customer=8, items_per_order=4, seed=0)
+        order_ids = list(Order.objects.order_by("-id").values_list("id", flat=True)[:args.orders])
+        run(order_ids, args.repeats)
+
+
+def run(order_ids, repeats) -> None:
+    from orders.fast_serializers import serialize_orders
+    from orders.models import Order
+    from orders.serializers import OrderSerializer
+
+    def drf():
+        orders = Order.objects.filter(id__in=order_ids).select_related("customer").prefetch_related("items")
+        return OrderSerializer(orders, many=True).data
+
+    def fast():
+        return serialize_orders(order_ids)
+
+    for name, fn in (("OrderSerializer", drf), ("fast_serializers", fast)):
+        fn()  # warm up
+        best = float("inf")
+        for _ in range(repeats):
+            t0 = time.perf_counter()
+            fn()
+            best = min(best, time.perf_counter() - t0)
+        print(
+            f"{name:<18} rows={len(order_ids)} total_ms={best * 1000:.1f} "
+            f"us_per_row={best * 1e6 / len(order_ids):.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
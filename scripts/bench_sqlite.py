@@ -0,0 +1,118 @@
+"""Reader throughput while a bulk seed is running, per SQLite profile.
+
+For each profile (see regression_lab/sqlite.py) a throwaway database is seeded with a base
+dataset, then one thread runs a large `seed_orders` inside a single `transaction.atomic()`
+(what `/api/dev/seed/` does) while `--readers` threads hit the order list/detail endpoints
+through the test client until it finishes.
+
+    python scripts/bench_sqlite.py
+    python scripts/bench_sqlite.py --profiles stock,tuned --readers 8 --seed-customers 5000
+
+"stock" runs with `CONN_MAX_AGE=0` (Django's default), "tuned" with persistent connections.
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+from bench_summary import percentile, use_fresh_database
+
+CONN_MAX_AGE = {"stock": 0, "tuned": 60}
+
+
+def reader(order_ids, stop, results):
+    from django.db import connection
+    from django.test import Client
+
+    client = Client(raise_request_exception=False)
+    i = 0
+    while not stop.is_set():
+        path = f"/api/orders/{order_ids[i % len(order_ids)]}/" if i % 2 else "/api/orders/?status=paid"
+        t0 = time.perf_counter()
+        response = client.get(path)
+        results.append(((time.perf_counter() - t0) * 1000, response.status_code))
+        i += 1
+    connection.close()
+
+
+def writer(args, done):
+    from django.db import connection, transaction
+
+    from orders.seeding import seed_orders
+
+    try:
+        with transaction.atomic():
+            seed_orders(args.seed_customers, 10, 4, chunk_size=args.chunk_size, seed=1)
+    finally:
+        done["seconds"] = time.perf_counter() - done["start"]
+        connection.close()
+
+
+def run_profile(profile, args, workdir):
+    from django.conf import settings
+    from django.db import connection
+
+    from orders.models import Order
+    from orders.seeding import seed_orders
+
+    settings.SQLITE_PROFILE = profile
+    connection.settings_dict["CONN_MAX_AGE"] = CONN_MAX_AGE.get(profile, 0)
+    use_fresh_database(Path(workdir) / f"bench_{profile}.sqlite3")
+    seed_orders(args.base_customers, 10, 4, seed=0)
+    order_ids = list(Order.objects.order_by("-id").values_list("id", flat=True)[:1000])
+    connection.close()
+
+    stop = threading.Event()
+    results = []
+    readers = [threading.Thread(target=reader, args=(order_ids, stop, results)) for _ in range(args.readers)]
+    for thread in readers:
+        thread.start()
+    time.sleep(0.2)  # let readers reach steady state before the write starts
+
+    done = {"start": time.perf_counter()}
+    write_thread = threading.Thread(target=writer, args=(args, done))
+    results.clear()
+    write_thread.start()
+    write_thread.join()
+    stop.set()
+    for thread in readers:
+        thread.join()
+
+    timings = sorted(ms for ms, _ in results)
+    errors = sum(1 for _, code in results if code >= 500)
+    print(
+        f"{profile:<6} seed={done['seconds']:>6.2f}s reads={len(results):>6} "
+        f"reads/s={len(results) / done['seconds']:>8.1f} p50={percentile(timings, 50):>8.2f}ms "
+        f"p95={percentile(timings, 95):>8.2f}ms p99={percentile(timings, 99):>8.2f}ms errors={errors}"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--profiles", default="stock,tuned")
+    parser.add_argument("--readers", type=int, default=4, help="Concurrent reader threads.")
+    parser.add_argument("--base-customers", type=int, default=500, help="Customers seeded before the run.")
+    parser.add_argument("--seed-customers", type=int, default=2000, help="Customers inserted during the run.")
+    parser.add_argument("--chunk-size", type=int, default=500)
+    args = parser.parse_args()
+
+    repo_root = Path(__file__).resolve().parents[1]
+    sys.path.insert(0, str(repo_root))
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "regression_lab.settings")
+    os.environ.setdefault("PERF_LOG_LEVEL", "ERROR")
+
+    import django
+
+    django.setup()
+
+    with tempfile.TemporaryDirectory() as workdir:
+        for profile in [name.strip() for name in args.profiles.split(",") if name.strip()]:
+            run_profile(profile, args, workdir)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,203 @@
+"""Cold-start benchmark and import-time report for the settings profiles.
+
+Every `manage.py` run, worker and benchmark script pays for `django.setup()` before it does
+any work. This starts a fresh interpreter per run for each settings profile:
+
+* `full`: `regression_lab.settings`, what `runserver` and the tests use;
+* `worker`: `regression_lab.settings_worker`, which has no admin, auth, sessions, DRF,
+  middleware or templates. Management commands and batch workers use this one.
+
+It reports wall-clock cold-start time (interpreter start to exit) and the time spent
+inside `django.setup()`. It also runs once more under `python -X importtime` and breaks
+the import time down by owner: each installed app, Django core, other third-party packages
+and the stdlib. Each `AppConfig.ready()` is timed as well.
+
+    python scripts/bench_startup.py                        # setup only, 20 runs per profile
+    python scripts/bench_startup.py --runs 50 --top 15
+    python scripts/bench_startup.py --command drain_outbox  # time a real command instead
+    python scripts/bench_startup.py --output startup.json
+
+Import times are self times (`-X importtime`'s first column), so they add up: an owner's
+total doesn't include the modules it pulled in from other owners.
+"""
+
+import argparse
+import json
+import os
+import re
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+from bench_summary import percentile
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+
+PROFILES = {
+    "full": "regression_lab.settings",
+    "worker": "regression_lab.settings_worker",
+}
+
+# Runs in the child: setup plus per-app ready() timings, as JSON on stdout.
+SETUP_PROBE = """
+import json, sys, time
+t0 = time.perf_counter()
+from django.apps.config import AppConfig
+ready_ms = {}
+create = AppConfig.create.__func__
+
+def timed_create(cls, entry):
+    config = create(cls, entry)
+    ready = config.ready
+    def timed_ready():
+        start = time.perf_counter()
+        ready()
+        ready_ms[config.name] = (time.perf_counter() - start) * 1000
+    config.ready = timed_ready
+    return config
+
+AppConfig.create = classmethod(timed_create)
+import django
+django.setup()
+print(json.dumps({
+    "setup_ms": (time.perf_counter() - t0) * 1000,
+    "ready_ms": ready_ms,
+    "modules": len(sys.modules),
+}))
+"""
+
+IMPORTTIME_LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)$")
+
+
+def parse_importtime(text):
+    """(module, self_us, cumulative_us, depth) for each `-X importtime` line in `text`."""
+    rows = []
+    for line in text.splitlines():
+        match = IMPORTTIME_LINE.match(line)
+        if match:
+            self_us, cumulative_us, indent, module = match.groups()
+            rows.append((module, int(self_us), int(cumulative_us), len(indent) // 2))
+    return rows
+
+
+def owner(module, app_names):
+    """Who a module's import time is charged to: an installed app, Django, a package or the stdlib."""
+    for name in app_names:
+        if module == name or module.startswith(name + "."):
+            return name
+    top = module.split(".")[0]
+    if top == "django":
+        return "django (core)"
+    if top in sys.stdlib_module_names or top.startswith("_"):
+        return "stdlib"
+    return top
+
+
+def import_breakdown(rows, app_names, top):
+    by_owner = {}
+    for module, self_us, _, _ in rows:
+        name = owner(module, app_names)
+        by_owner[name] = by_owner.get(name, 0) + self_us
+    slowest = sorted(rows, key=lambda row: row[1], reverse=True)[:top]
+    return {
+        "total_ms": round(sum(row[1] for row in rows) / 1000, 2),
+        "modules": len(rows),
+        "by_owner_ms": {
+            name: round(us / 1000, 2) for name, us in sorted(by_owner.items(), key=lambda item: -item[1])
+        },
+        "slowest_modules_ms": {module: round(self_us / 1000, 2) for module, self_us, _, _ in slowest},
+    }
+
+
+def child_env(settings_module):
+    env = {**os.environ, "DJANGO_SETTINGS_MODULE": settings_module}
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [str(REPO_ROOT), env.get("PYTHONPATH")]))
+    return env
+
+
+def run_child(settings_module, command=None, importtime=False):
+    """Start one interpreter; returns (wall ms, stdout, stderr)."""
+    argv = [sys.executable]
+    if importtime:
+        argv += ["-X", "importtime"]
+    argv += [str(REPO_ROOT / "manage.py"), *command] if command else ["-c", SETUP_PROBE]
+    t0 = time.perf_counter()
+    result = subprocess.run(argv, cwd=REPO_ROOT, env=child_env(settings_module), capture_output=True, text=True)
+    wall_ms = (time.perf_counter() - t0) * 1000
+    if result.returncode != 0:
+        sys.exit(f"{settings_module}: {' '.join(argv[1:3])}... exited {result.returncode}\n{result.stderr[-2000:]}")
+    return wall_ms, result.stdout, result.stderr
+
+
+def bench_profile(settings_module, args):
+    command = args.command.split() if args.command else None
+    run_child(settings_module, command)  # warm the OS file cache and __pycache__
+    walls, setups = [], []
+    for _ in range(args.runs):
+        wall_ms, stdout, _ = run_child(settings_module, command)
+        walls.append(wall_ms)
+        if not command:
+            setups.append(json.loads(stdout.splitlines()[-1])["setup_ms"])
+    walls.sort()
+
+    _, stdout, stderr = run_child(settings_module, importtime=True)
+    probe = json.loads(stdout.splitlines()[-1])
+    return {
+        "settings": settings_module,
+        "runs": args.runs,
+        "wall_p50_ms": round(percentile(walls, 50), 2),
+        "wall_p95_ms": round(percentile(walls, 95), 2),
+        "wall_min_ms": round(walls[0], 2),
+        "setup_mean_ms": round(statistics.fmean(setups), 2) if setups else None,
+        "modules_loaded": probe["modules"],
+        "ready_ms": {name: round(ms, 2) for name, ms in probe["ready_ms"].items()},
+        "imports": import_breakdown(parse_importtime(stderr), list(probe["ready_ms"]), args.top),
+    }
+
+
+def print_profile(name, row):
+    setup = f" setup={row['setup_mean_ms']:.1f}ms" if row["setup_mean_ms"] is not None else ""
+    print(
+        f"[{name}] cold start p50={row['wall_p50_ms']:.1f}ms p95={row['wall_p95_ms']:.1f}ms "
+        f"min={row['wall_min_ms']:.1f}ms{setup} modules={row['modules_loaded']}"
+    )
+    imports = row["imports"]
+    print(f"  import time (self) {imports['total_ms']:.1f}ms over {imports['modules']} modules, by owner:")
+    for owner_name, ms in imports["by_owner_ms"].items():
+        print(f"    {owner_name:<32} {ms:>8.2f}ms")
+    print("  AppConfig.ready():")
+    for app, ms in row["ready_ms"].items():
+        print(f"    {app:<32} {ms:>8.2f}ms")
+    print("  slowest modules (self):")
+    for module, ms in imports["slowest_modules_ms"].items():
+        print(f"    {module:<48} {ms:>8.2f}ms")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--profiles", nargs="*", default=list(PROFILES), choices=list(PROFILES))
+    parser.add_argument("--runs", type=int, default=20, help="Cold starts per profile.")
+    parser.add_argument("--command", help="Time `manage.py <command>` instead of a bare django.setup().")
+    parser.add_argument("--top", type=int, default=10, help="Slowest modules to list per profile.")
+    parser.add_argument("--output", help="Write results as JSON to this path.")
+    args = parser.parse_args()
+
+    results = {}
+    for name in args.profiles:
+        results[name] = bench_profile(PROFILES[name], args)
+        print_profile(name, results[name])
+
+    if "full" in results:
+        full = results["full"]["wall_p50_ms"]
+        for name, row in results.items():
+            if name != "full" and full:
+                print(f"{name} vs full: cold start p50 {(row['wall_p50_ms'] - full) / full * 100:+.1f}%")
+
+    if args.output:
+        Path(args.output).write_text(json.dumps({"command": args.command, "results": results}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,10 +1,179 @@
+"""Multi-endpoint benchmark suite.
+
+Seeds a deterministic dataset per scale into a throwaway SQLite file, runs each endpoint
+N times through the Django test client and reports p50/p95/p99 latency and query count.
+
+    python scripts/bench_summary.py                                  # 1k and 10k orders
+    python scripts/bench_summary.py --scales 1000,10000,100000 --iterations 200
+    python scripts/bench_summary.py --output bench.json
+    python scripts/bench_summary.py --baseline bench.json --max-regression 0.25
+
+With `--baseline`, the run exits non-zero when any endpoint's p95 grows by more than
+`--max-regression` (fraction) or its query count grows at all.
+"""
+
+import argparse
+import json
 import os
+import platform
+import statistics
 import sys
+import tempfile
 import time
+from contextlib import ExitStack
 from pathlib import Path
 
+ORDERS_PER_CUSTOMER = 10
+ITEMS_PER_ORDER = 4
+
+
+def percentile(sorted_values, pct):
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, round(pct / 100 * len(sorted_values) + 0.5) - 1))
+    return sorted_values[index]
+
+
+def build_endpoints(order_ids):
+    """(name, callable(client, i) -> response) pairs; `i` rotates through the dataset."""
+    from django.core.cache import cache
+
+    def summary(client, i):
+        cache.clear()
+        return client.get("/api/orders/summary/?limit=50")
+
+    def summary_cached(client, i):
+        return client.get("/api/orders/summary/?limit=50")
+
+    def order_list(client, i):
+        return client.get("/api/orders/?status=paid&email=user1")
+
+    def order_detail(client, i):
+        return client.get(f"/api/orders/{order_ids[i % len(order_ids)]}/")
+
+    def cancel(client, i):
+        # Walk from the oldest end so detail lookups (newest end) aren't all cancelled.
+        return client.post(f"/api/orders/{order_ids[-1 - i % len(order_ids)]}/cancel/")
+
+    def seed(client, i):
+        return client.post(
+            "/api/dev/seed/",
+            {"customers": 5, "orders_per_customer": 2, "items_per_order": 2},
+            content_type="application/json",
+        )
+
+    def item_create(client, i):
+        return client.post(
+            "/api/items/",
+            {"order": order_ids[i % len(order_ids)], "sku": f"SKU-{i % 200}", "quantity": 1, "unit_price_cents": 499},
+            content_type="application/json",
+        )
+
+    return [
+        ("summary", summary),
+        ("summary_cached", summary_cached),
+        ("order_list_filtered", order_list),
+        ("order_detail", order_detail),
+        ("cancel", cancel),
+        ("seed", seed),
+        ("item_create", item_create),
+    ]
+
+
+def run_endpoint(client, fn, iterations, warmup):
+    from django.db import connections
+    from django.test.utils import CaptureQueriesContext
+
+    for i in range(warmup):
+        fn(client, i)
+
+    timings, queries, statuses = [], [], {}
+    for i in range(warmup, warmup + iterations):
+        # Every alias, so endpoints routed to the replica are counted too.
+        with ExitStack() as stack:
+            captured = [stack.enter_context(CaptureQueriesContext(conn)) for conn in connections.all()]
+            t0 = time.perf_counter()
+            response = fn(client, i)
+            timings.append((time.perf_counter() - t0) * 1000)
+        queries.append(sum(len(c) for c in captured))
+        statuses[response.status_code] = statuses.get(response.status_code, 0) + 1
+
+    timings.sort()
+    return {
+        "iterations": iterations,
+        "p50_ms": round(percentile(timings, 50), 3),
+        "p95_ms": round(percentile(timings, 95), 3),
+        "p99_ms": round(percentile(timings, 99), 3),
+        "mean_ms": round(statistics.fmean(timings), 3),
+        "queries": max(queries),
+        "status_codes": {str(code): count for code, count in sorted(statuses.items())},
+    }
+
+
+def use_fresh_database(path):
+    from django.core.management import call_command
+    from django.db import connections
+
+    # The replica alias too: replica-routed views would otherwise read the dev database.
+    for alias in ("default", "replica"):
+        if alias in connections.settings:
+            connections[alias].close()
+            connections[alias].settings_dict["NAME"] = str(path)
+    call_command("migrate", verbosity=0)
+
+
+def run_scale(scale, args, workdir):
+    from django.test import Client
+
+    from orders.models import Order
+    from orders.seeding import seed_orders
+
+    use_fresh_database(Path(workdir) / f"bench_{scale}.sqlite3")
+    t0 = time.perf_counter()
+    seed_orders(max(1, scale // ORDERS_PER_CUSTOMER), ORDERS_PER_CUSTOMER, ITEMS_PER_ORDER, seed=args.seed)
+    print(f"[{scale} orders] seeded in {time.perf_counter() - t0:.1f}s", file=sys.stderr)
+
+    order_ids = list(Order.objects.order_by("-id").values_list("id", flat=True)[:1000])
+    client = Client()
+    results = {}
+    for name, fn in build_endpoints(order_ids):
+        if args.endpoints and name not in args.endpoints:
+            continue
+        results[name] = run_endpoint(client, fn, args.iterations, args.warmup)
+        row = results[name]
+        print(
+            f"[{scale} orders] {name:<20} p50={row['p50_ms']:>8.2f}ms p95={row['p95_ms']:>8.2f}ms "
+            f"p99={row['p99_ms']:>8.2f}ms queries={row['queries']:>3} codes={row['status_codes']}"
+        )
+    return results
+
+
+def compare(results, baseline, max_regression):
+    failures = []
+    for scale, endpoints in results.items():
+        for name, row in endpoints.items():
+            before = baseline.get("results", {}).get(scale, {}).get(name)
+            if not before:
+                continue
+            if row["p95_ms"] > before["p95_ms"] * (1 + max_regression):
+                failures.append(f"{scale}/{name}: p95 {before['p95_ms']}ms -> {row['p95_ms']}ms")
+            if row["queries"] > before["queries"]:
+                failures.append(f"{scale}/{name}: queries {before['queries']} -> {row['queries']}")
+    return failures
+
 
 def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scales", default="1000,10000", help="Comma-separated order counts to seed.")
+    parser.add_argument("--iterations", type=int, default=50)
+    parser.add_argument("--warmup", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=0, help="Random seed for the dataset.")
+    parser.add_argument("--endpoints", nargs="*", help="Only run these endpoints.")
+    parser.add_argument("--output", help="Write results as JSON to this path.")
+    parser.add_argument("--baseline", help="Compare against a previous --output file.")
+    parser.add_argument("--max-regression", type=float, default=0.2, help="Allowed p95 growth vs baseline.")
+    args = parser.parse_args()
+
     repo_root = Path(__file__).resolve().parents[1]
     sys.path.insert(0, str(repo_root))
     os.environ.setdefault("DJANGO_SETTINGS_MODULE", "regression_lab.settings")
@@ -13,25 +182,29 @@ def main() -> None:
 
     django.setup()
 
-    from django.db import connection
-    from django.test import Client
-    from django.test.utils import CaptureQueriesContext
+    scales = [int(value) for value in args.scales.split(",") if value.strip()]
+    with tempfile.TemporaryDirectory() as workdir:
+        results = {str(scale): run_scale(scale, args, workdir) for scale in scales}
 
-    c = Client()
+    report = {
+        "meta": {
+            "python": platform.python_version(),
+            "django": django.get_version(),
+            "iterations": args.iterations,
+            "warmup": args.warmup,
+            "seed": args.seed,
+        },
+        "results": results,
+    }
+    if args.output:
+        Path(args.output).write_text(json.dumps(report, indent=2))
 
-    t0 = time.perf_counter()
-    with CaptureQueriesContext(connection) as q:
-        r = c.get("/api/orders/summary/?limit=50")
-
-    ms = (time.perf_counter() - t0) * 1000
-    print(
-        "summary_status=",
-        r.status_code,
-        "ms=",
-        round(ms, 2),
-        "queries=",
-        len(q),
-    )
+    if args.baseline:
+        failures = compare(results, json.loads(Path(args.baseline).read_text()), args.max_regression)
+        for failure in failures:
+            print("REGRESSION", failure, file=sys.stderr)
+        if failures:
+            sys.exit(1)
 
 
 if __name__ == "__main__":
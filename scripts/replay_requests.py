@@ -0,0 +1,269 @@
+"""Load generator that replays a JSON-lines request log against the service.
+
+Each line of the log is one request:
+
+    {"method": "GET", "path": "/api/orders/?status=paid"}
+    {"method": "POST", "path": "/api/orders/12/cancel/"}
+    {"method": "POST", "path": "/api/items/", "body": {"order": 12, "sku": "A", "quantity": 1}}
+    {"method": "POST", "path": "/api/orders/ingest/", "body": "{...}\\n{...}\\n", "content_type": "application/x-ndjson"}
+
+`method` defaults to GET. A dict/list `body` is sent as JSON, and a string body is sent as is with
+`content_type`. `headers` is an optional dict. Lines without a `path` are skipped and counted.
+`scripts/sample_requests.jsonl` is a small traffic mix over the order and summary views.
+
+Targets:
+
+* `--target client` (default) drives the Django test client in-process against a throwaway
+  SQLite database seeded with `--customers` (or `--database PATH` to use an existing file);
+* `--target http://127.0.0.1:8000` sends real HTTP requests (one keep-alive connection per worker).
+
+`--concurrency` workers come from a thread pool, or a process pool with `--processes`.
+`--rate` caps the total request rate. Latency is measured from when a request is sent; if the
+pool can't keep up with `--rate`, the reported throughput shows it. The report is grouped by
+route (method + URL name, e.g. `GET orders-detail`, matching the QUERY_BUDGETS keys). An error is
+a status >= 400 or a failed request.
+
+    python scripts/replay_requests.py scripts/sample_requests.jsonl
+    python scripts/replay_requests.py traffic.jsonl --concurrency 16 --rate 200 --repeat 5
+    python scripts/replay_requests.py traffic.jsonl --processes --concurrency 4 --output replay.json
+    python scripts/replay_requests.py traffic.jsonl --target http://127.0.0.1:8000 --duration 60
+"""
+
+import argparse
+import http.client
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from pathlib import Path
+from urllib.parse import urlsplit
+
+from bench_summary import percentile, use_fresh_database
+
+_local = threading.local()
+
+
+def load_requests(path):
+    """Replayable requests from the log, plus the number of lines skipped."""
+    requests, skipped = [], 0
+    with open(path) as log:
+        for line in log:
+            if not line.strip():
+                continue
+            try:
+                entry = json.loads(line)
+            except ValueError:
+                skipped += 1
+                continue
+            if not isinstance(entry, dict) or not isinstance(entry.get("path"), str):
+                skipped += 1
+                continue
+            body, content_type = entry.get("body"), entry.get("content_type")
+            if body is not None and not isinstance(body, str):
+                body, content_type = json.dumps(body), content_type or "application/json"
+            requests.append({
+                "method": str(entry.get("method", "GET")).upper(),
+                "path": entry["path"],
+                "body": (body or "").encode(),
+                "content_type": content_type or "application/octet-stream",
+                "headers": entry.get("headers") or {},
+            })
+    return requests, skipped
+
+
+def route_name(method, path):
+    from django.urls import Resolver404, resolve
+
+    url_path = urlsplit(path).path
+    try:
+        match = resolve(url_path)
+    except Resolver404:
+        return f"{method} {url_path}"
+    return f"{method} {match.url_name or match.route}"
+
+
+def setup_django(database=None):
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "regression_lab.settings")
+    import django
+
+    django.setup()
+    if database:
+        from django.db import connection
+
+        connection.close()
+        connection.settings_dict["NAME"] = str(database)
+
+
+def _client_send(request):
+    from django.test import Client
+
+    if not hasattr(_local, "client"):
+        _local.client = Client()
+    headers = {f"HTTP_{key.upper().replace('-', '_')}": value for key, value in request["headers"].items()}
+    response = _local.client.generic(
+        request["method"], request["path"], request["body"], content_type=request["content_type"], **headers
+    )
+    if response.streaming:
+        b"".join(response.streaming_content)
+    return response.status_code
+
+
+def _http_send(request, base_url):
+    url = urlsplit(base_url)
+    connection = getattr(_local, "http", None)
+    if connection is None:
+        connection = _local.http = http.client.HTTPConnection(url.hostname, url.port or 80, timeout=60)
+    headers = {"Content-Type": request["content_type"], **request["headers"]}
+    try:
+        connection.request(request["method"], url.path.rstrip("/") + request["path"], request["body"], headers)
+        response = connection.getresponse()
+        response.read()
+    except Exception:
+        connection.close()
+        _local.http = None
+        raise
+    return response.status
+
+
+def send(request, target):
+    """Replay one request; returns (status or None, latency_ms, error)."""
+    t0 = time.perf_counter()
+    try:
+        status = _client_send(request) if target == "client" else _http_send(request, target)
+    except Exception as exc:
+        return None, (time.perf_counter() - t0) * 1000, f"{type(exc).__name__}: {exc}"
+    return status, (time.perf_counter() - t0) * 1000, None
+
+
+def replay(requests, args, executor):
+    """Dispatch requests at up to `--rate`/s with at most `--concurrency` in flight."""
+    routes = [route_name(request["method"], request["path"]) for request in requests]
+    slots = threading.BoundedSemaphore(args.concurrency)
+    results, lock = [], threading.Lock()
+
+    def record(route, future):
+        try:
+            result = future.result()
+        except Exception as exc:  # the worker process died
+            result = (None, 0.0, f"{type(exc).__name__}: {exc}")
+        with lock:
+            results.append((route, *result))
+        slots.release()
+
+    start = time.perf_counter()
+    deadline = start + args.duration if args.duration else None
+    sent = 0
+    for _ in range(args.repeat if not deadline else sys.maxsize):
+        for request, route in zip(requests, routes):
+            if args.rate:
+                delay = start + sent / args.rate - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+            if deadline and time.perf_counter() >= deadline:
+                break
+            slots.acquire()
+            future = executor.submit(send, request, args.target)
+            future.add_done_callback(lambda f, route=route: record(route, f))
+            sent += 1
+        else:
+            continue
+        break
+    for _ in range(args.concurrency):
+        slots.acquire()
+    return results, time.perf_counter() - start
+
+
+def summarize(results, elapsed):
+    by_route = {}
+    for route, status, latency, error in results:
+        by_route.setdefault(route, []).append((status, latency, error))
+
+    report = {}
+    for route, rows in sorted(by_route.items()) + [("TOTAL", [row[1:] for row in results])]:
+        timings = sorted(latency for _, latency, _ in rows)
+        codes = {}
+        for status, _, error in rows:
+            key = str(status) if status is not None else "failed"
+            codes[key] = codes.get(key, 0) + 1
+        errors = sum(1 for status, _, _ in rows if status is None or status >= 400)
+        report[route] = {
+            "requests": len(rows),
+            "rps": round(len(rows) / elapsed, 2) if elapsed else 0.0,
+            "p50_ms": round(percentile(timings, 50), 3),
+            "p95_ms": round(percentile(timings, 95), 3),
+            "p99_ms": round(percentile(timings, 99), 3),
+            "max_ms": round(timings[-1], 3) if timings else 0.0,
+            "error_rate": round(errors / len(rows), 4) if rows else 0.0,
+            "status_codes": dict(sorted(codes.items())),
+            "sample_errors": sorted({error for _, _, error in rows if error})[:3],
+        }
+    return report
+
+
+def print_report(report):
+    print(f"{'route':<32} {'reqs':>6} {'rps':>8} {'p50':>9} {'p95':>9} {'p99':>9} {'err%':>6}  codes")
+    for route, row in report.items():
+        print(
+            f"{route:<32} {row['requests']:>6} {row['rps']:>8.1f} {row['p50_ms']:>7.2f}ms "
+            f"{row['p95_ms']:>7.2f}ms {row['p99_ms']:>7.2f}ms {row['error_rate'] * 100:>5.1f}%  {row['status_codes']}"
+        )
+        for error in row["sample_errors"]:
+            print(f"{'':<32} ! {error}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("log", help="JSON-lines request log.")
+    parser.add_argument("--target", default="client", help="'client' (in-process test client) or a base URL.")
+    parser.add_argument("--concurrency", type=int, default=8, help="Workers / requests in flight.")
+    parser.add_argument("--processes", action="store_true", help="Use a process pool instead of threads.")
+    parser.add_argument("--rate", type=float, default=0, help="Max requests per second overall (0 = unlimited).")
+    parser.add_argument("--repeat", type=int, default=1, help="Passes over the log.")
+    parser.add_argument("--duration", type=float, default=0, help="Loop over the log for this many seconds instead.")
+    parser.add_argument("--database", help="Client target: existing SQLite file to use instead of a seeded one.")
+    parser.add_argument("--customers", type=int, default=200, help="Client target: customers to seed.")
+    parser.add_argument("--orders-per-customer", type=int, default=8)
+    parser.add_argument("--items-per-order", type=int, default=4)
+    parser.add_argument("--output", help="Write the per-route report as JSON to this path.")
+    args = parser.parse_args()
+
+    repo_root = Path(__file__).resolve().parents[1]
+    sys.path.insert(0, str(repo_root))
+    setup_django()
+
+    requests, skipped = load_requests(args.log)
+    if skipped:
+        print(f"skipped {skipped} line(s) without a request path", file=sys.stderr)
+    if not requests:
+        sys.exit(f"{args.log}: no replayable requests")
+
+    with tempfile.TemporaryDirectory() as workdir:
+        database = None
+        if args.target == "client":
+            database = args.database
+            if database is None:
+                from orders.seeding import seed_orders
+
+                database = Path(workdir) / "replay.sqlite3"
+                use_fresh_database(database)
+                seed_orders(args.customers, args.orders_per_customer, args.items_per_order, seed=0)
+            setup_django(database)
+
+        if args.processes:
+            executor = ProcessPoolExecutor(args.concurrency, initializer=setup_django, initargs=(database,))
+        else:
+            executor = ThreadPoolExecutor(args.concurrency)
+        with executor:
+            results, elapsed = replay(requests, args, executor)
+
+    report = summarize(results, elapsed)
+    print_report(report)
+    if args.output:
+        Path(args.output).write_text(json.dumps({"elapsed_s": round(elapsed, 3), "routes": report}, indent=2))
+
+
+if __name__ == "__main__":
+    main()